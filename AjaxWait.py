@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+"""
+This module provides the event driven wait used by the Oracle page objects on
+the AdminConsole instead of the fixed Wait_for_Completion() delay.
+The page is considered settled when all of the following are true:
+    Angular $http has no pending requests
+    no cvBusyOnAjax button is in the busy state
+    the injected XMLHttpRequest/fetch counter is zero
+    document.readyState is 'complete'
+Class:
+    AjaxWait() -> object()
+Functions:
+Wait()                      -- Waits until the page is settled or the timeout expires.
+Probe()                     -- Returns the current busy state of the page in one script call.
+"""
+import time
+
+from OraclePages.DriverHooks import AddCommandListener
+
+MARKER = '/*cvAjaxWait*/'
+
+PROBE_SCRIPT = MARKER + """
+var w = window, d = document;
+if (!w.__cvAjax) {
+    var c = w.__cvAjax = {pending: 0};
+    var done = function () { c.pending = Math.max(0, c.pending - 1); };
+    if (w.XMLHttpRequest) {
+        var send = w.XMLHttpRequest.prototype.send;
+        w.XMLHttpRequest.prototype.send = function () {
+            c.pending++;
+            this.addEventListener('loadend', done);
+            try { return send.apply(this, arguments); }
+            catch (e) { done(); throw e; }
+        };
+    }
+    if (w.fetch) {
+        var fetch = w.fetch;
+        w.fetch = function () {
+            c.pending++;
+            var p = fetch.apply(this, arguments);
+            p.then(done, done);
+            return p;
+        };
+    }
+}
+var ng = 0;
+try {
+    if (w.angular) {
+        var root = d.querySelector('[ng-app],[data-ng-app]') || d.body;
+        var inj = w.angular.element(root).injector();
+        if (inj) { ng = inj.get('$http').pendingRequests.length; }
+    }
+} catch (e) {}
+var busy = d.querySelectorAll(arguments[0]).length;
+return [w.__cvAjax.pending, ng, busy, d.readyState === 'complete'];
+"""
+
+
+class AjaxWait(object):
+    """Waits on the AdminConsole Ajax state instead of a fixed delay.
+
+    Consecutive waits with no WebDriver command in between are merged: the
+    second call returns immediately without a round trip to the driver."""
+
+    BusySelector = ".cvBusyOnAjax.busy, .cvBusyOnAjax[aria-busy='true']"
+
+    def __init__(self, driver, timeout=60, poll=0.05, settle=0.1):
+        self.driver = driver
+        self.timeout = timeout
+        self.poll = poll
+        self.settle = settle
+        self.commands = 0
+        self.settledAt = None
+        self.merged = 0
+        self.waited = 0
+        self.seconds = 0.0
+        AddCommandListener(driver, self._OnCommand)
+
+    def _OnCommand(self, command, params, response, error, elapsed):
+        script = (params or {}).get('script')
+        if script is None or not script.startswith(MARKER):
+            self.commands += 1
+
+    def Probe(self):
+        """Returns the current busy state of the page in one script call.
+            Returns (xhrPending, angularPending, busyButtons, documentComplete)
+        """
+        return tuple(self.driver.execute_script(PROBE_SCRIPT, self.BusySelector))
+
+    def Wait(self, timeout=None):
+        """Waits until the page is settled or the timeout expires.
+            timeout     : an integer, seconds to wait, defaults to the engine timeout
+            Returns True if the page settled, False on timeout
+        """
+        if self.settledAt == self.commands:
+            self.merged += 1
+            return True
+        timeout = self.timeout if timeout is None else timeout
+        start = time.time()
+        idleSince = None
+        settled = False
+        while True:
+            xhr, ng, busy, complete = self.Probe()
+            now = time.time()
+            if not (xhr or ng or busy) and complete:
+                if idleSince is None:
+                    idleSince = now
+                if now - idleSince >= self.settle:
+                    settled = True
+                    break
+            else:
+                idleSince = None
+            if now - start >= timeout:
+                break
+            time.sleep(self.poll)
+        self.waited += 1
+        self.seconds += time.time() - start
+        if settled:
+            self.settledAt = self.commands
+        return settled
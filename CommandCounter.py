@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+"""
+This module provides the WebDriver command counter used to keep the round trips
+of the Oracle page objects on the AdminConsole in check.
+The public methods of a page object are wrapped so every WebDriver command sent
+during a call, including the ones sent by nested page-object calls and through
+WebElements, is counted by type (find, click, send_keys, execute_script,
+get_text, other) against every method on the call stack. Tests can declare a
+budget per method, e.g. "OpenInstance <= 5", which fails the call exceeding it.
+The page-object methods catch their own exceptions, so a budget exceeded in a
+nested call is raised when the outermost counted call returns.
+Usage:
+    with CommandCounter(page.driver, ["OpenInstance <= 5", "ActionAddSubclient <= 40"]) as counter:
+        counter.Wrap(page)
+        page.OpenInstance("ORCL")
+        counter.Summary()
+Class:
+    CommandCounter() -> object()
+    BudgetExceeded() -> AssertionError()
+Functions:
+ParseBudget()               -- Returns the (method, limit) of a budget such as "OpenInstance <= 5"
+CommandKind()               -- Returns the type a WebDriver command is counted as
+Wrap()                      -- Counts the commands of the public page-object methods of a page
+Unwrap()                    -- Restores the methods wrapped by Wrap() and stops counting
+Call()                      -- Runs a method, counting its commands and checking its budget
+Summary()                   -- Logs and returns the commands per method and type
+Reset()                     -- Clears the counts
+"""
+import functools
+import re
+import types
+
+from AutomationUtils import loghelper
+from OraclePages.DriverHooks import AddCommandListener, RemoveCommandListener
+
+# WebDriver commands, JSON wire and W3C names, to the type they are counted as
+COMMAND_KINDS = {
+    'findElement': 'find', 'findElements': 'find', 'findChildElement': 'find', 'findChildElements': 'find',
+    'clickElement': 'click',
+    'sendKeysToElement': 'send_keys', 'sendKeysToActiveElement': 'send_keys',
+    'executeScript': 'execute_script', 'executeAsyncScript': 'execute_script',
+    'w3cExecuteScript': 'execute_script', 'w3cExecuteScriptAsync': 'execute_script',
+    'getElementText': 'get_text',
+}
+
+KINDS = ('find', 'click', 'send_keys', 'execute_script', 'get_text', 'other')
+
+
+class BudgetExceeded(AssertionError):
+    """Raised when a page-object call sends more WebDriver commands than its budget"""
+
+
+def ParseBudget(budget):
+    """Returns the (method, limit) of a budget such as "OpenInstance <= 5"
+        Raises ValueError if the budget cannot be read
+    """
+    match = re.match(r"^\s*(\w+)\s*<=\s*(\d+)\s*(commands)?\s*$", budget)
+    if not match:
+        raise ValueError("Budgets are written as 'Method <= count', not " + repr(budget))
+    return match.group(1), int(match.group(2))
+
+
+def CommandKind(command):
+    """Returns the type a WebDriver command is counted as"""
+    return COMMAND_KINDS.get(command, 'other')
+
+
+class CommandCounter(object):
+
+    def __init__(self, driver, budgets=(), strict=True):
+        """ driver  : the WebDriver instance whose commands are counted
+            budgets : a list of strings such as "OpenInstance <= 5", or a dict, method to the
+                      most commands one call may send
+            strict  : a boolean, True to raise BudgetExceeded when the outermost counted call
+                      returns if it or a nested call exceeded its budget, False to log it
+                      and keep it in self.exceeded
+            Call Unwrap(), or use the counter in a with statement, to stop counting """
+        self.driver = driver
+        self.budgets = dict(budgets) if isinstance(budgets, dict) else dict(ParseBudget(b) for b in budgets)
+        self.strict = strict
+        self.stack = []
+        self.calls = {}
+        self.exceeded = []
+        self.wrapped = []
+        AddCommandListener(driver, self.Count)
+
+    def Count(self, command, params, response, error, elapsed):
+        """Counts a command against every page-object call in progress"""
+        kind = CommandKind(command)
+        for counts in self.stack:
+            counts[kind] = counts.get(kind, 0) + 1
+
+    def Call(self, name, func, *args, **kwargs):
+        """Runs a method, counting its commands and checking its budget
+            Raises BudgetExceeded, in strict mode, when the outermost counted call returns
+            if it or a call nested in it sent more commands than its budget
+        """
+        counts = {}
+        exceeded = len(self.exceeded)
+        self.stack.append(counts)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            # by identity, an outer call may hold equal counts
+            for i in range(len(self.stack) - 1, -1, -1):
+                if self.stack[i] is counts:
+                    del self.stack[i]
+                    break
+            stats = self.calls.setdefault(name, [0, {}])
+            stats[0] += 1
+            for kind, count in counts.items():
+                stats[1][kind] = stats[1].get(kind, 0) + count
+            self.Check(name, counts)
+            if self.strict and not self.stack and len(self.exceeded) > exceeded:
+                raise BudgetExceeded("; ".join("%s sent %d WebDriver commands, its budget is %d" % over
+                                               for over in self.exceeded[exceeded:]))
+
+    def Check(self, name, counts):
+        """Logs, and keeps in self.exceeded, a call that exceeded the budget of its method"""
+        limit = self.budgets.get(name)
+        total = sum(counts.values())
+        if limit is not None and total > limit:
+            e = "%s sent %d WebDriver commands, its budget is %d (%s)" % (name, total, limit, self.Describe(counts))
+            loghelper.getLog().error(e)
+            self.exceeded.append((name, total, limit))
+
+    @staticmethod
+    def Methods(page):
+        """Returns the names of the public methods the OraclePages classes of a page define"""
+        names = set()
+        for cls in type(page).__mro__:
+            if not cls.__module__.startswith('OraclePages'):
+                continue
+            for name, value in vars(cls).items():
+                if isinstance(value, types.FunctionType) and not name.startswith('_'):
+                    names.add(name)
+        return sorted(names)
+
+    def Wrap(self, page, names=None):
+        """Counts the commands of the public page-object methods of a page
+            page    : the page object, e.g. an OracleInstance
+            names   : a list of method names, by default the public methods of its OraclePages classes
+            Returns the list of the methods wrapped
+        """
+        wrapped = []
+        for name in names or self.Methods(page):
+            method = getattr(page, name)
+            if getattr(method, '_cvCounted', None) is self:
+                continue
+            wrapper = functools.partial(self.Call, name, method)
+            wrapper._cvCounted = self
+            setattr(page, name, wrapper)
+            self.wrapped.append((page, name))
+            wrapped.append(name)
+        return wrapped
+
+    def Unwrap(self):
+        """Restores the methods wrapped by Wrap() and stops counting"""
+        for page, name in self.wrapped:
+            page.__dict__.pop(name, None)
+        self.wrapped = []
+        RemoveCommandListener(self.driver, self.Count)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.Unwrap()
+        return False
+
+    @staticmethod
+    def Describe(counts):
+        """Returns the counts by type as text, e.g. "find 4, click 1" """
+        return ", ".join("%s %d" % (kind, counts[kind]) for kind in KINDS if counts.get(kind))
+
+    def Summary(self):
+        """Logs and returns the commands per method and type
+            Returns a dict, method to {"calls": n, "commands": total, "find": n, ...}
+        """
+        log = loghelper.getLog()
+        summary = {}
+        for name, (calls, counts) in sorted(self.calls.items()):
+            total = sum(counts.values())
+            summary[name] = dict(counts, calls=calls, commands=total)
+            log.info("%s: %d call(s), %.1f WebDriver commands per call (%s)"
+                     % (name, calls, total / float(calls), self.Describe(counts)))
+        return summary
+
+    def Reset(self):
+        """Clears the counts and the exceeded budgets"""
+        self.calls = {}
+        self.exceeded = []
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+"""
+This module provides the record-and-replay WebDriver transport used to run the
+Oracle page objects offline.
+While recording, every command a driver sends to the browser and the raw response
+it gets back are appended to a gzipped JSON lines file, one complete gzip member
+per line, so a run that fails before Close() still leaves a readable recording.
+A replay driver answers
+the same command sequence from that file in memory, so the Python side of a run
+(locator construction, parsing, loops) can be regression-tested and profiled
+without a browser or an AdminConsole. Commands are checked against the recording
+and a run that diverges from it fails with ReplayMismatch. Waits that sleep
+rather than poll the browser still take their time.
+Usage:
+    with Record(driver, "restore.wdr.gz"):
+        page.OracleRestore(...)
+
+    driver = ReplayDriver("restore.wdr.gz")
+    page.driver = driver
+    page.OracleRestore(...)
+Class:
+    CommandRecorder() -> object()
+    ReplayExecutor() -> object()
+    ReplayMismatch() -> WebDriverException()
+Functions:
+Record()                    -- Starts recording the commands of a driver to a file
+ReplayDriver()              -- Returns a driver answering the commands of a recording
+Close()                     -- Stops recording and closes the file
+Remaining()                 -- Returns the number of recorded commands not replayed yet
+"""
+import gzip
+import json
+import threading
+import zlib
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from AutomationUtils import loghelper
+
+FORMAT_VERSION = 1
+
+
+class ReplayMismatch(WebDriverException):
+    """Raised when a replayed run sends a command the recording does not have at that point"""
+
+
+def Strip(params):
+    """Returns the params without the session ID, which differs between sessions"""
+    if not isinstance(params, dict):
+        return params
+    return dict((k, v) for k, v in params.items() if k != "sessionId")
+
+
+class CommandRecorder(object):
+    """Transport recording the commands and raw responses of the transport it wraps"""
+
+    def __init__(self, driver, path):
+        """ driver  : the WebDriver instance to record, its command_executor is wrapped
+            path    : a string, the file the recording is written to """
+        self.driver = driver
+        self.executor = driver.command_executor
+        self.path = path
+        self.commands = 0
+        self.lock = threading.Lock()
+        self.file = open(path, "wb")
+        self.Write({"version": FORMAT_VERSION, "w3c": bool(getattr(driver, "w3c", False)),
+                    "sessionId": driver.session_id, "capabilities": driver.capabilities})
+        driver.command_executor = self
+
+    def Write(self, record):
+        """Appends one JSON line to the recording, as a gzip member of its own"""
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        line = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+        self.file.write(compressor.compress(line) + compressor.flush())
+        self.file.flush()
+
+    def execute(self, command, params):
+        response = self.executor.execute(command, params)
+        with self.lock:
+            if self.file is not None:
+                self.Write([command, Strip(params), Strip(response)])
+                self.commands += 1
+        return response
+
+    def __getattr__(self, name):
+        # everything else the driver asks of its transport goes to the wrapped one
+        if name == "executor":
+            raise AttributeError(name)
+        return getattr(self.executor, name)
+
+    def Close(self):
+        """Stops recording, giving the driver its transport back, and closes the file
+            Returns the number of commands recorded
+        """
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+        if self.driver.command_executor is self:
+            self.driver.command_executor = self.executor
+        loghelper.getLog().info("Recorded %d WebDriver commands to %s" % (self.commands, self.path))
+        return self.commands
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.Close()
+        return False
+
+
+class ReplayExecutor(object):
+    """Transport answering the commands of a recording in order, from memory"""
+
+    def __init__(self, path, strict=True):
+        """ path    : a string, the recording written by Record()
+            strict  : a boolean, True to check the parameters of every command as well as its name """
+        with gzip.open(path, "rb") as f:
+            lines = f.read().decode("utf-8").splitlines()
+        self.header = json.loads(lines[0])
+        if self.header.get("version") != FORMAT_VERSION:
+            raise ValueError("Unsupported recording format %s in %s" % (self.header.get("version"), path))
+        self.records = [json.loads(line) for line in lines[1:] if line]
+        self.path = path
+        self.strict = strict
+        self.position = 0
+        self.lock = threading.Lock()
+
+    def NewSession(self):
+        """Returns the response of the session the recording was made in"""
+        if self.header["w3c"]:
+            return {"value": {"sessionId": self.header["sessionId"], "capabilities": self.header["capabilities"]}}
+        return {"status": 0, "sessionId": self.header["sessionId"], "value": self.header["capabilities"]}
+
+    def execute(self, command, params):
+        if command == "newSession":
+            return self.NewSession()
+        with self.lock:
+            if self.position >= len(self.records):
+                if command == "quit":
+                    return {"status": 0, "value": None}
+                raise ReplayMismatch("The recording %s ended before command %s" % (self.path, command))
+            recorded, recordedParams, response = self.records[self.position]
+            if recorded != command or (self.strict and recordedParams != json.loads(json.dumps(Strip(params)))):
+                raise ReplayMismatch("Command %d is %s %s, the recording has %s %s" % (
+                    self.position, command, Strip(params), recorded, recordedParams))
+            self.position += 1
+        return response
+
+    def Remaining(self):
+        """Returns the number of recorded commands not replayed yet"""
+        return len(self.records) - self.position
+
+    def close(self):
+        pass
+
+
+def Record(driver, path):
+    """Starts recording the commands of a driver to a file
+        Returns the CommandRecorder, Close() it, or use it in a with statement, to finish the recording
+    """
+    return CommandRecorder(driver, path)
+
+
+def ReplayDriver(path, strict=True):
+    """Returns a driver answering the commands of a recording, in the session it was made in
+        strict  : a boolean, True to fail on a command whose parameters differ from the recording
+    """
+    replay = ReplayExecutor(path, strict)
+    return WebDriver(command_executor=replay, desired_capabilities=replay.header["capabilities"])
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+This module provides the crawl planner used by the ContinuousBuild() methods of
+the Oracle pages on the AdminConsole.
+Steps are declared first and run together. The planner records the URL of every
+page it visits and returns to the crawled page by direct navigation instead of a
+driver.back() after every history action. The return is only paid after a step
+flagged back=True, or a step that is not idempotent, left the page; idempotent
+steps such as tab switches go on from where the previous one left the browser.
+Repeated idempotent steps run once. The report compares the navigations made with
+the driver.back() calls of the original flow; a negative saving means the plan
+navigated more than the original flow.
+Class:
+    CrawlPlanner() -> object()
+Functions:
+Step()                      -- Adds a step to the plan
+Navigate()                  -- Opens the url directly and waits for the page to settle
+Run()                       -- Runs the plan on the page
+Report()                    -- Returns the navigations and seconds saved by the plan
+"""
+import time
+
+from AutomationUtils import loghelper
+
+
+class CrawlPlanner(object):
+
+    def __init__(self, page, returnAtEnd=False):
+        """ page        : a page object whose ContinuousBuild() is planned
+            returnAtEnd : a boolean, True to always end the run on the crawled page; by default
+                          the run only returns after a last step flagged back=True, like the
+                          original flow's final driver.back() """
+        self.page = page
+        self.returnAtEnd = returnAtEnd
+        self.steps = []
+        self.visited = {}
+        self.navigations = 0
+        self.navigationSeconds = 0.0
+        self.dropped = []
+        self.droppedSeconds = 0.0
+        self.baselineNavigations = 0
+
+    def Step(self, action, *args, **options):
+        """Adds a step to the plan
+            action      : a bound page method returning the usual (True, ...) / (False, fn, err) tuple
+            args        : the arguments of the action
+            back        : a boolean, True if the step leaves the page (it used to be followed by driver.back())
+            idempotent  : a boolean, True if repeating the step with the same arguments has no effect;
+                          a page it leaves the browser on is kept for the next step
+        """
+        self.steps.append((action, args, options.get('back', False), options.get('idempotent', False)))
+        return self
+
+    def Navigate(self, url):
+        """Opens the url directly and waits for the page to settle"""
+        start = time.time()
+        self.page.driver.get(url)
+        self.page.Wait_for_Completion()
+        self.navigations += 1
+        self.navigationSeconds += time.time() - start
+
+    def Run(self):
+        """Runs the plan on the page and returns the report"""
+        log = loghelper.getLog()
+        pageName = self.page.__class__.__name__
+        origin = self.page.driver.current_url
+        self.visited[pageName] = origin
+        done = {}
+        owed = False
+        lastBack = False
+        for action, args, back, idempotent in self.steps:
+            name = action.__name__
+            if back:
+                self.baselineNavigations += 1
+            key = (name, repr(args))
+            if idempotent and key in done:
+                log.info("Crawl planner: dropping repeated step " + name)
+                self.dropped.append(name)
+                self.droppedSeconds += done[key]
+                continue
+            if owed and self.page.driver.current_url != origin:
+                self.Navigate(origin)
+            before = self.page.driver.current_url
+            start = time.time()
+            self.page.ExceptionHandling(pageName, *(action(*args)))
+            done[key] = time.time() - start
+            url = self.page.driver.current_url
+            owed = url != origin and (back or not idempotent)
+            lastBack = back
+            if url != before:
+                self.visited[name] = url
+        if (self.returnAtEnd or (owed and lastBack)) and self.page.driver.current_url != origin:
+            self.Navigate(origin)
+        report = self.Report()
+        log.info("Crawl planner for %s: %s" % (pageName, report))
+        if report['navigationsSaved'] < 0:
+            log.warning("Crawl planner for %s made %d navigations more than the original flow"
+                        % (pageName, -report['navigationsSaved']))
+        return report
+
+    def Report(self):
+        """Returns the navigations and seconds saved by the plan, negative when it navigated more
+        than the original flow"""
+        perNavigation = self.navigationSeconds / self.navigations if self.navigations else 0.0
+        saved = self.baselineNavigations - self.navigations
+        return {
+            'navigations': self.navigations,
+            'navigationsSaved': saved,
+            'stepsDropped': list(self.dropped),
+            'secondsSaved': round(saved * perNavigation + self.droppedSeconds, 3),
+            'visited': dict(self.visited),
+        }
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""
+This module provides the point-in-time setter used by the Oracle page objects on
+the AdminConsole for the restore and clone date/time fields.
+The timestamp is written into the Angular model bound to the field, or into the
+input itself when the field is not bound, in a single script call that also
+checks the widget accepted it, instead of clicking through the calendar popup.
+Functions:
+SetDateTime()               -- Writes a date/time into a field and checks the widget accepted it
+Components()                -- Returns the [year, month, day, hour, minute] of a datetime
+FromParts()                 -- Returns the datetime of separate calendar values, the way CloneDB() takes them
+"""
+import datetime
+
+MONTHS = ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec')
+
+# the input bound to the date/time picker of the clone point in time, in the open dialog
+PIT_PICKER = ".modal-dialog input[datetime-picker], .modal-dialog input[uib-datepicker-popup]"
+
+SET_SCRIPT = """
+var field = arguments[0], text = arguments[1], parts = arguments[2];
+var el = document.getElementById(field) || document.querySelector(field);
+if (!el) { return [false, null, 'missing']; }
+var ng = window.angular && angular.element(el).controller('ngModel');
+// scope() is undefined when the app disables debug info, the injector still has the root scope
+var scope = ng && angular.element(el).scope();
+var injector = ng && !scope && angular.element(document.querySelector('.ng-scope, [ng-app]') || document.body).injector();
+var root = scope ? scope.$root : injector ? injector.get('$rootScope') : null;
+if (ng && root) {
+    var value = parts ? new Date(parts[0], parts[1] - 1, parts[2], parts[3], parts[4]) : text;
+    var apply = function () { ng.$setViewValue(value); ng.$render(); };
+    if (root.$$phase) { apply(); } else { root.$apply(apply); }
+    var model = ng.$modelValue;
+    var accepted = ng.$valid && model !== null && model !== undefined &&
+                   (!parts || (model instanceof Date && model.getTime() === value.getTime()));
+    return [accepted, el.value, 'model'];
+}
+var proto = el.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, text);
+['input', 'change', 'blur'].forEach(function (type) {
+    el.dispatchEvent(new Event(type, {bubbles: true}));
+});
+return [el.value === text, el.value, 'input'];
+"""
+
+
+def Components(when):
+    """Returns the [year, month, day, hour, minute] of a datetime"""
+    return [when.year, when.month, when.day, when.hour, when.minute]
+
+
+def FromParts(year, month, day, hours, minutes, session=None):
+    """Returns the datetime of separate calendar values, the way CloneDB() takes them
+        year        : the year, the current one when None
+        month       : the month, by number or by (abbreviated) name
+        session     : a string, AM or PM when hours is on a 12 hour clock
+        Raises ValueError if the values do not make a date
+    """
+    year = int(year) if year else datetime.datetime.now().year
+    if str(month).isdigit():
+        month = int(month)
+    elif str(month)[:3].lower() in MONTHS:
+        month = MONTHS.index(str(month)[:3].lower()) + 1
+    else:
+        raise ValueError("Unknown month " + str(month))
+    hour = int(hours)
+    if session:
+        hour = hour % 12 + (12 if session.upper() == "PM" else 0)
+    return datetime.datetime(year, month, int(day), hour, int(minutes))
+
+
+def SetDateTime(driver, field, when, textFormat="%m/%d/%Y %I:%M %p"):
+    """Writes a date/time into a field and checks the widget accepted it
+        driver      : the WebDriver instance
+        field       : a string, id of the input, or a CSS selector of it
+        when        : a datetime, or a string typed the way the field expects it
+        textFormat  : a string, strftime format of the text written into an input not bound
+                      to an Angular model, when a datetime is given
+        Returns the text the field shows
+        Raises ValueError if the field is missing or the widget rejected the value
+    """
+    if isinstance(when, datetime.datetime):
+        text, parts = when.strftime(textFormat), Components(when)
+    else:
+        text, parts = str(when), None
+    accepted, shown, how = driver.execute_script(SET_SCRIPT, field, text, parts)
+    if how == 'missing':
+        raise ValueError("Unable to locate the date/time field " + field)
+    if not accepted:
+        raise ValueError("The date/time field %s did not accept %s, it shows %s" % (field, text, shown))
+    return shown
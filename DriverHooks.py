@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+"""
+This module provides the hooks used to observe the WebDriver commands sent by
+the Oracle page objects on the AdminConsole
+Functions:
+AddCommandListener()        -- Registers a callable that is notified after every WebDriver command
+RemoveCommandListener()     -- Unregisters a callable added with AddCommandListener()
+HasCommandListener()        -- Returns True if a callable is registered on a driver
+RemoveCommandHook()         -- Unregisters every listener and gives the driver its own execute back
+"""
+import time
+
+
+class CommandHook(object):
+    """Replaces driver.execute so every WebDriver command, including the ones
+    sent through WebElements, is reported to the registered listeners."""
+
+    def __init__(self, execute):
+        self.execute = execute
+        self.listeners = []
+
+    def __call__(self, command, params=None):
+        error = None
+        response = None
+        start = time.time()
+        try:
+            response = self.execute(command, params)
+            return response
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            elapsed = time.time() - start
+            for listener in list(self.listeners):
+                listener(command, params, response, error, elapsed)
+
+
+def AddCommandListener(driver, listener):
+    """Registers a callable that is notified after every WebDriver command
+        driver      : the WebDriver instance to observe
+        listener    : a callable, called as listener(command, params, response, error, elapsed)
+        Returns the CommandHook installed on the driver
+    """
+    hook = driver.__dict__.get('_cvCommandHook')
+    if hook is None:
+        hook = CommandHook(driver.execute)
+        driver.execute = hook
+        driver._cvCommandHook = hook
+    if listener not in hook.listeners:
+        hook.listeners.append(listener)
+    return hook
+
+
+def RemoveCommandListener(driver, listener):
+    """Unregisters a callable added with AddCommandListener()"""
+    hook = driver.__dict__.get('_cvCommandHook')
+    if hook is not None and listener in hook.listeners:
+        hook.listeners.remove(listener)
+
+
+def HasCommandListener(driver, listener):
+    """Returns True if a callable is registered on a driver with AddCommandListener()"""
+    hook = driver.__dict__.get('_cvCommandHook')
+    return hook is not None and listener in hook.listeners
+
+
+def RemoveCommandHook(driver):
+    """Unregisters every listener and gives the driver its own execute back,
+    e.g. before a pooled driver is handed to the next page object"""
+    hook = driver.__dict__.pop('_cvCommandHook', None)
+    if hook is not None:
+        del hook.listeners[:]
+        if driver.__dict__.get('execute') is hook:
+            del driver.execute
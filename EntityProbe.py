@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+"""
+This module provides the fast existence probe used by the Oracle page objects on
+the AdminConsole for lookups that are expected to miss, such as an instance that
+is about to be added or the error span after a form submit.
+The DOM is checked with a single script, so a miss does not pay the driver's
+implicit wait. The element is returned when found so callers do not look it up
+a second time.
+Class:
+    ProbeCounters() -> object()
+Functions:
+Probe()                     -- Returns the first element matching the locator, or None
+"""
+import time
+
+PROBE_SCRIPT = """
+var by = arguments[0], value = arguments[1], d = document;
+if (by === 'xpath') {
+    return d.evaluate(value, d, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+if (by === 'id') { return d.getElementById(value); }
+if (by === 'name') { return d.getElementsByName(value)[0] || null; }
+if (by === 'css') { return d.querySelector(value); }
+if (by === 'link' || by === 'partial_link') {
+    var links = d.getElementsByTagName('a');
+    for (var i = 0; i < links.length; i++) {
+        var text = (links[i].innerText || links[i].textContent || '').trim();
+        if (by === 'link' ? text === value : text.indexOf(value) >= 0) { return links[i]; }
+    }
+    return null;
+}
+throw new Error('Unsupported locator type: ' + by);
+"""
+
+
+class ProbeCounters(object):
+    """Counts the probes of a run and the time spent on the ones that missed"""
+
+    def __init__(self):
+        self.Reset()
+
+    def Reset(self):
+        """Clears the counters, e.g. at the start of a run"""
+        self.hits = 0
+        self.misses = 0
+        self.hitSeconds = 0.0
+        self.missSeconds = 0.0
+
+    def Add(self, found, seconds):
+        """Counts one probe and the seconds it took"""
+        if found:
+            self.hits += 1
+            self.hitSeconds += seconds
+        else:
+            self.misses += 1
+            self.missSeconds += seconds
+
+    def __repr__(self):
+        return ("probes: %d hits in %.3f s, %d misses in %.3f s"
+                % (self.hits, self.hitSeconds, self.misses, self.missSeconds))
+
+
+# probes made through Probe(), and Check_If_Entity_Exists() calls made by the Oracle pages
+Counters = ProbeCounters()
+CheckCounters = ProbeCounters()
+
+
+def Probe(driver, by, value, wait=0, poll=0.1):
+    """Returns the first element matching the locator, or None
+        driver  : the WebDriver instance
+        by      : a string, "xpath", "id", "name", "css", "link" or "partial_link"
+        value   : a string, the locator
+        wait    : seconds to keep looking before reporting a miss, 0 checks once
+    """
+    start = time.time()
+    while True:
+        element = driver.execute_script(PROBE_SCRIPT, by, value)
+        if element is not None or time.time() - start >= wait:
+            break
+        time.sleep(poll)
+    Counters.Add(element is not None, time.time() - start)
+    return element
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+"""
+This module provides the one-shot detail snapshots of the Oracle instance and
+subclient pages on the AdminConsole.
+The page title, every label/value pair of the details panels and the state of the
+requested checkboxes are read in a single script call and returned as a typed
+record. An optional per-entity cache keeps the snapshots until the entity is
+edited or deleted.
+Class:
+    InstanceSnapshot() -> object()
+    SubclientSnapshot() -> object()
+    SnapshotCache() -> object()
+Functions:
+ReadSnapshot()              -- Reads the title, details and checkbox states of the current page
+ReadInstance()              -- Returns the InstanceSnapshot of the instance page shown
+ReadSubclient()             -- Returns the SubclientSnapshot of the subclient content dialog shown
+"""
+import threading
+
+SNAPSHOT_SCRIPT = """
+var ids = arguments[0], text = function (el) { return el ? (el.textContent || '').trim() : ''; };
+var title = text(document.querySelector('h1'));
+var details = [];
+var items = document.querySelectorAll('li');
+for (var i = 0; i < items.length; i++) {
+    var spans = items[i].querySelectorAll('span.pageDetailColumn');
+    if (spans.length >= 2) { details.push([text(spans[0]), text(spans[1])]); }
+}
+var checks = {};
+for (var n = 0; n < ids.length; n++) {
+    var box = document.getElementById(ids[n]);
+    checks[ids[n]] = box ? !!box.checked : null;
+}
+return [title, details, checks];
+"""
+
+SUBCLIENT_CHECKBOXES = ('dataBackup', 'onlineData', 'onlineSubset', 'offlineData',
+                        'logBackup', 'deleteArchiveLogs')
+
+
+class InstanceSnapshot(object):
+    """Details of an Oracle instance page"""
+
+    __slots__ = ('name', 'oracleHome', 'details')
+
+    def __init__(self, name, oracleHome, details):
+        self.name = name
+        self.oracleHome = oracleHome
+        self.details = details
+
+    def AsDict(self):
+        """Returns the snapshot in the GetInstanceDetails() format"""
+        return {"InstanceName": self.name, "Oracle home": self.oracleHome}
+
+
+class SubclientSnapshot(object):
+    """Details and content options of an Oracle subclient page"""
+
+    __slots__ = ('name', 'dataBackup', 'dataBackupType', 'logBackup', 'deleteArchiveLogs', 'details')
+
+    def __init__(self, name, dataBackup, dataBackupType, logBackup, deleteArchiveLogs, details):
+        self.name = name
+        self.dataBackup = dataBackup
+        self.dataBackupType = dataBackupType
+        self.logBackup = logBackup
+        self.deleteArchiveLogs = deleteArchiveLogs
+        self.details = details
+
+    def AsDict(self):
+        """Returns the snapshot in the GetSubclientDetails() format"""
+        details = {"SubclientName": self.name,
+                   "dataBackup": str(self.dataBackup),
+                   "ArchlogBackup": str(self.logBackup),
+                   "deleteArchiveLogs": str(self.logBackup and self.deleteArchiveLogs)}
+        if self.dataBackup and self.dataBackupType:
+            details["dataBackuptype"] = self.dataBackupType
+        return details
+
+
+def ReadSnapshot(driver, checkboxes=()):
+    """Reads the title, details and checkbox states of the current page
+        Returns (title, [(label, value), ...], {checkbox id: checked or None})
+    """
+    title, details, checks = driver.execute_script(SNAPSHOT_SCRIPT, list(checkboxes))
+    return title, [tuple(pair) for pair in details], checks
+
+
+def ReadInstance(driver):
+    """Returns the InstanceSnapshot of the instance page shown"""
+    title, details, _ = ReadSnapshot(driver)
+    oracleHome = None
+    for label, value in details:
+        if label.lower().startswith('oracle home'):
+            oracleHome = value
+            break
+    else:
+        if len(details) > 1:
+            oracleHome = details[1][1]
+    return InstanceSnapshot(title, oracleHome, details)
+
+
+def ReadSubclient(driver):
+    """Returns the SubclientSnapshot of the subclient content dialog shown"""
+    title, details, checks = ReadSnapshot(driver, SUBCLIENT_CHECKBOXES)
+    dataBackupType = None
+    for option in ('onlineData', 'onlineSubset', 'offlineData'):
+        if checks.get(option):
+            dataBackupType = option
+            break
+    return SubclientSnapshot(title, bool(checks.get('dataBackup')), dataBackupType,
+                             bool(checks.get('logBackup')), bool(checks.get('deleteArchiveLogs')),
+                             details)
+
+
+class SnapshotCache(object):
+    """Per-entity snapshot cache, invalidated by the page methods that change an entity"""
+
+    def __init__(self):
+        self.snapshots = {}
+        self.lock = threading.Lock()
+
+    def Get(self, kind, client, name):
+        """Returns the cached snapshot of an entity, or None"""
+        with self.lock:
+            return self.snapshots.get((kind, client, name))
+
+    def Put(self, kind, client, name, snapshot):
+        """Caches the snapshot of an entity"""
+        with self.lock:
+            self.snapshots[(kind, client, name)] = snapshot
+
+    def Invalidate(self, kind, client, name=None):
+        """Drops the snapshot of an entity, or of every entity of the kind when name is None"""
+        with self.lock:
+            for key in list(self.snapshots):
+                if key[0] == kind and key[1] == client and name in (None, key[2]):
+                    del self.snapshots[key]
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""
+This module provides the batched form filling used by the Oracle page objects
+on the AdminConsole. All the fields of a form are written in a single
+execute_script call instead of a clear() and send_keys() round trip per field.
+Functions:
+FillForm()                  -- Sets the values of the form fields and fires the events Angular listens to
+ReadForm()                  -- Returns the current values of the form fields
+Text()                      -- Returns a requested value as the unicode text a form field holds
+ChangedFields()             -- Returns the requested values that differ from the current ones
+FillChanged()               -- Writes only the form fields whose value differs from the requested one
+"""
+from selenium.common.exceptions import NoSuchElementException
+
+try:
+    TEXT = unicode
+except NameError:
+    TEXT = str
+
+FILL_SCRIPT = """
+var values = arguments[0], missing = [];
+var setter = function (el, value) {
+    var proto = el.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype
+              : el.tagName === 'SELECT' ? HTMLSelectElement.prototype
+              : HTMLInputElement.prototype;
+    Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, value);
+};
+for (var key in values) {
+    var el = document.getElementById(key) || document.getElementsByName(key)[0];
+    if (!el) { missing.push(key); continue; }
+    setter(el, values[key] === null ? '' : String(values[key]));
+    ['input', 'change', 'blur'].forEach(function (type) {
+        el.dispatchEvent(new Event(type, {bubbles: true}));
+    });
+}
+return missing;
+"""
+
+READ_SCRIPT = """
+var keys = arguments[0], values = {};
+for (var i = 0; i < keys.length; i++) {
+    var el = document.getElementById(keys[i]) || document.getElementsByName(keys[i])[0];
+    if (el && el.type === 'password') { continue; }
+    values[keys[i]] = el ? el.value : null;
+}
+return values;
+"""
+
+
+def FillForm(driver, values):
+    """Sets the values of the form fields and fires the events Angular listens to
+        driver      : the WebDriver instance
+        values      : a dict, field id (or name) to the value to type into it
+        Raises NoSuchElementException if any of the fields is not on the page
+    """
+    missing = driver.execute_script(FILL_SCRIPT, values)
+    if missing:
+        raise NoSuchElementException("Unable to locate form fields: " + ", ".join(missing))
+
+
+def ReadForm(driver, keys):
+    """Returns the current values of the form fields
+        driver      : the WebDriver instance
+        keys        : a list, the field ids (or names) to read
+        Returns a dict, field to its value, None for the fields not on the page;
+        password inputs are left out, the AdminConsole never shows their value
+    """
+    return driver.execute_script(READ_SCRIPT, list(keys))
+
+
+def Text(value):
+    """Returns a requested value as the unicode text a form field holds"""
+    if value is None:
+        return TEXT()
+    if isinstance(value, bytes):
+        return value.decode('utf-8')
+    return value if isinstance(value, TEXT) else TEXT(value)
+
+
+def ChangedFields(current, values):
+    """Returns the requested values that differ from the current ones
+        current     : a dict, field to its value as returned by ReadForm()
+        values      : a dict, field to the requested value
+        The fields ReadForm() left out, the password inputs, are not compared and not returned
+    """
+    return dict((key, value) for key, value in values.items()
+                if key in current and (current[key] is None or current[key] != Text(value)))
+
+
+def FillChanged(driver, values):
+    """Writes only the form fields whose value differs from the requested one
+        driver      : the WebDriver instance
+        values      : a dict, field id (or name) to the value to type into it
+        The password inputs are not compared, they are written along with the other
+        changed fields so the form is submitted with them
+        Returns the dict of the fields written, empty when the form already holds the values
+        Raises NoSuchElementException if any of the fields is not on the page
+    """
+    current = ReadForm(driver, values)
+    changed = ChangedFields(current, values)
+    if changed:
+        changed.update((key, value) for key, value in values.items() if key not in current)
+        FillForm(driver, changed)
+    return changed
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+"""
+This module provides the structured job history reader used by the Oracle page
+objects on the AdminConsole.
+The job grid is read by column label in one script call and returned as
+JobRecord objects. A per key (subclient, agent) high-water mark makes repeated
+polls return only the jobs newer than the last one seen; the rows below the mark
+are skipped inside the browser and never sent over the wire.
+Class:
+    JobRecord() -> object()
+    JobHistory() -> object()
+Functions:
+ReadJobRecords()            -- Reads the job grid of the current page into JobRecord objects
+Read()                      -- Returns the jobs of the current page newer than the key's high-water mark
+Reset()                     -- Forgets the high-water mark of a key, or of every key
+"""
+from OraclePages.UiGrid import READ_SCRIPT
+
+COLUMNS = (
+    ('id', ('job id',)),
+    ('type', ('operation', 'job type', 'backup type', 'type')),
+    ('status', ('status',)),
+    ('start', ('start time', 'started', 'start')),
+    ('end', ('end time', 'finished', 'end')),
+    ('size', ('size', 'size of application', 'data transferred')),
+)
+
+# the grid is read by UiGrid.READ_SCRIPT, then the rows at or below the mark are dropped in the browser
+HISTORY_SCRIPT = """
+var fields = arguments[0], since = arguments[1];
+var grid = (function () {""" + READ_SCRIPT + """}).apply(null, [arguments[2]]);
+var labels = [], rows = grid[1];
+for (var l = 0; l < grid[0].length; l++) { labels.push(grid[0][l].toLowerCase()); }
+var index = [];
+for (var f = 0; f < fields.length; f++) {
+    index.push(-1);
+    for (var n = 0; n < fields[f].length && index[f] < 0; n++) { index[f] = labels.indexOf(fields[f][n]); }
+}
+if (index[0] < 0) { return null; }
+var records = [];
+for (var r = 0; r < rows.length; r++) {
+    var id = parseInt((rows[r][index[0]] || '').replace(/\\D/g, ''), 10);
+    if (isNaN(id) || id <= since) { continue; }
+    var record = [id];
+    for (var f = 1; f < index.length; f++) { record.push(index[f] < 0 ? '' : rows[r][index[f]] || ''); }
+    records.push(record);
+}
+return records;
+"""
+
+# job types and statuses repeat on every row, one string object is kept per value
+SHARED_VALUES = {}
+
+
+class JobRecord(object):
+    """A job history row, kept small so days of soak test history stay cheap"""
+
+    __slots__ = ('id', 'type', 'status', 'start', 'end', 'size')
+
+    def __init__(self, id, type, status, start, end, size):
+        self.id = id
+        self.type = type
+        self.status = status
+        self.start = start
+        self.end = end
+        self.size = size
+
+    def __repr__(self):
+        return "JobRecord(%d, %r, %r)" % (self.id, self.type, self.status)
+
+
+def ReadJobRecords(driver, since=0, root='.ui-grid'):
+    """Reads the job grid of the current page into JobRecord objects
+        driver      : the WebDriver instance
+        since       : an integer, only the jobs with a greater ID are returned
+        root        : a CSS selector or WebElement of the grid, the first ui-grid by default
+        Returns a list of JobRecord, newest first, or None if the grid has no job ID column
+    """
+    rows = driver.execute_script(HISTORY_SCRIPT, [labels for _, labels in COLUMNS], since, root)
+    if rows is None:
+        return None
+    shared = SHARED_VALUES
+    records = [JobRecord(int(row[0]), shared.setdefault(row[1], row[1]),
+                         shared.setdefault(row[2], row[2]), row[3], row[4], row[5])
+               for row in rows]
+    records.sort(key=lambda record: record.id, reverse=True)
+    return records
+
+
+class JobHistory(object):
+
+    def __init__(self):
+        self.watermarks = {}
+
+    def Read(self, driver, key, incremental=True, root='.ui-grid'):
+        """Returns the jobs of the current page newer than the key's high-water mark
+            driver      : the WebDriver instance
+            key         : a string, what the history belongs to, e.g. the subclient name
+            incremental : a boolean, False to read the whole grid
+            Returns a list of JobRecord, newest first, or None if the page has no job grid
+        """
+        since = self.watermarks.get(key, 0) if incremental else 0
+        records = ReadJobRecords(driver, since, root)
+        if records:
+            self.watermarks[key] = max(self.watermarks.get(key, 0), records[0].id)
+        return records
+
+    def Reset(self, key=None):
+        """Forgets the high-water mark of a key, or of every key"""
+        if key is None:
+            self.watermarks.clear()
+        else:
+            self.watermarks.pop(key, None)
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+"""
+This module provides the background tracker of the backup, restore and clone
+jobs submitted by the Oracle page objects on the AdminConsole.
+The job IDs are registered by the page methods that return them and polled on a
+background thread, so the UI session can submit the next job right away.
+Class:
+    JobTracker() -> object()
+    RestJobStatus() -> object()
+Functions:
+IsFinal()                   -- Returns True if the job status is a final one
+Register()                  -- Starts tracking the given job
+Status()                    -- Returns the last known status of a job
+Poll()                      -- Polling thread, each job is polled at its own cadence until it is final
+wait_all()                  -- Waits for the given jobs to finish and returns their statuses
+Stop()                      -- Stops the polling thread
+"""
+import json
+import threading
+import time
+
+from AutomationUtils import loghelper
+
+try:
+    from urllib2 import Request, urlopen
+except ImportError:
+    from urllib.request import Request, urlopen
+
+FINAL_STATES = ("completed", "failed", "killed", "committed", "failed to start")
+
+# seconds between the checks wait_all() makes that the polling thread is still alive
+ALIVE_CHECK = 1.0
+
+
+def IsFinal(status):
+    """Returns True if the job status is a final one"""
+    return bool(status) and status.lower().startswith(FINAL_STATES)
+
+
+class RestJobStatus(object):
+    """Reads the status of a job from the CommServe REST API, or a local stand-in
+    serving the same GET Job/<id> resource."""
+
+    def __init__(self, baseUrl, token=None, timeout=30):
+        """ baseUrl : a string, e.g. http://webconsole/webconsole/api
+            token   : a string, the Authtoken header value, if the server requires one """
+        self.baseUrl = baseUrl.rstrip("/")
+        self.token = token
+        self.timeout = timeout
+
+    def __call__(self, jobId):
+        request = Request("%s/Job/%s" % (self.baseUrl, jobId), headers={"Accept": "application/json"})
+        if self.token:
+            request.add_header("Authtoken", self.token)
+        response = urlopen(request, timeout=self.timeout)
+        try:
+            body = json.loads(response.read().decode("utf-8"))
+        finally:
+            response.close()
+        jobs = body.get("jobs") or [{}]
+        return jobs[0].get("jobSummary", {}).get("status")
+
+
+class JobTracker(object):
+
+    def __init__(self, status, interval=5, maxInterval=60):
+        """ status      : a callable returning the status string of a job ID, e.g. RestJobStatus
+            interval    : seconds between the first polls of a job
+            maxInterval : seconds the polling of a long running job backs off to """
+        self.status = status
+        self.interval = interval
+        self.maxInterval = maxInterval
+        self.jobs = {}
+        self.lock = threading.Condition()
+        self.stopped = False
+        self.thread = threading.Thread(target=self.Poll, name="JobTracker")
+        self.thread.daemon = True
+        self.thread.start()
+
+    def Register(self, jobId):
+        """Starts tracking the given job"""
+        jobId = str(jobId)
+        with self.lock:
+            if jobId not in self.jobs:
+                self.jobs[jobId] = {'status': None, 'next': time.time(),
+                                    'interval': self.interval, 'error': None}
+                self.lock.notify_all()
+        return jobId
+
+    def Status(self, jobId):
+        """Returns the last known status of a job, None if it was not polled yet"""
+        with self.lock:
+            job = self.jobs.get(str(jobId))
+            return job and job['status']
+
+    def Poll(self):
+        """Polling thread, each job is polled at its own cadence until it is final"""
+        while True:
+            with self.lock:
+                if self.stopped:
+                    return
+                now = time.time()
+                due = [jobId for jobId, job in self.jobs.items()
+                       if not IsFinal(job['status']) and job['next'] <= now]
+                if not due:
+                    pending = [job['next'] for job in self.jobs.values() if not IsFinal(job['status'])]
+                    self.lock.wait(max(0.01, min(pending) - now) if pending else None)
+                    continue
+            for jobId in due:
+                try:
+                    status, error = self.status(jobId), None
+                except Exception as e:
+                    status, error = None, str(e)
+                with self.lock:
+                    job = self.jobs[jobId]
+                    if status is not None:
+                        job['status'] = status
+                    job['error'] = error
+                    job['interval'] = min(job['interval'] * 2, self.maxInterval)
+                    job['next'] = time.time() + job['interval']
+                    self.lock.notify_all()
+
+    def wait_all(self, job_ids, timeout=3600):
+        """Waits for the given jobs to finish and returns their statuses.
+            job_ids : a list, the job IDs to wait for, registered if they are not yet
+            timeout : seconds to wait, 0 returns the current statuses without waiting
+            Stops waiting early if the tracker was stopped or its polling thread died.
+            Returns a dict of job ID to its last known status; the jobs still pending
+            are the ones whose status is not final, IsFinal() tells them apart
+        """
+        job_ids = [self.Register(jobId) for jobId in job_ids]
+        end = time.time() + timeout
+        with self.lock:
+            while True:
+                statuses = dict((jobId, self.jobs[jobId]['status']) for jobId in job_ids)
+                pending = sorted(jobId for jobId, status in statuses.items() if not IsFinal(status))
+                if not pending:
+                    return statuses
+                left = end - time.time()
+                if left <= 0 or self.stopped or not self.thread.is_alive():
+                    loghelper.getLog().warning("Stopped waiting for %d jobs still pending: %s" % (
+                        len(pending), ", ".join(pending)))
+                    return statuses
+                self.lock.wait(min(left, ALIVE_CHECK))
+
+    def Stop(self):
+        """Stops the polling thread"""
+        with self.lock:
+            self.stopped = True
+            self.lock.notify_all()
+        self.thread.join()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""
+This module provides the deep-link cache used by OpenInstance() and
+OpenSubclient() of the Oracle page objects on the AdminConsole.
+The AdminConsole URL of an instance or subclient is recorded the first time it is
+opened, keyed by client, agent and entity name; later opens go straight to that
+URL instead of rendering the parent grid and clicking the link. Entries are
+invalidated when the entity is deleted.
+Class:
+    NavigationCache() -> object()
+Functions:
+Get()                       -- Returns the recorded URL of an entity, or None
+Put()                       -- Records the URL of an entity
+Invalidate()                -- Forgets an entity, and with children=True everything under it
+Clear()                     -- Forgets every entity
+Key()                       -- Returns the cache key of an entity
+Flush()                     -- Writes the URLs to the cache file, if there is one
+"""
+import json
+import threading
+
+
+class NavigationCache(object):
+
+    def __init__(self, path=None):
+        """ path    : a string, a JSON file to keep the URLs in across runs, in memory only by default """
+        self.path = path
+        self.urls = {}
+        self.lock = threading.Lock()
+        if path:
+            try:
+                with open(path) as f:
+                    self.urls = json.load(f)
+            except (IOError, OSError, ValueError):
+                self.urls = {}
+
+    @staticmethod
+    def Key(client, agent, name):
+        """Returns the cache key of an entity"""
+        return "%s|%s|%s" % (client, agent, name)
+
+    def Get(self, client, agent, name):
+        """Returns the recorded URL of an entity, or None"""
+        with self.lock:
+            return self.urls.get(self.Key(client, agent, name))
+
+    def Put(self, client, agent, name, url):
+        """Records the URL of an entity"""
+        with self.lock:
+            self.urls[self.Key(client, agent, name)] = url
+            self.Flush()
+
+    def Invalidate(self, client, agent, name, children=False):
+        """Forgets an entity, and with children=True everything under it
+        (the entities whose agent is <agent>/<name>, such as the subclients of an instance)"""
+        key = self.Key(client, agent, name)
+        childPrefix = self.Key(client, "%s/%s" % (agent, name), "")
+        with self.lock:
+            self.urls.pop(key, None)
+            if children:
+                for other in [k for k in self.urls if k.startswith(childPrefix)]:
+                    del self.urls[other]
+            self.Flush()
+
+    def Clear(self):
+        """Forgets every entity"""
+        with self.lock:
+            self.urls.clear()
+            self.Flush()
+
+    def Flush(self):
+        """Writes the URLs to the cache file, if there is one; called with the lock held"""
+        if self.path:
+            with open(self.path, 'w') as f:
+                json.dump(self.urls, f)
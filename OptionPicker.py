@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+"""
+This module provides the cached option pickers used by the Oracle page objects
+on the AdminConsole for the plan, network and dropdown controls.
+The option list of a control is read with a single script call and kept as a
+name to index map for a configurable time per page and control; the target
+option is then selected with one more script call. Picking the same plan for
+many subclients scans the plan list once.
+Class:
+    OptionIndex() -> object()
+Functions:
+Options()                   -- Returns the option texts of a control, reading them only when not cached
+Lookup()                    -- Returns the index of the option matching the target
+Pick()                      -- Selects the option matching the target in one script call
+Invalidate()                -- Forgets the cached options of a page, a control or everything
+Entry()                     -- Returns the cached option texts and lookups of a control
+Matches()                   -- Returns True if an option text is the target
+"""
+import threading
+import time
+
+from selenium.common.exceptions import NoSuchElementException
+
+# the option rows of the isteven-multi-select pickers (plans, networks)
+CHECKBOX_CONTAINER = "div.checkBoxContainer"
+
+LIST_SCRIPT = """
+var kind = arguments[0], control = arguments[1], texts = [];
+var clean = function (s) { return (s || '').replace(/\\s+/g, ' ').trim(); };
+if (kind === 'select') {
+    var el = document.getElementById(control) || document.getElementsByName(control)[0];
+    if (!el) { return null; }
+    for (var i = 0; i < el.options.length; i++) { texts.push(clean(el.options[i].text)); }
+} else {
+    var boxes = document.querySelectorAll(control);
+    if (!boxes.length) { return null; }
+    for (var b = 0; b < boxes.length; b++) {
+        for (var n = 0; n < boxes[b].children.length; n++) {
+            texts.push(clean((boxes[b].children[n].querySelector('label span') || {}).textContent));
+        }
+    }
+}
+return texts;
+"""
+
+PICK_SCRIPT = """
+var kind = arguments[0], control = arguments[1], index = arguments[2], text = arguments[3];
+var clean = function (s) { return (s || '').replace(/\\s+/g, ' ').trim(); };
+if (kind === 'select') {
+    var el = document.getElementById(control) || document.getElementsByName(control)[0];
+    if (!el || !el.options[index] || clean(el.options[index].text) !== text) { return false; }
+    el.selectedIndex = index;
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+    return true;
+}
+var boxes = document.querySelectorAll(control), row = null;
+for (var b = 0; b < boxes.length && !row; b++) {
+    if (index < boxes[b].children.length) { row = boxes[b].children[index]; }
+    else { index -= boxes[b].children.length; }
+}
+if (!row || clean((row.querySelector('label span') || {}).textContent) !== text) { return false; }
+(row.querySelector('label input ~ span') || row.querySelector('label span')).click();
+return true;
+"""
+
+
+class OptionIndex(object):
+
+    def __init__(self, ttl=300):
+        """ ttl     : seconds a control's option list is trusted before it is read again """
+        self.ttl = ttl
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def Matches(kind, text, target):
+        """Returns True if the option text is the target: the exact visible text for
+        dropdowns, the text without spaces containing the target for checkbox pickers"""
+        if kind == 'select':
+            return text == target
+        return text.replace(" ", "").find(target) >= 0
+
+    def Entry(self, driver, kind, control, page, refresh=False):
+        """Returns the cached (texts, lookups) of a control, reading the options when
+        they are not cached, expired or refresh is True"""
+        key = (page if page is not None else driver.current_url, kind, control)
+        with self.lock:
+            entry = self.entries.get(key)
+        if refresh or entry is None or time.time() - entry[0] > self.ttl:
+            texts = driver.execute_script(LIST_SCRIPT, kind, control)
+            if texts is None:
+                raise NoSuchElementException("Unable to locate the option control: " + control)
+            entry = (time.time(), texts, {})
+            with self.lock:
+                self.entries[key] = entry
+        return entry
+
+    def Options(self, driver, kind, control, page=None):
+        """Returns the option texts of a control, reading them only when not cached
+            driver  : the WebDriver instance
+            kind    : a string, "select" for a dropdown, "checkbox" for a multi-select picker
+            control : a string, the dropdown id (or name), or the css of the checkbox containers;
+                      the rows of all the matching containers are indexed in document order
+            page    : a string, the cache key of the page, the current url by default;
+                      pickers showing the same list on several pages can share one key
+        """
+        return self.Entry(driver, kind, control, page)[1]
+
+    def Lookup(self, driver, kind, control, target, page=None, refresh=False):
+        """Returns the index of the option matching the target
+            Raises NoSuchElementException if no option matches
+        """
+        _, texts, lookups = self.Entry(driver, kind, control, page, refresh)
+        if target not in lookups:
+            for index, text in enumerate(texts):
+                if self.Matches(kind, text, target):
+                    lookups[target] = (index, text)
+                    break
+            else:
+                raise NoSuchElementException("Could not find the option %s in %s" % (target, control))
+        return lookups[target]
+
+    def Pick(self, driver, kind, control, target, page=None):
+        """Selects the option matching the target in one script call, reading the
+        options again once if the cached index no longer points at the target
+            Returns the index selected
+            Raises NoSuchElementException if no option matches
+        """
+        index, text = self.Lookup(driver, kind, control, target, page)
+        if not driver.execute_script(PICK_SCRIPT, kind, control, index, text):
+            index, text = self.Lookup(driver, kind, control, target, page, refresh=True)
+            if not driver.execute_script(PICK_SCRIPT, kind, control, index, text):
+                raise NoSuchElementException("Could not select the option %s in %s" % (target, control))
+        return index
+
+    def Invalidate(self, page=None, control=None):
+        """Forgets the cached options of a page, a control or, with no arguments, everything"""
+        with self.lock:
+            for key in list(self.entries):
+                if page in (None, key[0]) and control in (None, key[2]):
+                    del self.entries[key]
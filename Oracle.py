@@ -6,7 +6,30 @@ Class:
     Oracle() -> iDA() -> ClientDetails() -> Clients() -> Server() --
             -> AdminPage() -> LoginPage() -> AdminConsoleBase() -> object()
 Functions:
+Wait_for_Completion()       -- Waits for the AdminConsole Ajax activity to settle.
+AjaxWaiter()                -- Returns the event driven wait engine bound to the current driver.
+LeaseSession()              -- Binds the page object to a warm driver from a SessionPool.
+ReturnSession()             -- Gives the leased driver back to its SessionPool.
+FillForm()                  -- Fills the form fields in a single WebDriver round trip.
+PickOption()                -- Selects a dropdown option using the cached option index.
+PickChecked()               -- Checks a multi-select picker entry using the cached option index.
+SetPointInTime()            -- Writes a point in time into a date/time field in one call.
+GetGridJobIds()             -- Returns the job IDs listed in the ui-grid of the current page.
+SelectBrowseItems()         -- Selects the given items in the restore browse grid.
+TrackJob()                  -- Registers a submitted job with the background job tracker.
+CountCommands()             -- Counts the WebDriver commands of every page-object call, checking their budgets.
+ReadJobHistory()            -- Returns the typed job records of the job grid on the current page.
+CheckJobHistory()           -- Returns the job records of the history grid shown, failing when it lists none.
+ProbeEntity()               -- Returns the element if it exists, without paying the implicit wait on a miss.
+Check_If_Entity_Exists()    -- Checks if the entity exists, counting the time spent in EntityProbe.CheckCounters.
 OpenInstance()              -- Opens the instance with the given name.
+OpenCached()                -- Opens an entity from its cached deep link.
+Remember()                  -- Records the deep link of the entity page shown.
+ShownTitle()                -- Returns the title of the page shown.
+RestSetup()                 -- Creates the entities a test needs through the REST fast path.
+RestTeardown()              -- Deletes the entities created through the REST fast path.
+GetInstanceDetails()        -- Returns the details of the instance page shown.
+GetInstanceSnapshot()       -- Returns the one-shot detail snapshot of the instance page shown.
 AddInstance()               -- Adds a new instance to the iDA
 ActionAddInstance()         -- Adds a new instance from action menu
 ActionAddSubclient()        -- Creates a Oracle subclient from Action menu of the instance
@@ -26,14 +49,215 @@ from OraclePages.CVPages import *
 from AutomationUtils.loghelper import *
 from AdminConsole.Helper.Exception import *
 from AdminConsole.Helper.Exception import AppException
-import ast, re
+import ast, datetime, re, time
 from AdminConsolePages.AdminPage import *
 from Helper.AdminConsoleBase import *
 from AutomationUtils import loghelper
-from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from OraclePages.AjaxWait import AjaxWait
+from OraclePages.DriverHooks import HasCommandListener
+from OraclePages import FormFill
+from OraclePages import EntityProbe
+from OraclePages import UiGrid
+from OraclePages.CrawlPlanner import CrawlPlanner
+from OraclePages.JobHistory import JobHistory, ReadJobRecords
+from OraclePages.NavigationCache import NavigationCache
+from OraclePages import EntitySnapshot
+from OraclePages.OptionPicker import OptionIndex, CHECKBOX_CONTAINER
+from OraclePages import DateTimeInput
+from OraclePages.CommandCounter import CommandCounter
 
 class Oracle(iDA):
 
+    AjaxWaitEnabled = True
+    Tracker = None
+    Navigation = NavigationCache()
+    ClientName = ''
+    CurrentInstance = None
+    Snapshots = None
+    Options = OptionIndex()
+    Rest = None
+
+    def Wait_for_Completion(self, *args, **kwargs):
+        """ Waits for the AdminConsole Ajax activity to settle.
+            Returns as soon as Angular, the cvBusyOnAjax buttons and the XHR/fetch
+            counter report idle. A page still busy after the engine timeout is logged
+            and left as it is, the next action reports what failed. Falls back to the
+            AdminConsoleBase wait when the engine is disabled or cannot probe the page. """
+        if self.AjaxWaitEnabled and not args and not kwargs:
+            try:
+                settled = self.AjaxWaiter().Wait()
+            except Exception as e:
+                loghelper.getLog().warning("Ajax wait unavailable: " + str(e))
+            else:
+                if not settled:
+                    loghelper.getLog().warning(
+                        "The page is still busy after %d seconds" % self.AjaxWaiter().timeout)
+                return
+        return super(Oracle, self).Wait_for_Completion(*args, **kwargs)
+
+    def AjaxWaiter(self):
+        """ Returns the event driven wait engine bound to the current driver.
+            A new engine is made when the driver was handed back to a SessionPool
+            since, as the pool clears the command listener the engine counts with. """
+        waiter = getattr(self, '_ajaxWait', None)
+        if waiter is None or waiter.driver is not self.driver or \
+                not HasCommandListener(self.driver, waiter._OnCommand):
+            waiter = self._ajaxWait = AjaxWait(self.driver)
+        return waiter
+
+    def LeaseSession(self, pool, timeout=None):
+        """ Binds the page object to a warm driver from a SessionPool.
+            pool    : the SessionPool to lease the logged-in driver from
+            timeout : seconds to wait for a free driver
+            The driver is left on the pool's landing page. """
+        self.driver = pool.Lease(timeout)
+        self._sessionPool = pool
+        return self.driver
+
+    def ReturnSession(self, broken=False):
+        """ Gives the leased driver back to its SessionPool.
+            broken  : a boolean, True to have the pool replace the driver """
+        pool = getattr(self, '_sessionPool', None)
+        if pool is not None:
+            pool.Release(self.driver, broken)
+            self._sessionPool = None
+            self.driver = None
+
+    def FillForm(self, fields, changedOnly=False):
+        """ Fills the form fields in a single WebDriver round trip.
+            fields      : a dict, field id (or name) to the value to type into it
+            changedOnly : a boolean, True to read the form first and write only the fields that differ
+            Returns the dict of the fields written
+            Raises NoSuchElementException if any of the fields is not on the page """
+        if changedOnly:
+            return FormFill.FillChanged(self.driver, fields)
+        FormFill.FillForm(self.driver, fields)
+        return fields
+
+    def PickOption(self, control, target, page=None):
+        """ Selects the option with the given visible text in a dropdown, using the cached option index.
+            control : a string, id (or name) of the dropdown
+            target  : a string, visible text of the option
+            page    : a string, the cache key of the option list, the current url by default
+            Raises NoSuchElementException if there is no such option """
+        return self.Options.Pick(self.driver, "select", control, target, page)
+
+    def PickChecked(self, target, page=None, container=CHECKBOX_CONTAINER):
+        """ Checks the entry containing the given text in a multi-select picker (plans, networks),
+            using the cached option index.
+            target      : a string, text of the entry, spaces ignored
+            page        : a string, the cache key of the option list, the current url by default
+            container   : a string, css of the checkbox container
+            Raises NoSuchElementException if there is no such entry """
+        return self.Options.Pick(self.driver, "checkbox", container, target, page)
+
+    def SetPointInTime(self, field, when):
+        """ Writes a point in time into a restore or clone date/time field in one call
+            and checks the widget accepted it, instead of typing or clicking through the calendar.
+            field   : a string, id of the field, or a CSS selector of it
+            when    : a datetime, or a string typed the way the field expects it
+            Raises ValueError if the field is missing or rejected the value """
+        shown = DateTimeInput.SetDateTime(self.driver, field, when)
+        loghelper.getLog().info("Point in time set to " + str(shown))
+        return shown
+
+    def Check_If_Entity_Exists(self, *args, **kwargs):
+        """ Checks if the entity exists, counting the time spent in EntityProbe.CheckCounters
+            so the cost of the lookups that miss shows up per run. """
+        start = time.time()
+        found = super(Oracle, self).Check_If_Entity_Exists(*args, **kwargs)
+        EntityProbe.CheckCounters.Add(found, time.time() - start)
+        return found
+
+    def ProbeEntity(self, entityType, entity, wait=0):
+        """ Returns the element if it exists, without paying the implicit wait on a miss.
+            entityType  : a string, "xpath", "id", "name", "css", "link" or "partial_link"
+            entity      : a string, the locator
+            wait        : seconds to keep looking before reporting a miss, 0 checks once
+            Returns the WebElement, or None if there is no such element
+            The time spent is counted in EntityProbe.Counters. """
+        return EntityProbe.Probe(self.driver, entityType, entity, wait)
+
+    def TrackJob(self, jobId):
+        """ Registers a submitted job with the background job tracker.
+            jobId   : a string, the ID of the backup, restore or clone job
+            Returns True if a JobTracker is attached to the page (self.Tracker),
+                    False otherwise """
+        if self.Tracker is None:
+            return False
+        self.Tracker.Register(jobId)
+        return True
+
+    def CountCommands(self, budgets=(), strict=True):
+        """ Counts the WebDriver commands of every page-object call, by type, checking their budgets.
+            budgets : a list of strings such as "OpenInstance <= 5", or a dict, method to the most
+                      commands one call may send
+            strict  : a boolean, True to raise BudgetExceeded from the outermost call once a budget is exceeded
+            Returns the CommandCounter, its Summary() logs the commands per method; call its Unwrap(),
+            or use it in a with statement, to stop counting """
+        counter = CommandCounter(self.driver, budgets, strict)
+        counter.Wrap(self)
+        return counter
+
+    def ReadJobHistory(self, key, incremental=True):
+        """ Returns the typed job records of the job grid on the current page.
+            key         : a string, what the history belongs to, e.g. the subclient name
+            incremental : a boolean, True to return only the jobs newer than the last
+                          ones seen for the key by this page object
+            Returns (True, [JobRecord, ...]) newest first
+                    (False, func_name, error_msg) otherwise """
+        log = loghelper.getLog()
+        try:
+            if getattr(self, '_jobHistory', None) is None:
+                self._jobHistory = JobHistory()
+            records = self._jobHistory.Read(self.driver, key, incremental)
+            if records is None:
+                e = "There is no job grid on this page"
+                log.error(e)
+                fn = sys._getframe().f_code.co_name
+                return False, fn, e
+            log.info("%d new jobs for %s" % (len(records), key))
+            return True, records
+        except Exception as e:
+            log.exception(str(e))
+            fn = sys._getframe().f_code.co_name
+            return False, fn, str(e)
+
+    def CheckJobHistory(self, key):
+        """ Returns the job records of the history grid shown, failing when it lists none.
+            key         : a string, what the history belongs to, e.g. the subclient name;
+                          its high-water mark is moved to the newest job listed
+            Returns (True, [JobRecord, ...]) newest first
+                    (False, func_name, error_msg) otherwise """
+        ret = self.ReadJobHistory(key, incremental=False)
+        if ret[0] and not ret[1]:
+            e = "There are no jobs in the history of " + key
+            loghelper.getLog().error(e)
+            return False, sys._getframe().f_code.co_name, e
+        return ret
+
+    def GetGridJobIds(self):
+        """ Returns the job IDs listed in the ui-grid of the current page.
+            The grid is read in one script call; the Job ID column is used when
+            present, otherwise every number in the grid. Only the numbers above 100
+            are taken either way. """
+        log = loghelper.getLog()
+        records = ReadJobRecords(self.driver)
+        if records is not None:
+            JobID = [str(record.id) for record in records if record.id > 100]
+            log.info(str(JobID))
+            return JobID
+        columns, rows = UiGrid.ReadGridTable(self.driver)
+        cells = [cell for row in rows for cell in row]
+        JobID = []
+        for cell in cells:
+            for j in re.findall("\d+", cell):
+                if int(j)>100:
+                    JobID.append(j)
+                    log.info(str(j))
+        return JobID
+
     def OpenInstance(self, instance):
         """ Opens the instance with the given name.
             instance   : a string, name of the instance we want to open
@@ -42,10 +266,15 @@ class Oracle(iDA):
         log = loghelper.getLog()
         try:
             log.info("opening Instance " + instance)
+            if self.OpenCached("Oracle", instance):
+                self.CurrentInstance = instance
+                return True, 1
             #self.SearchFor(instance)
             if self.Check_If_Entity_Exists("link", instance):
                 self.driver.find_element_by_link_text(instance).click()
                 self.Wait_for_Completion()
+                self.Remember("Oracle", instance)
+                self.CurrentInstance = instance
                 return True, 1
             else:
                 self.ErroroutScreenShot()
@@ -59,16 +288,101 @@ class Oracle(iDA):
             log.exception(str(e))
             return False, fn, str(e)
 
+    def RestSetup(self, servers=(), instances=(), subclients=()):
+        """ Creates the DB servers, instances and subclients a test needs through the REST fast path
+            (self.Rest, an OracleRest.OracleRest), then reloads the page shown so the UI lists them.
+            servers, instances, subclients : lists of dicts, the OracleRest Add call arguments
+            Return (True, results) if everything was created, results being the OracleRest.Provision() dict
+                    (False, func_name, error_msg) otherwise """
+        log = loghelper.getLog()
+        fn = sys._getframe().f_code.co_name
+        try:
+            results = self.Rest.Provision(servers, instances, subclients)
+            self.driver.refresh()
+            self.Wait_for_Completion()
+            failed = [r for kind in results.values() for r in kind if not r[0]]
+            if failed:
+                e = "REST setup failed for %d entities: %s" % (len(failed), failed[0][2])
+                log.error(e)
+                return False, fn, e
+            return True, results
+        except Exception as e:
+            log.exception(str(e))
+            return False, fn, str(e)
+
+    def RestTeardown(self):
+        """ Deletes the entities created through self.Rest, and the ones registered with self.Rest.Record(),
+            forgetting their cached deep links and snapshots.
+            Return (True, 1) if everything was deleted
+                    (False, func_name, error_msg) otherwise """
+        log = loghelper.getLog()
+        fn = sys._getframe().f_code.co_name
+        try:
+            created = list(self.Rest.created)
+            failed = self.Rest.Teardown()
+            for kind, entity in created:
+                if kind == "instance":
+                    self.Navigation.Invalidate(entity["clientName"], "Oracle", entity["instanceName"], children=True)
+                elif kind == "subclient":
+                    self.Navigation.Invalidate(entity["clientName"], "Oracle/%s" % entity["instanceName"],
+                                               entity["subclientName"])
+            if self.Snapshots is not None:
+                self.Snapshots = EntitySnapshot.SnapshotCache()
+            if failed:
+                e = "REST teardown failed for %d entities: %s" % (len(failed), failed[0][2])
+                log.error(e)
+                return False, fn, e
+            return True, 1
+        except Exception as e:
+            log.exception(str(e))
+            return False, fn, str(e)
+
+    def OpenCached(self, agent, name):
+        """ Opens an entity from its cached deep link.
+            agent   : a string, the agent key of the entity, "Oracle" for instances
+            name    : a string, the name of the instance or subclient
+            The entity is cached per self.ClientName the first time it is opened by
+            clicking its link, nothing is cached while ClientName is not set. The page
+            title must be the entity name, otherwise the entry is dropped and the
+            page shown before is opened again.
+            Returns True if the entity was opened, False if the caller has to click through """
+        if not self.ClientName:
+            return False
+        url = self.Navigation.Get(self.ClientName, agent, name)
+        if url is None:
+            return False
+        parent = self.driver.current_url
+        self.driver.get(url)
+        self.Wait_for_Completion()
+        if self.ShownTitle() == name.strip():
+            loghelper.getLog().info("Opened %s from its cached url %s" % (name, url))
+            return True
+        self.Navigation.Invalidate(self.ClientName, agent, name)
+        self.driver.get(parent)
+        self.Wait_for_Completion()
+        return False
+
+    def Remember(self, agent, name):
+        """ Records the deep link of the entity page shown, when self.ClientName is set.
+            agent   : a string, the agent key of the entity, "Oracle" for instances
+            name    : a string, the name of the instance or subclient """
+        if self.ClientName:
+            self.Navigation.Put(self.ClientName, agent, name, self.driver.current_url)
+
+    def ShownTitle(self):
+        """ Returns the title of the page shown, the entity name on an instance or subclient page """
+        title = self.driver.execute_script(
+            "var h = document.querySelector('h1'); return h ? h.textContent : '';")
+        return (title or '').strip()
+
     def getServInstances(self):
         """ Fetches the instances for the added server """
         log = loghelper.getLog()
         try:
             inst=[]
             log.info("instance under the given client ")
-            parent = self.driver.find_elements_by_xpath("//div[2]/div[@class='ui-grid-canvas']/div")
-            for i in parent:
-                t = i.find_element_by_xpath("./div/div[1]/a").text
-                t = t.strip()
+            for name in UiGrid.ReadColumn(self.driver, ("Name", "Instance")):
+                t = name.strip()
                 t = t.replace(" ","")
                 inst.append(t)
             self.Wait_for_Completion()
@@ -87,11 +401,9 @@ class Oracle(iDA):
         try:
             if instance is not None:
                 log.info("Fetching the details of the instance- %s" %instance)
-                InstanceDetails = {}
-                displayedTitle=self.driver.find_element_by_xpath('//h1[@class="float-left ng-binding"]')
-                InstanceDetails.update({"InstanceName":(displayedTitle.text)})
-                oraHome = self.driver.find_element_by_xpath('//div/div[1]/ul/li[2]/span[2][@class="pageDetailColumn ng-binding"]')
-                InstanceDetails.update({"Oracle home": (oraHome.text.encode('utf-8'))})
+                snapshot = self.GetInstanceSnapshot(instance)
+                InstanceDetails = snapshot.AsDict()
+                InstanceDetails.update({"Oracle home": (snapshot.oracleHome or '').encode('utf-8')})
                 log.info("Instance details fetched")
                 return InstanceDetails
         except Exception as e:
@@ -99,6 +411,19 @@ class Oracle(iDA):
             log.exception(str(e))
             return False, fn, str(e)
 
+    def GetInstanceSnapshot(self, instance):
+        """ Returns the details of the instance page shown, read in one script call.
+            instance    : a string, name of the instance, used as the cache key
+            Returns an EntitySnapshot.InstanceSnapshot, from self.Snapshots when cached """
+        if self.Snapshots is not None and self.ClientName:
+            snapshot = self.Snapshots.Get("instance", self.ClientName, instance)
+            if snapshot is not None:
+                return snapshot
+        snapshot = EntitySnapshot.ReadInstance(self.driver)
+        if self.Snapshots is not None and self.ClientName:
+            self.Snapshots.Put("instance", self.ClientName, instance, snapshot)
+        return snapshot
+
     def AddInstance(
             self,
             Instance,
@@ -125,35 +450,30 @@ class Oracle(iDA):
         try:
             log.info("Adding a new Instance")
             '''Adds only the non-existing instance.'''
-            if not self.Check_If_Entity_Exists("link", Instance):
+            if self.ProbeEntity("link", Instance) is None:
                 self.driver.find_element_by_link_text("Add instance").click()
                 self.Wait_for_Completion()
                 '''Filling the form with all the required parameters.'''
-                self.driver.find_element_by_id("instanceName").clear()
-                self.driver.find_element_by_id("instanceName").send_keys(Instance)
-                self.driver.find_element_by_id("oracleHome").clear()
-                self.driver.find_element_by_id("oracleHome").send_keys(oracleHome)
-                self.driver.find_element_by_id("osUserName").clear()
-                self.driver.find_element_by_id("osUserName").send_keys(osusername)
+                fields = {
+                    "instanceName": Instance,
+                    "oracleHome": oracleHome,
+                    "osUserName": osusername,
+                    "dbUserName": dbusername,
+                    "dbPassword": dbpassword,
+                    "dbInstanceName": instanceName}
                 log.info(os)
                 if os != 'Linux':
-                    self.driver.find_element_by_id("osUserPassword").clear()
-                    self.driver.find_element_by_id("osUserPassword").send_keys(osuserpassword)
-                self.Wait_for_Completion()
-                self.driver.find_element_by_id("dbUserName").clear()
-                self.driver.find_element_by_id("dbUserName").send_keys(dbusername)
-                self.driver.find_element_by_id("dbPassword").clear()
-                self.driver.find_element_by_id("dbPassword").send_keys(dbpassword)
-                self.driver.find_element_by_id("dbInstanceName").clear()
-                self.driver.find_element_by_id("dbInstanceName").send_keys(instanceName)
+                    fields["osUserPassword"] = osuserpassword
+                self.FillForm(fields)
                 self.Wait_for_Completion()
                 '''Submitting the form'''
                 self.driver.find_element_by_xpath("//button[@type='submit']").click()
                 '''checking if any error message after filling the form.'''
                 self.Wait_for_Completion()
                 self.Wait_for_Completion()
-                if self.Check_If_Entity_Exists("xpath", "//span[@class='error']"):
-                    warn = self.driver.find_element_by_xpath("//span[@class='error']").text
+                error = self.ProbeEntity("xpath", "//span[@class='error']")
+                if error is not None:
+                    warn = error.text
                     log.info(str(warn))
                     '''Closing the input form'''
                     self.driver.find_element_by_xpath("//button[@type='button']").click()
@@ -208,28 +528,17 @@ class Oracle(iDA):
                 self.driver.find_element_by_xpath("//div[1]/div[2]/div[2]/div/div[2]/div/div[3]/div/a[@class = 'uib-dropdown-toggle dropdown-toggle']").click()
                 self.driver.find_element_by_link_text("Add instance").click()
                 self.Wait_for_Completion()
-                self.driver.find_element_by_id("instanceName").clear()
-                self.driver.find_element_by_id("instanceName").send_keys(Instance)
-
-                self.driver.find_element_by_id("oracleHome").clear()
-                self.driver.find_element_by_id("oracleHome").send_keys(oracleHome)
-
-                self.driver.find_element_by_id("osUserName").clear()
-                self.driver.find_element_by_id("osUserName").send_keys(osusername)
-
+                fields = {
+                    "instanceName": Instance,
+                    "oracleHome": oracleHome,
+                    "osUserName": osusername,
+                    "dbUserName": dbusername,
+                    "dbPassword": dbpassword,
+                    "dbInstanceName": instanceName}
                 log.info(os)
                 if os != 'Linux':
-                    self.driver.find_element_by_id("osUserPassword").clear()
-                    self.driver.find_element_by_id("osUserPassword").send_keys(osuserpassword)
-
-                self.driver.find_element_by_id("dbUserName").clear()
-                self.driver.find_element_by_id("dbUserName").send_keys(dbusername)
-
-                self.driver.find_element_by_id("dbPassword").clear()
-                self.driver.find_element_by_id("dbPassword").send_keys(dbpassword)
-
-                self.driver.find_element_by_id("dbInstanceName").clear()
-                self.driver.find_element_by_id("dbInstanceName").send_keys(instanceName)
+                    fields["osUserPassword"] = osuserpassword
+                self.FillForm(fields)
 
                 '''
                 # No Storage Policy used for this form.
@@ -246,8 +555,9 @@ class Oracle(iDA):
                 self.driver.find_element_by_xpath("//button[@type='submit']").click()
                 self.Wait_for_Completion()
                 '''Checking for Warnings when saving instance.'''
-                if self.Check_If_Entity_Exists("xpath", "//span[@class='error']"):
-                    warn = self.driver.find_element_by_xpath("//span[@class='error']").text
+                error = self.ProbeEntity("xpath", "//span[@class='error']")
+                if error is not None:
+                    warn = error.text
                     log.info(str(warn))
                     '''Closing the input form'''
                     self.driver.find_element_by_xpath("//button[@type='button']").click()
@@ -299,26 +609,12 @@ class Oracle(iDA):
                 self.driver.find_element_by_link_text('Add subclient').click()
                 self.Wait_for_Completion()
                 log.info('Fills the subclient form')
-                self.driver.find_element_by_xpath("//input[@name = 'subclientName']").clear()
-                self.driver.find_element_by_xpath("//input[@name = 'subclientName']").send_keys(subclientName)
                 # /html/body/div[1]/div/div/div[2]/form/div/label[2]/span[2]/isteven-multi-select/span/button
                 self.driver.find_element_by_xpath("//div[1]/div/div/div[2]/form/div/label[2]/span[2]/isteven-multi-select/span/button[@type='button' and @class='ng-binding']").click()
-                parent = self.driver.find_elements_by_xpath("//div[@class='checkBoxContainer']/div")
-                for i in parent:
-                    t = i.find_element_by_xpath("./div/label/span").text
-                    t = t.strip()
-                    t = t.replace(" ","")
-                    #log.info("Found plan:"+t)
-                    #log.info(storagePolicy)
-                    if t.find(storagePolicy)>=0:
-                        log.info("it matched")
-                        i.find_element_by_xpath("./div/label/input/following-sibling::span").click()
-                        break
-                    else:
-                        continue
+                self.PickChecked(storagePolicy, "subclientPlan")
                 self.Wait_for_Completion()
-                self.driver.find_element_by_id('numberBackupStreams').clear()
-                self.driver.find_element_by_id('numberBackupStreams').send_keys(dataStreams)
+                self.FillForm({"subclientName": subclientName,
+                               "numberBackupStreams": dataStreams})
                 if dataBackup == "False":
                     log.info("Databackup is not required, so unchecking it")
                     self.driver.find_element_by_xpath("//div[1]/div/div/div[2]/form/div/label[4]/span[1]/label[@for = 'dataBackup']").click()
@@ -336,8 +632,9 @@ class Oracle(iDA):
                         self.driver.find_element_by_xpath("//div[1]/div/div/div[2]/form/div/label[6]/span[1]/label[@for = 'deleteArchiveLogs']").click()
                 self.driver.find_element_by_xpath("//form/div/div[3]/button[2][@type = 'submit' and @class='btn btn-primary cvBusyOnAjax']").click()
                 self.Wait_for_Completion()
-                if self.Check_If_Entity_Exists("xpath", "//span[@class='error']"):
-                    warn = self.driver.find_element_by_xpath("//span[@class='error']").text
+                error = self.ProbeEntity("xpath", "//span[@class='error']")
+                if error is not None:
+                    warn = error.text
                     log.info(str(warn))
                     '''Closing the input form'''
                     self.driver.find_element_by_xpath("//button[@type='button']").click()
@@ -357,10 +654,13 @@ class Oracle(iDA):
             fn = sys._getframe().f_code.co_name
             return False, fn, str(e)
 
-    def OracleRestore(self,instance, PITime, SCNvalue, Files, destinationHost, database = True, controlFile = False, PIT = False, SCN = False, currtime = False):
+    def OracleRestore(self,instance, PITime, SCNvalue, Files, destinationHost, database = True, controlFile = False, PIT = False, SCN = False, currtime = False, browseMode = "auto"):
         """Restores the content of the instance
             instance    : a string, name of the instance to be restored
             Files       : a list, the list of tables to restore, if "All" is given then all the tablespaces are selected for restore
+            browseMode  : a string, how to find the Files in the browse grid, see SelectBrowseItems()
+            The names in Files that were not found in the browse grid are kept in
+            self.RestoreUnmatched and reported through NotifyBuildBreak.
             Return (True, 1) on successfull completion
                     (False, func_name, error_msg) otherwise
         """
@@ -371,57 +671,22 @@ class Oracle(iDA):
             if self.Check_If_Entity_Exists("xpath", "//a[text()='" + instance + "']/../../div[2]/span/a[text()='Restore']"):
                 self.driver.find_element_by_xpath("//a[text()='" + instance + "']/../../div[2]/span/a[text()='Restore']").click()
                 self.Wait_for_Completion()
+                self.RestoreUnmatched = []
                 if Files != "All":
                     if self.driver.find_element_by_xpath("//div[@class='ui-grid-contents-wrapper']/div[1]/div/div[1]//div[@class='ng-scope']/div/div").is_selected():
                         self.driver.find_element_by_xpath("//div[@class='ui-grid-contents-wrapper']/div[1]/div/div[1]//div[@class='ng-scope']/div/div").click()
-                    Selected = []
-                    while(True):
-                        elements = self.driver.find_elements_by_xpath("//div[1]/div[2]/div[2]/div[@class='ui-grid-canvas']/div")
-                        i = 1
-                        flag = []
-                        for elem in elements:
-                            f = elem.find_element_by_xpath("./div/div[1]").text
-                            for File in Files:
-                                if f == File:
-                                    flag.append(i)
-                                    Selected.append(f)
-                                else:
-                                    continue
-                            i = i + 1
-                        for flg in flag:
-                            flg = str(flg)
-                            self.driver.find_element_by_xpath("//div[1]/div/div[2]/div[@class='ui-grid-canvas']/div[" + flg + "]/div/div/div/div/div").click()
-                            Files = list(set(Files) - set(Selected))
-                        if self.CVTable_NextButtonExists():
-                            if self.driver.find_element_by_xpath(
-                                    "//button[@ng-disabled='cantPageForward()']").is_enabled():
-                                self.CVTable_ClickNextButton()
-                                continue
-                            else:
-                                if Files != []:
-                                    e = "Could not find the item " + str(Files)
-                                    log.error(e)
-                                    self.NotifyBuildBreak(
-                                        self.__class__.__name__, sys._getframe().f_code.co_name, e)
-                                    break
-                                else:
-                                    break
-                        else:
-                            if Files != []:
-                                e = "Could not find the items " + str(Files)
-                                log.error(e)
-                                self.NotifyBuildBreak(
-                                    self.__class__.__name__, sys._getframe().f_code.co_name, e)
-                                break
-                            else:
-                                break
+                    Selected, self.RestoreUnmatched = self.SelectBrowseItems(Files, browseMode)
+                    log.info("Selected items: " + str(Selected))
+                    if self.RestoreUnmatched:
+                        e = "Could not find the items " + str(self.RestoreUnmatched)
+                        log.error(e)
+                        self.NotifyBuildBreak(
+                            self.__class__.__name__, sys._getframe().f_code.co_name, e)
                 self.driver.find_element_by_xpath("//div[@id='browseActions']/a[contains(text(),'Restore')]").click()
                 self.Wait_for_Completion()
-                Select(self.driver.find_element_by_id("destinationServer")
-                       ).select_by_visible_text(destinationHost)
+                self.PickOption("destinationServer", destinationHost, "restoreDestination")
                 self.Wait_for_Completion()
-                Select(self.driver.find_element_by_id("destinationInstance")
-                       ).select_by_visible_text(instance)
+                self.PickOption("destinationInstance", instance, "restoreDestination/%s" % destinationHost)
                 self.Wait_for_Completion()
                 self.Wait_for_Completion()
                 if not database:
@@ -437,8 +702,7 @@ class Oracle(iDA):
                 if PIT:
                     log.info("Restoring with Point in Time")
                     self.driver.find_element_by_xpath("//input[@id='pitDate1']/following-sibling::label").click()
-                    self.driver.find_element_by_id("dateTimeValue").clear()
-                    self.driver.find_element_by_id("dateTimeValue").send_keys(PITime)
+                    self.SetPointInTime("dateTimeValue", PITime)
                 if SCN:
                     log.info("Restoring with SCN")
                     self.driver.find_element_by_xpath("//input[@id='scn']/following-sibling::label").click()
@@ -464,6 +728,8 @@ class Oracle(iDA):
                     #jobID = jtext.split(": ")[1].split("\n")[0]
                     jobID = re.findall('\d+', jtext.encode('utf-8'))
                     log.info("Restore job " + str(jobID) + " has started")
+                    for jid in jobID:
+                        self.TrackJob(jid)
                     return True, jobID
             else:
                 e = "there is no option to restore the instance"
@@ -474,6 +740,27 @@ class Oracle(iDA):
             log.exception(str(e))
             fn = sys._getframe().f_code.co_name
             return False, fn, str(e)
+
+    def SelectBrowseItems(self, Files, mode="auto"):
+        """Selects the given items in the restore browse grid.
+            Files   : a list, the names of the tablespaces or datafiles to select
+            mode    : a string, "auto", "filter", "pagesize" or "paging"
+            Each page is matched and ticked in one script call. The grid filter box
+            and the largest page size are used before falling back to paging, and
+            paging stops as soon as every requested item has been found.
+            Returns (selected, unmatched), two sorted lists of names
+        """
+        def NextPage():
+            if not self.CVTable_NextButtonExists():
+                return False
+            if not self.driver.find_element_by_xpath(
+                    "//button[@ng-disabled='cantPageForward()']").is_enabled():
+                return False
+            self.CVTable_ClickNextButton()
+            return True
+        remaining = UiGrid.BrowseSelect(self.driver, Files, self.Wait_for_Completion, NextPage, mode)
+        return sorted(set(Files) - remaining), sorted(remaining)
+
     def ActionClone(self,Reqinstance,FmT,ToT,jid,instance,orahomepath,pFile,sPath,resDays,resHrs,copyPrec,cmdFPath,PIT=False,ORR=False ):
         """Clones the instance with the given name
             instance    : a string, name of the instance to be cloned
@@ -496,8 +783,7 @@ class Oracle(iDA):
                     #SP10 from time removed
                     #self.driver.find_element_by_id("fromTime").clear()
                     #self.driver.find_element_by_id("fromTime").send_keys(FmT)
-                    self.driver.find_element_by_id("toTime").clear()
-                    self.driver.find_element_by_id("toTime").send_keys(ToT)
+                    self.SetPointInTime("toTime", ToT)
                     self.Wait_for_Completion()
                     self.driver.find_element_by_xpath("//button[contains(text(),'Next')]").click()
                     '''
@@ -621,10 +907,10 @@ class Oracle(iDA):
                 log.info('Server Configuration Details:')
                 #self.driver.find_element_by_id('cloudType').click()
                 #self.driver.find_element_by_link_text(cloudType).click()
-                Select(self.driver.find_element_by_id('cloudType')).select_by_visible_text(cloudType)
+                self.PickOption('cloudType', cloudType, "cloudMigration")
                 #self.driver.find_element_by_id('AllocPolicyId').click()
                 #self.driver.find_element_by_link_text(AllocPolicyId).click()
-                Select(self.driver.find_element_by_id('AllocPolicyId')).select_by_visible_text(AllocPolicyId)
+                self.PickOption('AllocPolicyId', AllocPolicyId, "cloudMigration/%s" % cloudType)
                 #to create new VM
                 self.driver.find_element_by_id('oraHomeText').click()
                 self.driver.find_element_by_id('oraHomeText').send_keys(oraHomeText)
@@ -645,19 +931,7 @@ class Oracle(iDA):
                 if not Network == 'none':
                     self.driver.find_element_by_xpath("//span[@class = 'multiSelect inlineBlock buttonClicked']/button[@type = 'button']").click()
                     #self.driver.find_element_by_xpath("//span/div/div[1]/div[2]/div[1]/input[@placeholder = 'Search']").click()
-                    parent = self.driver.find_elements_by_xpath("//div[@class='checkBoxContainer']/div")
-                    for i in parent:
-                        t = i.find_element_by_xpath("./div/label/span").text
-                        t = t.strip()
-                        t = t.replace(" ","")
-                        log.info("Found Network:"+t)
-                        log.info(Network)
-                        if t.find(Network)>=0:
-                            log.info("it matched")
-                            i.find_element_by_xpath("./div/label/input/following-sibling::span").click()
-                            break
-                        else:
-                            continue
+                    self.PickChecked(Network, "cloudNetwork")
                     self.Wait_for_Completion()
                 if addVolume:
                     self.driver.find_element_by_xpath("//button[contains(text(),'Add storage')]").click()
@@ -801,10 +1075,8 @@ class Oracle(iDA):
         try:
             log.info("Cloning an oracle instance")
 
-            Select(self.driver.find_element_by_name(
-                "destClient")).select_by_visible_text(client)
-            Select(self.driver.find_element_by_name(
-                "orclInstance")).select_by_visible_text(instance)
+            self.PickOption("destClient", client, "cloneDestination")
+            self.PickOption("orclInstance", instance, "cloneDestination/%s" % client)
             self.driver.find_element_by_id("oraHome").clear()
             self.driver.find_element_by_id("oraHome").send_keys(oraHome)
             self.driver.find_element_by_id("userName").clear()
@@ -821,6 +1093,17 @@ class Oracle(iDA):
 
             if PIT:
                 self.driver.find_element_by_id("pitDate1").click()
+                try:
+                    self.SetPointInTime(DateTimeInput.PIT_PICKER,
+                                        DateTimeInput.FromParts(year, month, date, hours, mins, session))
+                    ok = self.ProbeEntity("xpath", "//div[3]/button[contains(text(),'OK')]")
+                    if ok is not None:
+                        ok.click()
+                    self.Wait_for_Completion()
+                    PIT = False
+                except (TypeError, ValueError, WebDriverException) as e:
+                    log.info("Setting the point in time through the calendar: " + str(e))
+            if PIT:
                 y = str(datetime.datetime.now()).rsplit("-", 2)[0]
                 self.driver.find_element_by_xpath(
                     "//div[2]/div/table/thead/tr[1]/th[2]/button/strong[contains(text(),'" + y + "')]").click()
@@ -919,7 +1202,7 @@ class Oracle(iDA):
 
     def ActionRestoreHistoryOracleAgent(self):
         """Opens the Restore history of the Oracle agent for the given client.
-            Returns (True,1), if successful
+            Returns (True, [JobRecord, ...]), if the history lists jobs
                     (False, func_name, error_msg), otherwise
         """
         log = loghelper.getLog()
@@ -932,18 +1215,7 @@ class Oracle(iDA):
                 self.driver.find_element_by_xpath("//span[@class = 'dropdownArrow right']").click()
                 self.driver.find_element_by_link_text('All Jobs').click()
                 self.Wait_for_Completion()
-                jids= self.driver.find_elements_by_class_name("ui-grid-render-container")
-                JobID = []
-                for i in jids:
-                    m = re.findall("\d+",i.text.encode('utf-8'))
-                    for j in m:
-                        if int(j)>100:
-                            JobID.append(j)
-                            log.info(str(j))
-                if JobID == []:
-                    return False
-                else:
-                    return True
+                return self.CheckJobHistory("Oracle restore history")
             else:
                 e = "There is no option to view the Restore history for Oracle agent under action menu"
                 log.error(e)
@@ -955,7 +1227,7 @@ class Oracle(iDA):
             return False, fn, str(e)
     def JobsOA(self):
         """Opens the Jobs of the Oracle agent for the given client.
-            Returns (True,1), if successful
+            Returns (True, [JobRecord, ...]), if the history lists jobs
                     (False, func_name, error_msg), otherwise
         """
         log = loghelper.getLog()
@@ -967,18 +1239,7 @@ class Oracle(iDA):
                 self.driver.find_element_by_xpath("//span[@class = 'dropdownArrow right']").click()
                 self.driver.find_element_by_link_text('All Jobs').click()
                 self.Wait_for_Completion()
-                jids= self.driver.find_elements_by_class_name("ui-grid-render-container")
-                JobID = []
-                for i in jids:
-                    m = re.findall("\d+",i.text.encode('utf-8'))
-                    for j in m:
-                        if int(j)>100:
-                            JobID.append(j)
-                            log.info(str(j))
-                if JobID == []:
-                    return False
-                else:
-                    return True
+                return self.CheckJobHistory("Oracle jobs")
             else:
                 e = "There is no option to view Jobs for Oracle agent under action menu"
                 log.error(e)
@@ -990,7 +1251,7 @@ class Oracle(iDA):
             return False, fn, str(e)
     def BackuphistoryOracleAgent(self):
         """Opens the backup history for Oracle Agent
-            Returns (True,1), if successful
+            Returns (True, [JobRecord, ...]), if the history lists jobs
                     (False, func_name, error_msg), otherwise
         """
         log = loghelper.getLog()
@@ -1003,18 +1264,7 @@ class Oracle(iDA):
                 self.driver.find_element_by_xpath("//span[@class = 'dropdownArrow right']").click()
                 self.driver.find_element_by_link_text('All Jobs').click()
                 self.Wait_for_Completion()
-                jids= self.driver.find_elements_by_class_name("ui-grid-render-container")
-                JobID = []
-                for i in jids:
-                    m = re.findall("\d+",i.text.encode('utf-8'))
-                    for j in m:
-                        if int(j)>100:
-                            JobID.append(j)
-                            log.info(str(j))
-                if JobID == []:
-                    return False
-                else:
-                    return True
+                return self.CheckJobHistory("Oracle backup history")
             else:
                 e = "There is no option to view the backup history of the subclient from the action menu"
                 log.error(e)
@@ -1026,7 +1276,7 @@ class Oracle(iDA):
             return False, fn, str(e)
     def RestoreHistoryOracleAgent(self):
         """Opens the Restore history of the Oracle agent for the given client.
-            Returns (True,1), if successful
+            Returns (True, [JobRecord, ...]), if the history lists jobs
                     (False, func_name, error_msg), otherwise
         """
         log = loghelper.getLog()
@@ -1038,18 +1288,7 @@ class Oracle(iDA):
                 self.driver.find_element_by_xpath("//span[@class = 'dropdownArrow right']").click()
                 self.driver.find_element_by_link_text('All Jobs').click()
                 self.Wait_for_Completion()
-                jids= self.driver.find_elements_by_class_name("ui-grid-render-container")
-                JobID = []
-                for i in jids:
-                    m = re.findall("\d+",i.text.encode('utf-8'))
-                    for j in m:
-                        if int(j)>100:
-                            JobID.append(j)
-                            log.info(str(j))
-                if JobID == []:
-                    return False
-                else:
-                    return True
+                return self.CheckJobHistory("Oracle restore history")
             else:
                 e = "There is no option to view the Restore history for Oracle agent under action menu"
                 log.error(e)
@@ -1063,39 +1302,23 @@ class Oracle(iDA):
     def ContinuousBuild(self):
         """Run Continuous Build of the page to traverse all the links on this page."""
         ParsedPage.append(self.__class__.__name__)
-        self.ExceptionHandling(self.__class__.__name__,
-                               *(self.BackupHistory()))
-        self.driver.back()
-        self.Wait_for_Completion()
-        self.ExceptionHandling(self.__class__.__name__,
-                               *(self.RestoreHistory()))
-        self.driver.back()
-        self.Wait_for_Completion()
-        self.ExceptionHandling(self.__class__.__name__,
-                               *(self.AddBackupSet("hello")))
+        plan = CrawlPlanner(self)
+        plan.Step(self.BackupHistory, back=True)
+        plan.Step(self.RestoreHistory, back=True)
+        plan.Step(self.AddBackupSet, "hello")
 
-        self.ExceptionHandling(self.__class__.__name__,
-                               *(self.iDADataManagement()))
-        self.ExceptionHandling(self.__class__.__name__,
-                               *(self.iDADataRecovery()))
-        self.ExceptionHandling(self.__class__.__name__,
-                               *(self.iDADataManagement()))
-        self.ExceptionHandling(self.__class__.__name__,
-                               *(self.iDADataRecovery()))
+        plan.Step(self.iDADataManagement, idempotent=True)
+        plan.Step(self.iDADataRecovery, idempotent=True)
+        plan.Step(self.iDADataManagement, idempotent=True)
+        plan.Step(self.iDADataRecovery, idempotent=True)
 
-        self.ExceptionHandling(self.__class__.__name__,
-                               *(self.ActionAddSubclient("sub1",
-                                                         "newbkpset",
-                                                         "MegaMind_SP_Dedup",
-                                                         ["websymbols"])))
-        self.ExceptionHandling(self.__class__.__name__,
-                               *(self.ActionBackupHistory("defaultBackupSet")))
-        self.driver.back()
-        self.Wait_for_Completion()
-        self.ExceptionHandling(self.__class__.__name__,
-                               *(self.ActionRestoreHistory("defaultBackupSet")))
-        self.driver.back()
-        self.Wait_for_Completion()
+        plan.Step(self.ActionAddSubclient, "sub1",
+                  "newbkpset",
+                  "MegaMind_SP_Dedup",
+                  ["websymbols"])
+        plan.Step(self.ActionBackupHistory, "defaultBackupSet", back=True)
+        plan.Step(self.ActionRestoreHistory, "defaultBackupSet", back=True)
+        self.CrawlReport = plan.Run()
         # self.ExceptionHandling(self.__class__.__name__,*(self.AddSecurityAssociations(UserConstants['userroles'])))
 
     def NextPage(self):
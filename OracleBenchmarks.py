@@ -0,0 +1,432 @@
+#!/usr/bin/env python
+"""
+This module provides the benchmarks for the Oracle page object helpers, run
+against the local fixtures in OracleFixtures under headless Chrome.
+The methods benchmark runs the Oracle page-object methods against the local
+AdminConsole stand-in seeded with 10, 100 and 1000 rows, records the wall time,
+WebDriver command count and browser CPU time of each, and compares them with a
+JSON baseline. The run exits with status 1 when a method regressed past the
+threshold or failed.
+Usage:
+    python -m OraclePages.OracleBenchmarks <benchmark> [<benchmark> ...]
+The login benchmark needs an AdminConsole to log in to:
+    ORACLE_BENCH_URL        the AdminConsole url
+    ORACLE_BENCH_PAGE       the Oracle iDA page url
+    ORACLE_BENCH_LOGIN      "module:function" of a login(driver) callable
+The methods benchmark reads:
+    ORACLE_BENCH_BASELINE   the JSON baseline file, oracle-methods.json by default
+    ORACLE_BENCH_THRESHOLD  the allowed increase over the baseline, 0.25 (25%) by default
+    ORACLE_BENCH_UPDATE     "1" to write the results as the new baseline
+Functions:
+Chrome()                    -- Starts a headless Chrome for the benchmarks
+Timed()                     -- Runs a callable a number of times and returns the mean seconds per run
+Report()                    -- Prints a benchmark result as aligned label/value rows
+BenchWait()                 -- Compares AjaxWait with the AdminConsoleBase wait on a busy page
+BenchGrid()                 -- Compares the row by row grid loop with UiGrid.ReadGrid
+BenchBrowse()               -- Compares paging, page size and filter lookups in a large restore browse grid
+BenchLoginCache()           -- Compares time-to-first-action of a new browser with and without a saved session
+BenchSubclients()           -- Compares the subclients per minute of an AddSubclient loop and AddSubclients
+BenchRest()                 -- Compares sequential and concurrent REST setup and teardown against the stand-in
+BrowserCpu()                -- Returns the seconds the browser main thread spent running tasks
+Measure()                   -- Returns the mean wall time, command count and browser CPU of a page-object call
+MethodCases()               -- Returns the page-object method calls benchmarked against a stand-in
+Regressions()               -- Returns the results exceeding their baseline by more than the threshold
+BenchMethods()              -- Times the Oracle page-object methods against the stand-in at several data sizes
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+from selenium import webdriver
+
+from OraclePages import OracleFixtures
+from OraclePages.AjaxWait import AjaxWait
+from OraclePages import UiGrid
+from OraclePages.SpecLoader import LoadCallable
+from OraclePages.SessionStore import SessionStore
+from OraclePages.OracleRest import OracleRest
+from OraclePages.OracleStandIn import MockRestServer, AdminConsoleStandIn, ORACLE_HOME
+from OraclePages.DriverHooks import AddCommandListener, RemoveCommandListener
+from OraclePages.NavigationCache import NavigationCache
+
+
+def Chrome():
+    """Starts a headless Chrome for the benchmarks"""
+    options = webdriver.ChromeOptions()
+    options.add_argument('--headless')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--allow-file-access-from-files')
+    return webdriver.Chrome(options=options)
+
+
+def Timed(func, runs=5):
+    """Runs a callable a number of times and returns the mean seconds per run"""
+    start = time.time()
+    for _ in range(runs):
+        func()
+    return (time.time() - start) / runs
+
+
+def Report(name, rows):
+    """Prints a benchmark result as aligned label/value rows"""
+    print('%s' % name)
+    for label, value in rows:
+        print('    %-40s %s' % (label, value))
+
+
+def BenchWait(driver, latency=300, runs=5):
+    """Compares AjaxWait with the AdminConsoleBase wait on a busy page.
+    Each run clicks the submit button and waits twice, the way AddInstance does."""
+    from Helper.AdminConsoleBase import AdminConsoleBase
+    legacy = AdminConsoleBase.__new__(AdminConsoleBase)
+    legacy.driver = driver
+    engine = AjaxWait(driver)
+    driver.get(OracleFixtures.WriteFixture(OracleFixtures.AjaxPage(latency), 'ajax'))
+
+    def Legacy():
+        driver.find_element_by_id('submit').click()
+        AdminConsoleBase.Wait_for_Completion(legacy)
+        AdminConsoleBase.Wait_for_Completion(legacy)
+
+    def Engine():
+        driver.find_element_by_id('submit').click()
+        engine.Wait()
+        engine.Wait()
+
+    legacyTime = Timed(Legacy, runs)
+    engineTime = Timed(Engine, runs)
+    Report('Wait_for_Completion, %d ms of Ajax activity' % latency, [
+        ('AdminConsoleBase.Wait_for_Completion x2', '%.3f s' % legacyTime),
+        ('AjaxWait.Wait x2', '%.3f s' % engineTime),
+        ('merged waits', engine.merged),
+        ('speedup', '%.1fx' % (legacyTime / engineTime)),
+    ])
+
+
+def BenchGrid(driver, rows=500, runs=3):
+    """Compares the row by row grid loop of getServInstances with UiGrid.ReadGrid"""
+    driver.get(OracleFixtures.WriteFixture(OracleFixtures.GridPage(rows), 'grid'))
+
+    def Loop():
+        names = []
+        for row in driver.find_elements_by_xpath("//div[2]/div[@class='ui-grid-canvas']/div"):
+            names.append(row.find_element_by_xpath("./div/div[1]/a").text.strip())
+        assert len(names) == rows
+
+    def Script():
+        assert len(UiGrid.ReadGrid(driver)) == rows
+
+    loopTime = Timed(Loop, runs)
+    scriptTime = Timed(Script, runs)
+    Report('ui-grid extraction, %d rows' % rows, [
+        ('row by row find_element_by_xpath', '%.3f s' % loopTime),
+        ('UiGrid.ReadGrid', '%.3f s' % scriptTime),
+        ('speedup', '%.1fx' % (loopTime / scriptTime)),
+    ])
+
+
+def BenchBrowse(driver, entries=5000, runs=1):
+    """Compares paging, page size and filter lookups in a large restore browse grid"""
+    wanted = ['TBS_%05d' % i for i in (7, entries // 3, entries // 2, entries - 2)]
+    engine = AjaxWait(driver)
+
+    def NextPage():
+        button = driver.find_element_by_xpath("//button[@ng-disabled='cantPageForward()']")
+        if not button.is_enabled():
+            return False
+        button.click()
+        return True
+
+    rows = []
+    for mode in ("paging", "pagesize", "filter"):
+        def Run():
+            driver.get(OracleFixtures.WriteFixture(OracleFixtures.BrowsePage(entries), 'browse'))
+            missing = UiGrid.BrowseSelect(driver, wanted, engine.Wait, NextPage, mode)
+            assert not missing and sorted(driver.execute_script('return browseSelected()')) == wanted
+        rows.append((mode, '%.3f s' % Timed(Run, runs)))
+    Report('restore browse selection of %d items in %d entries' % (len(wanted), entries), rows)
+
+
+def BenchLoginCache(driver, runs=3):
+    """Compares time-to-first-action of a new browser with and without a saved session.
+    Each run starts its own browser, the way a new worker process does."""
+    if 'ORACLE_BENCH_LOGIN' not in os.environ:
+        print('login benchmark skipped, ORACLE_BENCH_URL/PAGE/LOGIN are not set')
+        return
+    login = LoadCallable(os.environ['ORACLE_BENCH_LOGIN'])
+    page = os.environ['ORACLE_BENCH_PAGE']
+    store = SessionStore(os.path.join(tempfile.mkdtemp(), 'session.json'), os.environ['ORACLE_BENCH_URL'])
+
+    def FirstAction(open):
+        worker = Chrome()
+        try:
+            open(worker)
+            worker.find_elements_by_tag_name('a')
+        finally:
+            worker.quit()
+
+    def Login(worker):
+        login(worker)
+        worker.get(page)
+
+    FirstAction(lambda worker: store.Open(worker, page, login))
+    loginTime = Timed(lambda: FirstAction(Login), runs)
+    storeTime = Timed(lambda: FirstAction(lambda worker: store.Open(worker, page, login)), runs)
+    Report('time to first action in a new browser', [
+        ('full LoginPage flow', '%.3f s' % loginTime),
+        ('saved session', '%.3f s' % storeTime),
+        ('speedup', '%.1fx' % (loginTime / storeTime)),
+    ])
+
+
+def BenchSubclients(driver, count=20, plans=50):
+    """Compares the subclients per minute of an AddSubclient loop with one AddSubclients call,
+    both confirming the subclients from one reload of the subclient grid at the end"""
+    from OraclePages.OracleInstance import OracleInstance
+    page = OracleInstance.__new__(OracleInstance)
+    page.driver = driver
+    url = OracleFixtures.WriteFixture(OracleFixtures.SubclientPage(plans), 'subclients')
+    target = 'Plan %03d' % (plans - 1)
+
+    def Specs(prefix):
+        return [{'subclientName': '%s%03d' % (prefix, i), 'storagePolicy': target.replace(' ', ''),
+                 'dataStreams': 2, 'dataBackup': 'True', 'dataBackupType': 'onlineData',
+                 'ArchiveLog': 'True', 'DeleteArchiveLog': 'True'} for i in range(count)]
+
+    def Start():
+        driver.get(url)
+        driver.execute_script('sessionStorage.clear()')
+        driver.get(url)
+        page.Wait_for_Completion()
+        OracleInstance.Options.Invalidate()
+
+    def Loop():
+        specs = Specs('loop')
+        for spec in specs:
+            assert page.AddSubclient(**spec)[0]
+        driver.get(url)
+        page.Wait_for_Completion()
+        listed = set(UiGrid.ReadColumn(driver, ('Name', 'Subclient')))
+        assert all(spec['subclientName'] in listed for spec in specs)
+
+    def Bulk():
+        assert all(result[0] for result in page.AddSubclients(Specs('bulk')))
+
+    rows = []
+    for name, run in (('AddSubclient loop', Loop), ('AddSubclients', Bulk)):
+        Start()
+        rows.append((name, '%.1f subclients/min' % (count * 60 / Timed(run, 1))))
+    Report('subclient creation, %d subclients, %d plans' % (count, plans), rows)
+
+
+def BenchRest(driver=None, instances=20, subclients=3, latency=0.05):
+    """Compares sequential and concurrent REST setup and teardown against the stand-in,
+    which answers every request after the given latency in seconds"""
+    server = MockRestServer(latency)
+    url = server.Start()
+    specs = {
+        'servers': [{'serverName': 'dbserver', 'hostName': 'dbserver', 'userName': 'oracle',
+                     'password': 'password', 'plan': 'Server plan'}],
+        'instances': [{'clientName': 'dbserver', 'instanceName': 'ORCL%03d' % i, 'oracleHome': '/u01/app/oracle',
+                       'osUserName': 'oracle', 'dbUserName': 'sys', 'dbPassword': 'password'}
+                      for i in range(instances)],
+        'subclients': [{'clientName': 'dbserver', 'instanceName': 'ORCL%03d' % i, 'subclientName': 'sub%d' % n,
+                        'storagePolicy': 'Server plan'} for i in range(instances) for n in range(subclients)],
+    }
+    rows = []
+    try:
+        for workers in (1, 8):
+            rest = OracleRest(url, workers=workers)
+            rest.Login('admin', 'password')
+            setup = Timed(lambda: rest.Provision(**specs), 1)
+            teardown = Timed(rest.Teardown, 1)
+            rest.Close()
+            rows.append(('%d worker(s) setup / teardown' % workers, '%.3f s / %.3f s' % (setup, teardown)))
+    finally:
+        server.Stop()
+    Report('REST setup of %d instances with %d subclients each, %d ms per request'
+           % (instances, subclients, latency * 1000), rows)
+
+
+def BrowserCpu(driver):
+    """Returns the seconds the browser main thread spent running tasks for the page,
+    None when the driver does not speak the Chrome DevTools protocol"""
+    try:
+        metrics = driver.execute_cdp_cmd('Performance.getMetrics', {})['metrics']
+    except Exception:
+        return None
+    for metric in metrics:
+        if metric['name'] == 'TaskDuration':
+            return metric['value']
+    return None
+
+
+def Measure(driver, prepare, call, runs=3):
+    """Returns the mean wall time, command count and browser CPU of a page-object call
+        prepare : a callable, run untimed before every run, e.g. to load the start page
+        call    : a callable taking the run number, the page-object call to measure
+        Returns a dict, "seconds", "commands", "cpu" (None if unknown) and "failed",
+                the number of runs the call did not return success
+    """
+    counted = [0, False]
+
+    def Count(command, params, response, error, elapsed):
+        if counted[1]:
+            counted[0] += 1
+
+    AddCommandListener(driver, Count)
+    seconds, cpu, failed = 0.0, 0.0, 0
+    try:
+        for run in range(runs):
+            prepare()
+            before = BrowserCpu(driver)
+            counted[1] = True
+            start = time.time()
+            result = call(run)
+            seconds += time.time() - start
+            counted[1] = False
+            after = BrowserCpu(driver)
+            cpu = None if before is None or after is None or cpu is None else cpu + after - before
+            if result is False or (isinstance(result, tuple) and not result[0]):
+                failed += 1
+    finally:
+        RemoveCommandListener(driver, Count)
+    return {'seconds': seconds / runs, 'commands': counted[0] / float(runs),
+            'cpu': None if cpu is None else cpu / runs, 'failed': failed}
+
+
+def MethodCases(size):
+    """Returns the page-object method calls benchmarked against a stand-in seeded with size rows,
+    as (name, page class, start page, start page query, call taking the page and the run number).
+    CloneDB() and ActionOracleRestoreHistory() are left out, they fail on their own locators."""
+    from OraclePages.Oracle import Oracle
+    from OraclePages.OracleInstance import OracleInstance
+    last = 'inst%04d' % (size - 1)
+    unique = lambda prefix, run: '%s%d_%d' % (prefix, size, run)
+    return [
+        ('OpenInstance', Oracle, 'oracle', {}, lambda page, run: page.OpenInstance(last)),
+        ('AddInstance', Oracle, 'oracle', {}, lambda page, run: page.AddInstance(
+            unique('add', run), ORACLE_HOME, 'oracle', '', 'sys', 'password', unique('add', run), None, None, 'Linux')),
+        ('ActionAddSubclient', Oracle, 'oracle', {}, lambda page, run: page.ActionAddSubclient(
+            last, unique('sub', run), 'Plan000', 2, 'True', 'onlineData', 'True', 'True')),
+        ('ActionBackup', OracleInstance, 'oracle/instance', {'name': last},
+         lambda page, run: page.ActionBackup('default', 'FULL', 'False')),
+        ('OracleRestore', Oracle, 'oracle', {}, lambda page, run: page.OracleRestore(
+            last, None, None, ['TBS_%05d' % (size - 1)], 'dbserver')),
+        ('ActionClone', Oracle, 'oracle', {}, lambda page, run: page.ActionClone(
+            last, None, None, None, unique('clone', run), ORACLE_HOME, '', '', '1', '0', '1', '')),
+        ('ActionCloudMigration', Oracle, 'oracle', {}, lambda page, run: page.ActionCloudMigration(
+            last, 'Amazon', 'Amazon policy 1', ORACLE_HOME, None, None, 'none', None, None, None, None, None,
+            ORACLE_HOME, None, 'onlineData', 'mostRecentBackup', '2', '1', '8403', None)),
+        ('JobsOA', Oracle, 'oracle', {}, lambda page, run: page.JobsOA()),
+        ('BackuphistoryOracleAgent', Oracle, 'oracle', {}, lambda page, run: page.BackuphistoryOracleAgent()),
+        ('RestoreHistoryOracleAgent', Oracle, 'oracle', {}, lambda page, run: page.RestoreHistoryOracleAgent()),
+        ('ActionRestoreHistoryOracleAgent', Oracle, 'oracle', {},
+         lambda page, run: page.ActionRestoreHistoryOracleAgent()),
+        ('ActionOracleBackupHistory', OracleInstance, 'oracle/instance', {'name': last},
+         lambda page, run: page.ActionOracleBackupHistory('default')),
+    ]
+
+
+def Regressions(results, baseline, threshold):
+    """Returns the results exceeding their baseline by more than the threshold
+        results     : a dict, "method@size" to the Measure() result
+        baseline    : a dict of the same shape, read from the baseline file
+        threshold   : a float, the allowed increase, 0.25 for 25%
+        Returns a list of strings, one per regressed metric
+    """
+    # wall and CPU times below these many seconds over the baseline are noise
+    floors = {'seconds': 0.05, 'cpu': 0.05, 'commands': 0}
+    regressed = []
+    for key, result in sorted(results.items()):
+        for metric, floor in sorted(floors.items()):
+            old, new = baseline.get(key, {}).get(metric), result.get(metric)
+            if old is not None and new is not None and new > old * (1 + threshold) and new - old > floor:
+                regressed.append('%s %s: %.3f, baseline %.3f' % (key, metric, new, old))
+    return regressed
+
+
+def BenchMethods(driver, sizes=(10, 100, 1000), runs=3):
+    """Times the Oracle page-object methods against the stand-in at several data sizes and
+    compares the results with the baseline. Every size seeds that many instances, browse
+    tablespaces and past jobs, with three subclients per instance.
+        Returns the list of regressions and failed methods
+    """
+    path = os.environ.get('ORACLE_BENCH_BASELINE', 'oracle-methods.json')
+    threshold = float(os.environ.get('ORACLE_BENCH_THRESHOLD', '0.25'))
+    try:
+        driver.execute_cdp_cmd('Performance.enable', {})
+    except Exception:
+        print('browser CPU time is not available from this driver')
+    results, failures = {}, []
+    for size in sizes:
+        console = AdminConsoleStandIn(instances=size, tablespaces=size, jobs=size, jobSeconds=0)
+        console.Start()
+        rows = []
+        try:
+            for name, cls, start, query, call in MethodCases(size):
+                page = cls.__new__(cls)
+                page.driver = driver
+                page.ClientName = console.clientName
+
+                def Prepare():
+                    driver.get(console.Url(start, **query))
+                    page.Wait_for_Completion()
+                    page.Navigation = NavigationCache()
+                    cls.Options.Invalidate()
+
+                result = Measure(driver, Prepare, lambda run: call(page, run), runs)
+                results['%s@%d' % (name, size)] = result
+                if result['failed']:
+                    failures.append('%s@%d failed %d of %d runs' % (name, size, result['failed'], runs))
+                rows.append((name, '%.3f s  %5.1f commands  %s' % (
+                    result['seconds'], result['commands'],
+                    'n/a' if result['cpu'] is None else '%.3f s cpu' % result['cpu'])))
+        finally:
+            console.Stop()
+        Report('Oracle page-object methods, %d rows' % size, rows)
+    baseline = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            baseline = json.load(f)
+    regressed = Regressions(results, baseline, threshold)
+    if os.environ.get('ORACLE_BENCH_UPDATE') == '1':
+        with open(path, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print('baseline written to %s' % path)
+    Report('regressions over %s, threshold %d%%' % (path, threshold * 100),
+           [(line, '') for line in regressed + failures] or [('none', '')])
+    return regressed + failures
+
+
+BENCHMARKS = {
+    'wait': BenchWait,
+    'grid': BenchGrid,
+    'browse': BenchBrowse,
+    'login': BenchLoginCache,
+    'subclients': BenchSubclients,
+    'rest': BenchRest,
+    'methods': BenchMethods,
+}
+
+# benchmarks that do not drive a browser
+NO_BROWSER = ('rest',)
+
+
+def main(names):
+    names = names or sorted(BENCHMARKS)
+    driver = Chrome() if [name for name in names if name not in NO_BROWSER] else None
+    failed = []
+    try:
+        for name in names:
+            failed.extend(BENCHMARKS[name](driver) or [])
+    finally:
+        if driver is not None:
+            driver.quit()
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,262 @@
+#!/usr/bin/env python
+"""
+This module provides the local HTML fixtures used to benchmark the Oracle page
+object helpers without an AdminConsole.
+Functions:
+WriteFixture()              -- Writes the html to a temporary file and returns its file:// url
+Page()                      -- Wraps the body and script into a complete html document
+AjaxPage()                  -- A page whose submit button keeps the Ajax state busy for a given latency
+GridHtml()                  -- Returns the markup of a ui-grid with the given columns and rows
+GridPage()                  -- A page holding an instance grid with the given number of rows
+BrowsePage()                -- A restore browse grid with paging, page size picker and filter box
+SubclientPage()             -- An instance page with the Add subclient form and the subclient grid
+"""
+import os
+import tempfile
+
+PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>%(title)s</title></head>
+<body>
+%(body)s
+<script>
+%(script)s
+</script>
+</body></html>
+"""
+
+
+def WriteFixture(html, name='fixture'):
+    """Writes the html to a temporary file and returns its file:// url"""
+    fd, path = tempfile.mkstemp(prefix=name + '-', suffix='.html')
+    with os.fdopen(fd, 'w') as f:
+        f.write(html)
+    return 'file://' + path
+
+
+def Page(title, body, script=''):
+    """Wraps the body and script into a complete html document"""
+    return PAGE % {'title': title, 'body': body, 'script': script}
+
+
+def AjaxPage(latency=300, requests=3):
+    """A page whose submit button keeps the Ajax state busy for a given latency
+        latency     : an integer, milliseconds the page stays busy after a click
+        requests    : an integer, number of chained requests issued during that time
+    """
+    body = ('<form><button id="submit" type="button" '
+            'class="btn btn-primary cvBusyOnAjax">Save</button></form>'
+            '<span id="status">idle</span>')
+    script = """
+var button = document.getElementById('submit');
+button.addEventListener('click', function () {
+    var left = %(requests)d, step = %(latency)d / %(requests)d;
+    button.classList.add('busy');
+    document.getElementById('status').textContent = 'busy';
+    (function next() {
+        if (!left--) {
+            button.classList.remove('busy');
+            document.getElementById('status').textContent = 'idle';
+            return;
+        }
+        var xhr = new XMLHttpRequest();
+        xhr.open('GET', 'data:text/plain,ok');
+        xhr.onloadend = function () { setTimeout(next, step); };
+        xhr.send();
+    })();
+});
+""" % {'latency': latency, 'requests': requests}
+    return Page('Ajax', body, script)
+
+
+def Escape(text):
+    """Escapes the text for use inside html"""
+    return (str(text).replace('&', '&amp;').replace('<', '&lt;')
+            .replace('>', '&gt;').replace('"', '&quot;'))
+
+
+def GridHtml(columns, rows, pinned=False):
+    """Returns the markup of a ui-grid with the given columns and rows.
+    The first column is rendered as a link, the way the AdminConsole entity grids are.
+        columns     : a list, the column labels
+        rows        : a list of lists, the cell texts of every row
+        pinned      : a boolean, True to add the pinned row selection container
+    """
+    def Container(headers, cells, extra=''):
+        head = ''.join('<div class="ui-grid-header-cell"><span class="ui-grid-header-cell-label">'
+                       '%s</span></div>' % Escape(h) for h in headers)
+        return ('<div class="ui-grid-render-container%s"><div class="ui-grid-header">%s</div>'
+                '<div class="ui-grid-viewport"><div class="ui-grid-canvas">%s</div></div></div>'
+                % (extra, head, ''.join(cells)))
+
+    body = []
+    selection = []
+    for row in rows:
+        cells = []
+        for i, value in enumerate(row):
+            if i == 0:
+                cells.append('<div class="ui-grid-cell"><a href="#%s">%s</a></div>'
+                             % (Escape(value), Escape(value)))
+            else:
+                cells.append('<div class="ui-grid-cell"><div class="ui-grid-cell-contents">'
+                             '%s</div></div>' % Escape(value))
+        body.append('<div class="ui-grid-row"><div>%s</div></div>' % ''.join(cells))
+        selection.append('<div class="ui-grid-row"><div><div class="ui-grid-cell">'
+                         '<div class="ui-grid-selection-row-header-buttons"></div></div></div></div>')
+    containers = Container(columns, body, ' ui-grid-render-container-body')
+    if pinned:
+        containers = Container([''], selection, ' ui-grid-render-container-left') + containers
+    return ('<div class="ui-grid"><div class="ui-grid-contents-wrapper">%s</div></div>'
+            % containers)
+
+
+def GridPage(rows=500):
+    """A page holding an instance grid with the given number of rows"""
+    columns = ['Name', 'Status', 'Version']
+    data = [['inst%04d' % i, 'Ready', '12.2.0.1'] for i in range(rows)]
+    return Page('Instances', GridHtml(columns, data))
+
+
+BROWSE_TEMPLATE = """
+var entries = [], selected = {}, state = {page: 0, size: %(pageSize)d, filter: ''};
+for (var i = 0; i < %(entries)d; i++) { entries.push('TBS_' + ('0000' + i).slice(-5)); }
+var busy = document.getElementById('busy');
+function rows() {
+    return state.filter ? entries.filter(function (e) { return e.indexOf(state.filter) >= 0; })
+                        : entries;
+}
+function cell(text, cls) {
+    return '<div class="ui-grid-cell"><div class="' + cls + '">' + text + '</div></div>';
+}
+function render() {
+    var all = rows(), start = state.page * state.size, left = [], body = [];
+    all.slice(start, start + state.size).forEach(function (name) {
+        var sel = selected[name] ? ' ui-grid-row-selected' : '';
+        left.push('<div class="ui-grid-row' + sel + '" data-name="' + name + '"><div>' +
+                  cell('', 'ui-grid-selection-row-header-buttons') + '</div></div>');
+        body.push('<div class="ui-grid-row' + sel + '"><div>' + cell(name, 'ui-grid-cell-contents') +
+                  cell('Tablespace', 'ui-grid-cell-contents') + '</div></div>');
+    });
+    document.querySelector('.ui-grid-render-container-left .ui-grid-canvas').innerHTML = left.join('');
+    document.querySelector('.ui-grid-render-container-body .ui-grid-canvas').innerHTML = body.join('');
+    document.getElementById('next').disabled = start + state.size >= all.length;
+}
+function later(change) {
+    busy.classList.add('busy');
+    setTimeout(function () { change(); render(); busy.classList.remove('busy'); }, %(latency)d);
+}
+document.querySelector('.ui-grid-render-container-left').addEventListener('click', function (ev) {
+    var row = ev.target.closest('.ui-grid-row');
+    if (row) { selected[row.getAttribute('data-name')] = !selected[row.getAttribute('data-name')]; render(); }
+});
+document.getElementById('next').addEventListener('click', function () {
+    later(function () { state.page++; });
+});
+document.querySelector('.ui-grid-pager-row-count-picker select').addEventListener('change', function (ev) {
+    var size = parseInt(ev.target.options[ev.target.selectedIndex].text, 10);
+    later(function () { state.size = size; state.page = 0; });
+});
+var filter = document.querySelector('.ui-grid-filter-input');
+if (filter) {
+    filter.addEventListener('input', function (ev) {
+        var text = ev.target.value;
+        later(function () { state.filter = text; state.page = 0; });
+    });
+}
+window.browseSelected = function () { return Object.keys(selected).filter(function (k) { return selected[k]; }); };
+render();
+"""
+
+
+def BrowsePage(entries=5000, pageSize=15, pageSizes=(15, 50, 100, 500), filterBox=True, latency=50):
+    """A restore browse grid with paging, page size picker and filter box
+        entries     : an integer, the number of tablespaces listed
+        pageSize    : an integer, the initial page size
+        pageSizes   : a tuple, the page sizes offered by the picker, empty for no picker
+        filterBox   : a boolean, True to offer the filter box
+        latency     : an integer, milliseconds each page change takes to render
+    """
+    options = ''.join('<option%s>%d</option>' % (' selected' if size == pageSize else '', size)
+                      for size in pageSizes)
+    body = ('<button id="busy" class="cvBusyOnAjax" style="display:none"></button>'
+            + ('<input class="ui-grid-filter-input" type="text">' if filterBox else '')
+            + GridHtml(['Name', 'Type'], [], pinned=True)
+            + '<div class="ui-grid-pager-panel"><button id="next" type="button" '
+              'ng-disabled="cantPageForward()">Next</button>'
+            + ('<div class="ui-grid-pager-row-count-picker"><select>%s</select></div>' % options
+               if pageSizes else '')
+            + '</div>')
+    script = BROWSE_TEMPLATE % {'entries': entries, 'pageSize': pageSize, 'latency': latency}
+    return Page('Restore', body, script)
+
+
+SUBCLIENT_TEMPLATE = """
+var latency = %(latency)d, busy = document.getElementById('busy');
+var modal = document.getElementById('modal'), picker = document.querySelector('.checkBoxContainer');
+var created = JSON.parse(sessionStorage.getItem('subclients') || '[]'), plan = null;
+function later(change) {
+    busy.classList.add('busy');
+    setTimeout(function () { change(); busy.classList.remove('busy'); }, latency);
+}
+function grid() {
+    var rows = created.map(function (s) {
+        return '<div class="ui-grid-row"><div><div class="ui-grid-cell"><a href="#">' + s[0] + '</a></div>' +
+               '<div class="ui-grid-cell"><div class="ui-grid-cell-contents">' + s[1] + '</div></div></div></div>';
+    });
+    document.querySelector('#subclients .ui-grid-canvas').innerHTML = rows.join('');
+}
+%(plans)s.forEach(function (name) {
+    var row = document.createElement('div');
+    row.innerHTML = '<div><label><input type="checkbox"><span>' + name + '</span></label></div>';
+    row.querySelector('span').addEventListener('click', function () { plan = name; });
+    picker.appendChild(row);
+});
+document.getElementById('planButton').addEventListener('click', function () {
+    picker.style.display = picker.style.display === 'none' ? '' : 'none';
+});
+document.getElementById('addSubclient').addEventListener('click', function () {
+    later(function () { document.querySelector('#modal form').reset(); plan = null; modal.style.display = ''; });
+});
+document.getElementById('save').addEventListener('click', function (ev) {
+    ev.preventDefault();
+    var name = document.getElementById('subclientName').value;
+    later(function () {
+        created.push([name, plan || '']);
+        sessionStorage.setItem('subclients', JSON.stringify(created));
+        modal.style.display = 'none';
+    });
+});
+later(grid);
+"""
+
+
+def SubclientPage(plans=50, latency=100):
+    """An instance page with the Add subclient form and the subclient grid, laid out the
+    way OracleInstance.SubClientForm() finds it. The subclients created are kept in the
+    session storage of the tab and listed in the grid when the page is loaded again.
+        plans       : an integer, the number of storage plans offered by the plan picker
+        latency     : an integer, milliseconds each open, save and page load keeps the page busy
+    """
+    checkbox = ('<label><span><label for="%(id)s">%(id)s</label></span>'
+                '<input type="checkbox" id="%(id)s" checked></label>')
+    form = ('<form><div>'
+            '<div><div></div><div><div><isteven-multi-select><span>'
+            '<button type="button" class="ng-binding" id="planButton">Select plan</button></span>'
+            '<div class="checkBoxContainer" style="display:none"></div>'
+            '</isteven-multi-select></div></div></div>'
+            '<div></div>'
+            '<div><button type="button">Cancel</button>'
+            '<button type="submit" class="btn btn-primary cvBusyOnAjax" id="save">Save</button></div>'
+            '<label>Name <input id="subclientName" type="text"></label>'
+            '<label>Streams <input id="numberBackupStreams" type="text"></label>'
+            '<label><input type="radio" name="dataType" id="onlineData" checked>'
+            '<input type="radio" name="dataType" id="onlineSubset">'
+            '<input type="radio" name="dataType" id="offlineData"></label>'
+            + ''.join(checkbox % {'id': name} for name in ('dataBackup', 'logBackup', 'deleteArchiveLogs'))
+            + '</div></form>')
+    body = ('<div id="modal" style="display:none"><div><div><div></div><div>%s</div></div></div></div>'
+            '<button id="busy" class="cvBusyOnAjax" style="display:none"></button>'
+            '<a href="javascript:void(0)" id="addSubclient">Add subclient</a>'
+            '<div id="subclients">%s</div>' % (form, GridHtml(['Name', 'Storage plan'], [])))
+    script = SUBCLIENT_TEMPLATE % {'latency': latency,
+                                   'plans': str(['Plan %03d' % i for i in range(plans)])}
+    return Page('Instance', body, script)
@@ -8,11 +8,16 @@ Class:
 Functions:
 EditInstance()                  -- Edits the instance with the given name.
 OpenSubclient()                 -- Opens the subclient with the given name.
+GetSubclientDetails()           -- Returns the details and content options of the subclient.
+GetSubclientSnapshot()          -- Returns the one-shot detail snapshot of the subclient page shown.
 AddSubclient()                  -- Adds a subclient with the specified content under the given backupset.
+AddSubclients()                 -- Creates several subclients from the instance page in one pass.
 ActionAddSubclient()            -- Creates subclient from the action menu.
 SubClientForm()                 -- Subclient form to fill up during subclient creation.
 Refresh()                       -- Refreshes the status of the instance
 ActionBackup()                  -- Backups the subclient
+ActionBackups()                 -- Backups many subclients, fanning the backup dialogs out over several windows
+BackupSteps()                   -- Drives the backup dialog of one subclient, yielding wherever it waits
 SubmitOracleBackup()            -- Submits a backup job
 ActionOracleBackupHistory()     -- Opens the backup history of the subclient in an oracle instance
 ActionOracleRestoreHistory()    -- Opens the restore history of the subclient in an oracle instance
@@ -25,7 +30,11 @@ NextPage()                      -- Returns a dictionary containing the pages tha
 from Helper.Imports import *
 from ContinuousBuild.ParamsDict import *
 from OraclePages.CVPages import *
+import time
 from AutomationUtils import loghelper
+from OraclePages import UiGrid
+from OraclePages import EntitySnapshot
+from OraclePages.CrawlPlanner import CrawlPlanner
 JID = ''
 
 class OracleInstance(BackupsetLevel, Oracle):
@@ -39,7 +48,8 @@ class OracleInstance(BackupsetLevel, Oracle):
             dbpassword,
             instanceName,
             dbStoragePolicy,
-            logStoragePolicy):
+            logStoragePolicy,
+            changedOnly=False):
         """ Edits the instance with the given name.
             Instance        : a string, name of the Instance we want to add
             oracleHome      : a string, name of the Oracle home
@@ -48,6 +58,8 @@ class OracleInstance(BackupsetLevel, Oracle):
             dbusername      : a string, the database username
             dbpassword      : a string, the database password
             instanceName    : a string, database instance name
+            changedOnly     : a boolean, True to write only the fields that differ from the form
+                              and skip the submit when none does, the password is not compared
                 Return (True, 1) on successfull completion
                         (False, func_name, error_msg) otherwise
         """
@@ -57,26 +69,28 @@ class OracleInstance(BackupsetLevel, Oracle):
             if self.Check_If_Entity_Exists("xpath", "//a[@data-ng-click = 'editInstance(instanceDetails.instance,true,instanceDetails)']"):
                 self.driver.find_element_by_xpath("//a[@data-ng-click = 'editInstance(instanceDetails.instance,true,instanceDetails)']").click()
                 self.Wait_for_Completion()
-                self.driver.find_element_by_id("instanceName").clear()
-                self.driver.find_element_by_id("instanceName").send_keys(Instance)
-                self.driver.find_element_by_id("oracleHome").clear()
-                self.driver.find_element_by_id("oracleHome").send_keys(oracleHome)
-                self.driver.find_element_by_id("osUserName").clear()
-                self.driver.find_element_by_id("osUserName").send_keys(osusername)
-                #self.driver.find_element_by_id("osUserPassword").clear()
-                #self.driver.find_element_by_id("osUserPassword").send_keys(osuserpassword)
-                self.driver.find_element_by_id("dbUserName").clear()
-                self.driver.find_element_by_id("dbUserName").send_keys(dbusername)
-                self.driver.find_element_by_id("dbPassword").clear()
-                self.driver.find_element_by_id("dbPassword").send_keys(dbpassword)
-                self.driver.find_element_by_id("dbInstanceName").clear()
-                self.driver.find_element_by_id("dbInstanceName").send_keys(instanceName)
+                changed = self.FillForm({
+                    "instanceName": Instance,
+                    "oracleHome": oracleHome,
+                    "osUserName": osusername,
+                    #"osUserPassword": osuserpassword,
+                    "dbUserName": dbusername,
+                    "dbPassword": dbpassword,
+                    "dbInstanceName": instanceName}, changedOnly)
+                if not changed:
+                    log.info("The instance already has the requested values, not submitting")
+                    '''Closing the input form'''
+                    self.driver.find_element_by_xpath("//button[@type='button']").click()
+                    self.Wait_for_Completion()
+                    return True, 1
+                log.info("Updated fields: %s" % ", ".join(sorted(changed)))
                 '''Submitting the form'''
                 self.driver.find_element_by_xpath("//button[@type='submit']").click()
                 '''checking if any error message after filling the form.'''
                 self.Wait_for_Completion()
-                if self.Check_If_Entity_Exists("xpath", "//span[@class='error']"):
-                    warn = self.driver.find_element_by_xpath("//span[@class='error']").text
+                error = self.ProbeEntity("xpath", "//span[@class='error']")
+                if error is not None:
+                    warn = error.text
                     log.info(str(warn))
                     '''Closing the input form'''
                     self.driver.find_element_by_xpath("//button[@type='button']").click()
@@ -85,6 +99,8 @@ class OracleInstance(BackupsetLevel, Oracle):
                     fn = sys._getframe().f_code.co_name
                     return False, fn, str(warn)
                 else:
+                    if self.Snapshots is not None:
+                        self.Snapshots.Invalidate("instance", self.ClientName)
                     return True, 1
                 '''
                 Old form
@@ -123,10 +139,15 @@ class OracleInstance(BackupsetLevel, Oracle):
         log = loghelper.getLog()
         try:
             log.info("opening SubClient " + sbclnt)
+            agent = "Oracle/%s" % self.CurrentInstance if self.CurrentInstance else None
+            if agent and self.OpenCached(agent, sbclnt):
+                return True, 1
             #self.SearchFor(instance)
             if self.Check_If_Entity_Exists("link", sbclnt):
                 self.driver.find_element_by_link_text(sbclnt).click()
                 self.Wait_for_Completion()
+                if agent:
+                    self.Remember(agent, sbclnt)
                 return True, 1
             else:
                 self.ErroroutScreenShot()
@@ -148,40 +169,39 @@ class OracleInstance(BackupsetLevel, Oracle):
                 if not ret:
                     log.error("Could not get details of the instance")
                     raise Exception(InstanceDetails)'''
-                SubclientDetails = {}
-                displayedTitle=self.driver.find_element_by_xpath("//h1[@class='float-left ng-binding']")
-                SubclientDetails.update({"SubclientName":(displayedTitle.text.encode('utf-8'))})
-                #Plan = self.driver.find_element_by_xpath("/div/div[3]/div/div[2]/span/p[@class='info-place-holder']/span/a[@class='ng-binding']")
-                #SubclientDetails.update({"Plan": (Plan.text.encode('utf-8'))})
                 log.info("Checking content for subclient.")
-                self.driver.find_element_by_xpath("//div/div/div/span/cv-subclient-content/div/a[contains(text(),'Edit')]").click()
-                if self.driver.find_element_by_id('dataBackup').is_selected():
-                    SubclientDetails.update({"dataBackup": 'True'})
-                    if self.driver.find_element_by_id('onlineData').is_selected():
-                        SubclientDetails.update({"dataBackuptype": 'onlineData'})
-                    elif self.driver.find_element_by_id('onlineSubset').is_selected():
-                        SubclientDetails.update({"dataBackuptype": 'onlineSubset'})
-                    elif self.driver.find_element_by_id('offlineData').is_selected():
-                        SubclientDetails.update({"dataBackuptype": 'offlineData'})
-                else:
-                    SubclientDetails.update({"dataBackup": 'False'})
-
-                if self.driver.find_element_by_id('logBackup').is_selected():
-                    SubclientDetails.update({"ArchlogBackup": 'True'})
-                    if self.driver.find_element_by_id('deleteArchiveLogs').is_selected():
-                        SubclientDetails.update({"deleteArchiveLogs": 'True'})
-                    else:
-                        SubclientDetails.update({"deleteArchiveLogs": 'False'})
-                else:
-                    SubclientDetails.update({"ArchlogBackup": 'False'})
-                    SubclientDetails.update({"deleteArchiveLogs": 'False'})
-
+                SubclientDetails = self.GetSubclientSnapshot(sbclnt).AsDict()
+                SubclientDetails.update({"SubclientName": SubclientDetails["SubclientName"].encode('utf-8')})
                 log.info("Subclient details fetched: %s" %SubclientDetails)
                 return SubclientDetails
         except Exception as e:
             fn = sys._getframe().f_code.co_name
             log.exception(str(e))
             return False, fn, str(e)
+    def GetSubclientSnapshot(self, sbclnt):
+        """ Returns the details and content options of the subclient page shown, read in one script call.
+            sbclnt   : a string, name of the subclient, used as the cache key
+            The content options are read from the Edit dialog, which is closed again
+            so the subclient page is shown whether or not the snapshot was cached.
+            Returns an EntitySnapshot.SubclientSnapshot, from self.Snapshots when cached """
+        key = "%s/%s" % (self.CurrentInstance, sbclnt)
+        cached = self.Snapshots is not None and self.ClientName and self.CurrentInstance
+        if cached:
+            snapshot = self.Snapshots.Get("subclient", self.ClientName, key)
+            if snapshot is not None:
+                return snapshot
+        self.driver.find_element_by_xpath("//div/div/div/span/cv-subclient-content/div/a[contains(text(),'Edit')]").click()
+        self.Wait_for_Completion()
+        try:
+            snapshot = EntitySnapshot.ReadSubclient(self.driver)
+        finally:
+            '''Closing the content form'''
+            self.driver.find_element_by_xpath("//button[@type='button'][contains(text(),'Cancel')]").click()
+            self.Wait_for_Completion()
+        if cached:
+            self.Snapshots.Put("subclient", self.ClientName, key, snapshot)
+        return snapshot
+
     def AddSubclient(
             self,
             subclientName,
@@ -225,6 +245,55 @@ class OracleInstance(BackupsetLevel, Oracle):
             log.exception(str(e))
             fn = sys._getframe().f_code.co_name
             return False, fn, str(e)
+
+    def AddSubclients(self, specs):
+        """Creates several Oracle subclients from the instance page shown, in one pass
+            specs   : a list of dicts, each holding the AddSubclient() arguments by name
+                      (subclientName, storagePolicy, dataStreams, dataBackup, dataBackupType,
+                      ArchiveLog, DeleteArchiveLog)
+            The instance page and the cached plan picker are reused between the subclients;
+            the subclient grid is reloaded once at the end to confirm them.
+            Returns a list holding, per spec and in order,
+                    (True, 1) if the subclient was created
+                    (False, func_name, error_msg) otherwise
+        """
+        log = loghelper.getLog()
+        fn = sys._getframe().f_code.co_name
+        instanceUrl = self.driver.current_url
+        results = []
+        for spec in specs:
+            try:
+                log.info("Adding oracle subclient %s" % spec["subclientName"])
+                if self.ProbeEntity("link", "Add subclient") is None:
+                    self.driver.get(instanceUrl)
+                    self.Wait_for_Completion()
+                self.driver.find_element_by_link_text("Add subclient").click()
+                self.Wait_for_Completion()
+                ret = self.SubClientForm(**spec)
+            except Exception as e:
+                log.exception(str(e))
+                ret = (False, fn, str(e))
+            if not ret[0]:
+                try:
+                    self.driver.get(instanceUrl)
+                    self.Wait_for_Completion()
+                except Exception as e:
+                    log.exception("Could not reload the instance page: " + str(e))
+            results.append(ret)
+        try:
+            self.driver.get(instanceUrl)
+            self.Wait_for_Completion()
+            listed = set(UiGrid.ReadColumn(self.driver, ("Name", "Subclient")))
+            for i, spec in enumerate(specs):
+                if results[i][0] and spec["subclientName"] not in listed:
+                    e = "The subclient %s is not listed after creation" % spec["subclientName"]
+                    log.error(e)
+                    results[i] = (False, fn, e)
+        except Exception as e:
+            log.exception("Could not confirm the subclients: " + str(e))
+        log.info("Created %d of %d subclients" % (len([r for r in results if r[0]]), len(specs)))
+        return results
+
     def SubClientForm(
             self,
             subclientName,
@@ -249,26 +318,13 @@ class OracleInstance(BackupsetLevel, Oracle):
         try:
             self.Wait_for_Completion()
             log.info('Fills the subclient form')
-            self.driver.find_element_by_xpath("//input[@name = 'subclientName']").clear()
-            self.driver.find_element_by_xpath("//input[@name = 'subclientName']").send_keys(subclientName)
             # /html/body/div[1]/div/div/div[2]/form/div/label[2]/span[2]/isteven-multi-select/span/button
             self.driver.find_element_by_xpath("//div[1]/div/div/div/form/div[1]/div/div[2]/div/isteven-multi-select/span/button[@type='button' and @class='ng-binding']").click()
             #self.driver.find_element_by_xpath("//div[1]/div/div/div[2]/form/div/label[2]/span[2]/isteven-multi-select/span/button[@type='button' and @class='ng-binding']").click()
-            parent = self.driver.find_elements_by_xpath("//div/div[@class='checkBoxContainer']/div")
-            for i in parent:
-                t = i.find_element_by_xpath("./div/label/span").text
-                t = t.strip()
-                t = t.replace(" ","")
-                #log.info("Found plan:"+t)
-                if t.find(storagePolicy)>=0:
-                    log.info("matched")
-                    i.find_element_by_xpath("./div/label/input/following-sibling::span").click()
-                    break
-                else:
-                    continue
+            self.PickChecked(storagePolicy, "subclientPlan")
             self.Wait_for_Completion()
-            self.driver.find_element_by_id('numberBackupStreams').clear()
-            self.driver.find_element_by_id('numberBackupStreams').send_keys(dataStreams)
+            self.FillForm({"subclientName": subclientName,
+                           "numberBackupStreams": dataStreams})
             if dataBackup == "False":
                 log.info("Databackup is not required, so unchecking it")
                 self.driver.find_element_by_xpath("//div[1]/div/div/div[2]/form/div/label[4]/span[1]/label[@for = 'dataBackup']").click()
@@ -286,8 +342,9 @@ class OracleInstance(BackupsetLevel, Oracle):
                     self.driver.find_element_by_xpath("//div[1]/div/div/div[2]/form/div/label[6]/span[1]/label[@for = 'deleteArchiveLogs']").click()
             self.driver.find_element_by_xpath("//form/div/div[3]/button[2][@type = 'submit' and @class='btn btn-primary cvBusyOnAjax']").click()
             self.Wait_for_Completion()
-            if self.Check_If_Entity_Exists("xpath", "//span[@class='error']"):
-                warn = self.driver.find_element_by_xpath("//span[@class='error']").text
+            error = self.ProbeEntity("xpath", "//span[@class='error']")
+            if error is not None:
+                warn = error.text
                 log.info(str(warn))
                 '''Closing the input form'''
                 self.driver.find_element_by_xpath("//button[@type='button']").click()
@@ -296,6 +353,8 @@ class OracleInstance(BackupsetLevel, Oracle):
                 fn = sys._getframe().f_code.co_name
                 return False, fn, str(warn)
             else:
+                if self.Snapshots is not None:
+                    self.Snapshots.Invalidate("subclient", self.ClientName, "%s/%s" % (self.CurrentInstance, subclientName))
                 return True, 1
         except Exception as e:
             log.exception(str(e))
@@ -366,9 +425,12 @@ class OracleInstance(BackupsetLevel, Oracle):
                     JobID = int(JobId)
                     JID = str(JobID)
                     log.info("Backup job " + str(JobID) + " has started")
-                    log.info("Checking status: ")
-                    self.driver.find_element_by_xpath("//div[1]/div/div/div[2]/span[1]/div/a[contains(text(),' View job details')]").click()
-                    self.Wait_for_Completion()
+                    if self.TrackJob(JobID):
+                        log.info("Job status is tracked in the background")
+                    else:
+                        log.info("Checking status: ")
+                        self.driver.find_element_by_xpath("//div[1]/div/div/div[2]/span[1]/div/a[contains(text(),' View job details')]").click()
+                        self.Wait_for_Completion()
                     return True, str(JobID)
                 else:
                     e = "there is no option to submit a backup"
@@ -385,6 +447,136 @@ class OracleInstance(BackupsetLevel, Oracle):
             fn = sys._getframe().f_code.co_name
             return False, fn, str(e)
 
+    def BackupSteps(self, subclient, bkpLevel, cumulative, timeout=600):
+        """Drives the backup dialog of one subclient the way ActionBackup() does, as a generator
+        yielding wherever ActionBackup() waits for the page, so ActionBackups() can work in another
+        window meanwhile. The last value yielded is ("job", jobID). Raises an Exception if no job
+        toast shows within timeout seconds of the submit."""
+        log = loghelper.getLog()
+        toast = "//div[@class='global-options remove-border-padding ng-binding']"
+        yield
+        if self.ProbeEntity("link", subclient) is None:
+            raise Exception("Could not find the subclient: " + subclient)
+        self.driver.find_element_by_xpath("//a[contains(text(),'" +subclient +"')]/../../div[3]/div/a/span[@class='grid-action-icon']").click()
+        backup = self.ProbeEntity("link", "Back up now", wait=5)
+        if backup is None:
+            raise Exception("there is no option to submit a backup")
+        backup.click()
+        yield
+        if bkpLevel == "FULL":
+            self.driver.find_element_by_xpath("//div[1]/div/div/div[2]/span[3]/div[2]/label[1]/input[@type='radio' and @value='" + bkpLevel + "']").click()
+        elif cumulative == "True":
+            self.driver.find_element_by_xpath("//div[1]/div/div/div[2]/span[3]/div[2]/label[3]/label[@for ='cumulative']").click()
+        previous = [e.text for e in self.driver.find_elements_by_xpath(toast)]
+        self.driver.find_element_by_xpath("/html/body/div[1]/div/div/div[2]/div/button[3]").click()
+        deadline = time.time() + timeout
+        while True:
+            yield
+            texts = [e.text for e in self.driver.find_elements_by_xpath(toast)]
+            if texts and texts != previous:
+                break
+            if time.time() > deadline:
+                raise Exception("No backup job was started within %d seconds" % timeout)
+        JobID = int(texts[-1].split("Job ")[-1].split(".")[0].strip())
+        log.info("Backup job %d of subclient %s has started" % (JobID, subclient))
+        yield "job", str(JobID)
+
+    def ActionBackups(self, subclients, bkpLevel, cumulative, windows=4, timeout=600):
+        """Backs up many subclients of the instance shown, driving the backup dialog in several
+        browser windows of the session and interleaving their waits
+            subclients  : a list, names of the subclients to be backed up
+            bkpLevel    : a string, "FULL" or "INCREMENTAL"
+            cumulative  : a string, "True" for a cumulative incremental backup
+            windows     : an integer, the number of windows working at the same time
+            timeout     : seconds a window may stay busy, or wait for the job to start, before
+                          its subclient is given up
+            The job status is not checked, the jobs are handed to the job tracker if there is one.
+            The subclients that could not be backed up are left in self.BackupFailures with the error.
+            Return  (True, {subclient: jobID}) if every backup was submitted
+                    (False, func_name, error_msg, {subclient: jobID}) otherwise, with the backups
+                    that were submitted
+        """
+        log = loghelper.getLog()
+        fn = sys._getframe().f_code.co_name
+        if bkpLevel not in ("FULL", "INCREMENTAL"):
+            e = "Please type the correct backup option"
+            log.error(e)
+            return False, fn, e
+        self.BackupFailures = {}
+        jobs = {}
+        pending = list(subclients)
+        home = self.driver.current_window_handle
+        url = self.driver.current_url
+        opened = []
+        try:
+            for _ in range(min(windows, len(pending)) - 1):
+                known = set(self.driver.window_handles)
+                self.driver.execute_script("window.open(arguments[0]);", url)
+                opened.extend(h for h in self.driver.window_handles if h not in known)
+            # per window: [handle, subclient, steps, time the window last made progress]
+            slots = [[handle, None, None, time.time()] for handle in [home] + opened]
+            while pending or [slot for slot in slots if slot[2] is not None]:
+                progressed = False
+                if not [slot for slot in slots if slot[0] is not None]:
+                    for subclient in pending:
+                        self.BackupFailures[subclient] = "No browser window is left to back it up"
+                    break
+                for slot in slots:
+                    if slot[0] is None:
+                        continue
+                    if slot[2] is None:
+                        if not pending:
+                            continue
+                        slot[1] = pending.pop(0)
+                        slot[2] = self.BackupSteps(slot[1], bkpLevel, cumulative, timeout)
+                        slot[3] = time.time()
+                    try:
+                        self.driver.switch_to.window(slot[0])
+                        xhr, ng, busy, complete = self.AjaxWaiter().Probe()
+                        if xhr or ng or busy or not complete:
+                            if time.time() - slot[3] > timeout:
+                                raise Exception("The page stayed busy for %d seconds" % timeout)
+                            continue
+                        step = next(slot[2])
+                        progressed = True
+                        slot[3] = time.time()
+                        if step is not None:
+                            jobs[slot[1]] = step[1]
+                            self.TrackJob(step[1])
+                            slot[2] = None
+                    except Exception as e:
+                        log.error("Backup of %s failed: %s" % (slot[1], e))
+                        self.BackupFailures[slot[1]] = str(e)
+                        slot[2] = None
+                        try:
+                            self.driver.get(url)
+                        except Exception as e:
+                            log.error("Dropping the browser window of %s: %s" % (slot[1], e))
+                            slot[0] = None
+                if not progressed:
+                    time.sleep(0.05)
+            log.info("Submitted %d backups, %d failed" % (len(jobs), len(self.BackupFailures)))
+            if self.BackupFailures:
+                e = "The backup of %d subclients failed: %s" % (
+                    len(self.BackupFailures), ", ".join(sorted(self.BackupFailures)))
+                log.error(e)
+                return False, fn, e, jobs
+            return True, jobs
+        except Exception as e:
+            log.exception(str(e))
+            return False, fn, str(e), jobs
+        finally:
+            for handle in opened:
+                try:
+                    self.driver.switch_to.window(handle)
+                    self.driver.close()
+                except Exception:
+                    pass
+            try:
+                self.driver.switch_to.window(home)
+            except Exception as e:
+                log.error("Could not return to the first window: " + str(e))
+
     def SubmitOracleBackup(self,bkpType, cumulative = False):
         """Submits a backup job """
         log = loghelper.getLog()
@@ -418,7 +610,7 @@ class OracleInstance(BackupsetLevel, Oracle):
     def ActionOracleBackupHistory(self, subclient):
         """Opens the backup history of the subclient in an oracle instance
             subclient   : a string, the name of the subclient whose backup history is to be opened
-            Returns (True,1), if successful
+            Returns (True, [JobRecord, ...]), if the history lists jobs
                     (False, func_name, error_msg), otherwise
         """
         log = loghelper.getLog()
@@ -437,18 +629,7 @@ class OracleInstance(BackupsetLevel, Oracle):
                 self.driver.find_element_by_xpath("//span[@class = 'dropdownArrow right']").click()
                 self.driver.find_element_by_link_text('All Jobs').click()
                 self.Wait_for_Completion()
-                jids= self.driver.find_elements_by_class_name("ui-grid-render-container")
-                JobID = []
-                for i in jids:
-                    m = re.findall("\d+",i.text.encode('utf-8'))
-                    for j in m:
-                        if int(j)>100:
-                            JobID.append(j)
-                            log.info(str(j))
-                if JobID == []:
-                    return False
-                else:
-                    return True
+                return self.CheckJobHistory(subclient)
             else:
                 e = "There is no option to view the backup history of the subclient from the action menu"
                 log.error(e)
@@ -507,6 +688,7 @@ class OracleInstance(BackupsetLevel, Oracle):
         log = loghelper.getLog()
         try:
             log.info("Deleting the instance")
+            instance = self.CurrentInstance or self.ShownTitle()
             if self.Check_If_Entity_Exists("link","Delete"):
                 self.driver.find_element_by_link_text("Delete").click()
                 self.Wait_for_Completion()
@@ -517,6 +699,10 @@ class OracleInstance(BackupsetLevel, Oracle):
                 #self.driver.find_element_by_xpath("/html/body/div[1]/div/div/div[2]/div[2]/label[@for ='confirm']").click()
                 self.driver.find_element_by_xpath("//div[1]/div/div/div[3]/button[2]").click()
                 self.Wait_for_Completion()
+                self.Navigation.Invalidate(self.ClientName, "Oracle", instance, children=True)
+                if self.Snapshots is not None:
+                    self.Snapshots.Invalidate("instance", self.ClientName, instance)
+                    self.Snapshots.Invalidate("subclient", self.ClientName)
                 return True,1
             else:
                 e = "There is no option to delete the instance"
@@ -533,6 +719,7 @@ class OracleInstance(BackupsetLevel, Oracle):
         log = loghelper.getLog()
         try:
             log.info("Deleting the subclient")
+            instance = self.CurrentInstance or self.ShownTitle()
             #self.driver.find_element_by_xpath("//a[text()='" +subclient).click()
             self.driver.find_element_by_link_text(subclient).click()
             self.Wait_for_Completion()
@@ -543,6 +730,9 @@ class OracleInstance(BackupsetLevel, Oracle):
                 self.driver.find_element_by_xpath("//div[1]/div/div/div[2]/div[3]/input[@type = 'text']").send_keys('DELETE')
                 self.driver.find_element_by_xpath("//div[1]/div/div/div[3]/button[2][contains(text(), 'Save')]").click()
                 self.Wait_for_Completion()
+                self.Navigation.Invalidate(self.ClientName, "Oracle/%s" % instance, subclient)
+                if self.Snapshots is not None:
+                    self.Snapshots.Invalidate("subclient", self.ClientName, "%s/%s" % (instance, subclient))
                 return True,1
             else:
                 e = "Could not delete this subclient"
@@ -564,11 +754,7 @@ class OracleInstance(BackupsetLevel, Oracle):
                 ret = self.Refresh()
                 if ret:
                     log.info("Checking the list of Clones for an instance")
-                    jids= self.driver.find_elements_by_class_name("ui-grid-canvas")
-                    JobID = []
-                    for i in jids:
-                        t = i.find_element_by_xpath("./div/div/div/a").text
-                        JobID.append(t)
+                    JobID = [cell for cell in UiGrid.ReadColumn(self.driver, ("Job ID", "Job Id")) if cell]
                     if JobID == []:
                         return False
                     else:
@@ -593,39 +779,23 @@ class OracleInstance(BackupsetLevel, Oracle):
     def ContinuousBuild(self):
         """Run Continuous Build of the page to traverse all the links on this page."""
         ParsedPage.append(self.__class__.__name__)
-        self.ExceptionHandling(self.__class__.__name__,
-                               *(self.BackupHistory()))
-        self.driver.back()
-        self.Wait_for_Completion()
-        self.ExceptionHandling(self.__class__.__name__,
-                               *(self.RestoreHistory()))
-        self.driver.back()
-        self.Wait_for_Completion()
-        self.ExceptionHandling(self.__class__.__name__,
-                               *(self.AddBackupSet("hello")))
+        plan = CrawlPlanner(self)
+        plan.Step(self.BackupHistory, back=True)
+        plan.Step(self.RestoreHistory, back=True)
+        plan.Step(self.AddBackupSet, "hello")
 
-        self.ExceptionHandling(self.__class__.__name__,
-                               *(self.iDADataManagement()))
-        self.ExceptionHandling(self.__class__.__name__,
-                               *(self.iDADataRecovery()))
-        self.ExceptionHandling(self.__class__.__name__,
-                               *(self.iDADataManagement()))
-        self.ExceptionHandling(self.__class__.__name__,
-                               *(self.iDADataRecovery()))
+        plan.Step(self.iDADataManagement, idempotent=True)
+        plan.Step(self.iDADataRecovery, idempotent=True)
+        plan.Step(self.iDADataManagement, idempotent=True)
+        plan.Step(self.iDADataRecovery, idempotent=True)
 
-        self.ExceptionHandling(self.__class__.__name__,
-                               *(self.ActionAddSubclient("sub1",
-                                                         "newbkpset",
-                                                         "MegaMind_SP_Dedup",
-                                                         ["websymbols"])))
-        self.ExceptionHandling(self.__class__.__name__,
-                               *(self.ActionBackupHistory("defaultBackupSet")))
-        self.driver.back()
-        self.Wait_for_Completion()
-        self.ExceptionHandling(self.__class__.__name__,
-                               *(self.ActionRestoreHistory("defaultBackupSet")))
-        self.driver.back()
-        self.Wait_for_Completion()
+        plan.Step(self.ActionAddSubclient, "sub1",
+                  "newbkpset",
+                  "MegaMind_SP_Dedup",
+                  ["websymbols"])
+        plan.Step(self.ActionBackupHistory, "defaultBackupSet", back=True)
+        plan.Step(self.ActionRestoreHistory, "defaultBackupSet", back=True)
+        self.CrawlReport = plan.Run()
         # self.ExceptionHandling(self.__class__.__name__,*(self.AddSecurityAssociations(UserConstants['userroles'])))
 
     def NextPage(self):
@@ -0,0 +1,290 @@
+#!/usr/bin/env python
+"""
+This module provides the REST fast path used to set up and tear down the Oracle
+entities a test case needs, while the page objects keep driving the UI flows
+under test.
+DB servers, instances and subclients are created and deleted through the
+CommServe REST API, or a local stand-in serving the same resources (see
+OracleStandIn). Every worker thread keeps its own keep-alive connection, and the
+bulk calls run on a thread pool.
+Usage:
+    rest = OracleRest("http://webconsole/webconsole/api", workers=8)
+    rest.Login("admin", "password")
+    rest.Provision(instances=[{...}], subclients=[{...}])
+    ...
+    rest.Teardown()
+Class:
+    OracleRest() -> object()
+    RestError() -> Exception()
+Functions:
+Login()                     -- Logs in and keeps the token for the next requests
+Request()                   -- Sends a request on the connection of the calling thread
+Connection()                -- Returns the keep-alive connection of the calling thread
+Stale()                     -- Returns True if an error shows the server closed the idle connection
+Bulk()                      -- Runs a call for every spec on the thread pool
+Record()                    -- Remembers a created entity for Teardown()
+ClientId()                  -- Returns the ID of a client
+InstanceId()                -- Returns the ID of an Oracle instance
+SubclientId()               -- Returns the ID of a subclient of an Oracle instance
+AddDBServer()               -- Adds an Oracle database server
+DeleteDBServer()            -- Deletes a database server with its instances and subclients
+AddInstance()               -- Adds an Oracle instance to a client
+DeleteInstance()            -- Deletes an Oracle instance with its subclients
+AddSubclient()              -- Adds a subclient to an Oracle instance
+DeleteSubclient()           -- Deletes a subclient of an Oracle instance
+Provision()                 -- Creates DB servers, instances and subclients in that order, each kind concurrently
+Teardown()                  -- Deletes what Provision() created, in reverse order
+Close()                     -- Stops the thread pool
+"""
+import base64
+import errno
+import json
+import threading
+from multiprocessing.pool import ThreadPool
+
+try:
+    from httplib import HTTPConnection, HTTPSConnection, HTTPException, BadStatusLine
+    from urllib import urlencode, quote
+    from urlparse import urlparse
+except ImportError:
+    from http.client import HTTPConnection, HTTPSConnection, HTTPException, BadStatusLine
+    from urllib.parse import urlencode, quote, urlparse
+
+from AutomationUtils import loghelper
+
+# AdminConsole data backup types to the backup modes of the REST API
+BACKUP_MODES = {"onlineData": "ONLINE_DB", "onlineSubset": "ONLINE_SUBSET_DB", "offlineData": "OFFLINE_DB"}
+
+# socket errors of a keep-alive connection the server closed while it was idle
+STALE_ERRNOS = (errno.ECONNRESET, errno.EPIPE, errno.ECONNABORTED)
+
+
+class RestError(Exception):
+    """Raised when the REST API answers with an HTTP error or a non-zero errorCode"""
+
+
+class OracleRest(object):
+
+    def __init__(self, baseUrl, token=None, workers=8, timeout=60):
+        """ baseUrl : a string, e.g. http://webconsole/webconsole/api
+            token   : a string, the Authtoken header value, if already logged in
+            workers : an integer, the number of concurrent requests of the bulk calls
+            timeout : seconds to wait for a response """
+        url = urlparse(baseUrl)
+        self.scheme = url.scheme
+        self.netloc = url.netloc
+        self.prefix = url.path.rstrip("/")
+        self.token = token
+        self.timeout = timeout
+        self.workers = workers
+        self.local = threading.local()
+        self.pool = None
+        self.created = []
+        self.lock = threading.Lock()
+
+    def Connection(self, fresh=False):
+        """Returns the keep-alive connection of the calling thread"""
+        connection = getattr(self.local, "connection", None)
+        if connection is None or fresh:
+            if connection is not None:
+                connection.close()
+            factory = HTTPSConnection if self.scheme == "https" else HTTPConnection
+            connection = factory(self.netloc, timeout=self.timeout)
+            self.local.connection = connection
+            self.local.reused = False
+        return connection
+
+    @staticmethod
+    def Stale(error):
+        """Returns True if an error shows the server closed the idle keep-alive connection
+        before answering: a reset, or the connection closed without any status line"""
+        if isinstance(error, BadStatusLine):
+            return error.line in ("", "''")
+        return getattr(error, "errno", None) in STALE_ERRNOS
+
+    def Request(self, method, path, body=None, query=None):
+        """Sends a request on the connection of the calling thread
+            method  : a string, GET, POST or DELETE
+            path    : a string, the resource under the API url, e.g. "instance"
+            body    : a dict sent as JSON
+            query   : a dict of query parameters
+            Returns the decoded JSON response
+            Raises RestError on an HTTP error or a non-zero errorCode
+        """
+        url = "%s/%s" % (self.prefix, path)
+        if query:
+            url += "?" + urlencode(query)
+        headers = {"Accept": "application/json", "Content-Type": "application/json"}
+        if self.token:
+            headers["Authtoken"] = self.token
+        payload = json.dumps(body) if body is not None else None
+        for attempt in (0, 1):
+            connection = self.Connection(fresh=attempt > 0)
+            reused = self.local.reused
+            try:
+                connection.request(method, url, payload, headers)
+                response = connection.getresponse()
+                break
+            except (HTTPException, IOError, OSError) as e:
+                # only a reused connection the server closed while idle is retried, once, on a
+                # new one; a timeout or an error on a new connection may follow a processed request
+                connection.close()
+                self.local.connection = None
+                if attempt or not reused or not self.Stale(e):
+                    raise
+        data = response.read()
+        self.local.reused = True
+        if response.status >= 400:
+            raise RestError("%s %s failed with HTTP %d: %s" % (method, path, response.status, data[:200]))
+        result = json.loads(data.decode("utf-8")) if data else {}
+        error = result.get("response", result) if isinstance(result, dict) else {}
+        if isinstance(error, dict) and error.get("errorCode"):
+            raise RestError("%s %s failed: %s" % (method, path, error.get("errorMessage", error["errorCode"])))
+        return result
+
+    def Login(self, username, password):
+        """Logs in and keeps the token for the next requests"""
+        result = self.Request("POST", "Login", {
+            "username": username,
+            "password": base64.b64encode(password.encode("utf-8")).decode("ascii")})
+        self.token = result["token"]
+        return self.token
+
+    def Bulk(self, call, specs):
+        """Runs a call for every spec on the thread pool
+            call    : a callable, e.g. self.AddInstance
+            specs   : a list of dicts, the keyword arguments of every call
+            Returns a list holding, per spec and in order,
+                    (True, value) if the call succeeded
+                    (False, func_name, error_msg) otherwise
+        """
+        log = loghelper.getLog()
+
+        def Run(spec):
+            try:
+                return True, call(**spec)
+            except Exception as e:
+                log.error("%s%s failed: %s" % (call.__name__, spec, e))
+                return False, call.__name__, str(e)
+
+        if self.pool is None:
+            self.pool = ThreadPool(self.workers)
+        return self.pool.map(Run, list(specs))
+
+    def Record(self, kind, entity):
+        """Remembers a created entity for Teardown()"""
+        with self.lock:
+            self.created.append((kind, entity))
+
+    def AddDBServer(self, serverName, hostName, userName, password, plan, osType="WINDOWS"):
+        """Adds an Oracle database server, returning the ID of the install job"""
+        result = self.Request("POST", "InstallClient", {
+            "clientName": serverName, "hostName": hostName, "osType": osType, "plan": plan,
+            "clientAuthForJob": {"userName": userName, "password": password}, "agents": ["Oracle"]})
+        self.Record("server", {"serverName": serverName})
+        return result["jobIds"][0]
+
+    def ClientId(self, clientName):
+        """Returns the ID of a client"""
+        for client in self.Request("GET", "Client").get("clientProperties", []):
+            entity = client["client"]["clientEntity"]
+            if entity["clientName"] == clientName:
+                return entity["clientId"]
+        raise RestError("There is no client with the name " + clientName)
+
+    def DeleteDBServer(self, serverName):
+        """Deletes a database server with its instances and subclients"""
+        self.Request("DELETE", "Client/%s" % self.ClientId(serverName))
+
+    def AddInstance(self, clientName, instanceName, oracleHome, osUserName, dbUserName, dbPassword,
+                    connectString=None, dbStoragePolicy=None, logStoragePolicy=None):
+        """Adds an Oracle instance to a client, returning its ID"""
+        storage = {}
+        if dbStoragePolicy:
+            storage["commandLineStoragePolicy"] = {"storagePolicyName": dbStoragePolicy}
+        if logStoragePolicy:
+            storage["logBackupStoragePolicy"] = {"storagePolicyName": logStoragePolicy}
+        result = self.Request("POST", "instance", {"instanceProperties": {
+            "instance": {"clientName": clientName, "appName": "Oracle", "instanceName": instanceName},
+            "oracleInstance": {
+                "oracleHome": oracleHome,
+                "oracleUser": {"userName": osUserName},
+                "sqlConnect": {"userName": dbUserName, "password": dbPassword,
+                               "domainName": connectString or instanceName},
+                "oracleStorageDevice": storage}}})
+        self.Record("instance", {"clientName": clientName, "instanceName": instanceName})
+        return result["response"]["entity"]["instanceId"]
+
+    def InstanceId(self, clientName, instanceName):
+        """Returns the ID of an Oracle instance"""
+        result = self.Request("GET", "instance", query={"clientName": clientName, "appName": "Oracle"})
+        for instance in result.get("instanceProperties", []):
+            if instance["instance"]["instanceName"] == instanceName:
+                return instance["instance"]["instanceId"]
+        raise RestError("There is no instance %s on %s" % (instanceName, clientName))
+
+    def DeleteInstance(self, clientName, instanceName):
+        """Deletes an Oracle instance with its subclients"""
+        self.Request("POST", "instance/%s/action/delete" % self.InstanceId(clientName, instanceName))
+
+    def AddSubclient(self, clientName, instanceName, subclientName, storagePolicy, dataStreams=2,
+                     dataBackup=True, dataBackupType="onlineData", ArchiveLog=True, DeleteArchiveLog=True):
+        """Adds a subclient to an Oracle instance, returning its ID.
+        The options take the values of OracleInstance.AddSubclient(), "True"/"False" strings included."""
+        enabled = lambda value: str(value) != "False"
+        result = self.Request("POST", "Subclient", {"subClientProperties": {
+            "subClientEntity": {"clientName": clientName, "appName": "Oracle",
+                                "instanceName": instanceName, "subclientName": subclientName},
+            "commonProperties": {"numberOfBackupStreams": int(dataStreams),
+                                 "storageDevice": {"dataBackupStoragePolicy": {"storagePolicyName": storagePolicy}}},
+            "oracleSubclientProp": {"data": enabled(dataBackup),
+                                    "backupMode": BACKUP_MODES.get(dataBackupType, dataBackupType),
+                                    "archiveLog": enabled(ArchiveLog),
+                                    "archiveDelete": enabled(ArchiveLog) and enabled(DeleteArchiveLog)}}})
+        self.Record("subclient", {"clientName": clientName, "instanceName": instanceName,
+                                  "subclientName": subclientName})
+        return result["response"]["entity"]["subclientId"]
+
+    def SubclientId(self, clientName, instanceName, subclientName):
+        """Returns the ID of a subclient of an Oracle instance"""
+        result = self.Request("GET", "Subclient", query={
+            "clientName": clientName, "applicationName": "Oracle", "instanceName": instanceName})
+        for subclient in result.get("subClientProperties", []):
+            if subclient["subClientEntity"]["subclientName"] == subclientName:
+                return subclient["subClientEntity"]["subclientId"]
+        raise RestError("There is no subclient %s in %s on %s" % (subclientName, instanceName, clientName))
+
+    def DeleteSubclient(self, clientName, instanceName, subclientName):
+        """Deletes a subclient of an Oracle instance"""
+        self.Request("DELETE", "Subclient/%s" % quote(str(self.SubclientId(clientName, instanceName, subclientName))))
+
+    def Provision(self, servers=(), instances=(), subclients=()):
+        """Creates DB servers, instances and subclients in that order, each kind concurrently
+            servers     : a list of dicts, the AddDBServer() arguments
+            instances   : a list of dicts, the AddInstance() arguments
+            subclients  : a list of dicts, the AddSubclient() arguments
+            Returns a dict, "servers", "instances" and "subclients" to the Bulk() results
+        """
+        return {"servers": self.Bulk(self.AddDBServer, servers),
+                "instances": self.Bulk(self.AddInstance, instances),
+                "subclients": self.Bulk(self.AddSubclient, subclients)}
+
+    def Teardown(self):
+        """Deletes what Provision() and the Add calls created, subclients first, each kind concurrently
+            Returns the list of (False, func_name, error_msg) results of the deletes that failed
+        """
+        with self.lock:
+            created, self.created = self.created, []
+        failed = []
+        for kind, call in (("subclient", self.DeleteSubclient), ("instance", self.DeleteInstance),
+                           ("server", self.DeleteDBServer)):
+            specs = [entity for k, entity in reversed(created) if k == kind]
+            failed.extend(r for r in self.Bulk(call, specs) if not r[0])
+        return failed
+
+    def Close(self):
+        """Stops the thread pool"""
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
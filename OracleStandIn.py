@@ -0,0 +1,1197 @@
+#!/usr/bin/env python
+"""
+This module provides a local stand-in for the CommServe REST API resources used
+by OracleRest and JobTracker, so the REST fast path can be exercised and
+benchmarked without a CommServe.
+The clients, Oracle instances, subclients and jobs are kept in memory. Every
+request can be delayed by a configurable latency, and requests are served
+concurrently over keep-alive connections.
+AdminConsoleStandIn also serves, under /adminconsole/, plain html and script
+versions of the AdminConsole Oracle pages and dialogs (agent, instance, subclient,
+restore, instant clone, cloud migration and job pages) laid out the way the page
+objects locate them, so the Oracle page objects can be run and profiled against a
+local browser with a seeded, configurable number of instances, subclients,
+tablespaces and jobs. The AdminConsole pages and the REST API share one store.
+Usage:
+    server = MockRestServer(latency=0.05)
+    rest = OracleRest(server.Start())
+    ...
+    server.Stop()
+
+    console = AdminConsoleStandIn(instances=100, tablespaces=1000, jobs=1000)
+    driver.get(console.Start())
+    ...
+    console.Stop()
+Class:
+    MockRestServer() -> object()
+    AdminConsoleStandIn() -> MockRestServer()
+    RestHandler() -> BaseHTTPRequestHandler()
+Functions:
+Start()                     -- Starts serving on a background thread and returns the API url
+Stop()                      -- Stops the server
+Route()                     -- Handles one request and returns (HTTP status, JSON body)
+NewId()                     -- Returns a new entity ID
+AddJob()                    -- Adds a job, running for a while or already finished
+JobStatus()                 -- Returns the status of a job, completing it when its time has come
+InstallClient()             -- Adds a client with the Oracle agent and a completed install job
+AddInstance()               -- Adds an Oracle instance
+AddSubclient()              -- Adds a subclient to an existing Oracle instance
+Entity()                    -- Reads or deletes a client, instance, subclient or job by ID
+Cascade()                   -- Deletes the entities the predicate matches
+Url()                       -- Returns the url of an AdminConsole page of the stand-in
+Seed()                      -- Creates the client, its instances and subclients, and the past jobs
+Shell()                     -- Returns the html of an AdminConsole page
+PageData()                  -- Returns what an AdminConsole page shows
+Rows()                      -- Returns one page of the restore browse grid or of the job history
+DependentOptions()          -- Returns the options of a dropdown depending on another one
+SaveInstance()              -- Adds or edits an Oracle instance from the instance form
+SaveSubclient()             -- Adds a subclient from the subclient form
+SaveContent()               -- Changes the content options of a subclient
+DeleteEntity()              -- Deletes an Oracle instance or a subclient
+Backup()                    -- Starts a backup job of a subclient
+Restore()                   -- Starts a restore job of an Oracle instance
+Clone()                     -- Starts an instant clone job of an Oracle instance
+Migrate()                   -- Starts a migration of an Oracle instance to the cloud
+AddServer()                 -- Adds a database server from the server form
+"""
+import json
+import re
+import threading
+import time
+
+try:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urllib import urlencode
+    from urlparse import urlparse, parse_qs
+except ImportError:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import urlencode, urlparse, parse_qs
+
+from OraclePages.OracleRest import BACKUP_MODES
+
+
+class ThreadingServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class RestHandler(BaseHTTPRequestHandler):
+    """Serves the requests of one connection, keeping it alive between requests"""
+
+    protocol_version = "HTTP/1.1"
+
+    def Serve(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length).decode("utf-8")) if length else {}
+        status, result = self.server.mock.Route(self.command, self.path, body)
+        if isinstance(result, dict):
+            data, contentType = json.dumps(result).encode("utf-8"), "application/json"
+        else:
+            data, contentType = result.encode("utf-8"), "text/html; charset=utf-8"
+        self.send_response(status)
+        self.send_header("Content-Type", contentType)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_DELETE = Serve
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockRestServer(object):
+
+    def __init__(self, latency=0.0, host="127.0.0.1", port=0):
+        """ latency : seconds every request is delayed by, the round trip of a real CommServe
+            host    : a string, the address to listen on
+            port    : an integer, the port to listen on, any free port by default """
+        self.latency = latency
+        self.address = (host, port)
+        self.lock = threading.Lock()
+        self.ids = 0
+        self.clients = {}
+        self.instances = {}
+        self.subclients = {}
+        self.jobs = {}
+        self.requests = 0
+        self.server = None
+
+    def Start(self):
+        """Starts serving on a background thread and returns the API url"""
+        self.server = ThreadingServer(self.address, RestHandler)
+        self.server.mock = self
+        thread = threading.Thread(target=self.server.serve_forever, name="MockRestServer")
+        thread.daemon = True
+        thread.start()
+        return "http://%s:%d/webconsole/api" % self.server.server_address[:2]
+
+    def Stop(self):
+        """Stops the server"""
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def NewId(self):
+        """Returns a new entity ID, called with the lock held"""
+        self.ids += 1
+        return self.ids
+
+    def AddJob(self, operation, entity, status="Completed", start=None, seconds=0, size=0):
+        """Adds a job, called with the lock held. A Running job completes once its seconds have passed."""
+        jobId = self.NewId()
+        start = time.time() if start is None else start
+        self.jobs[jobId] = {"jobId": jobId, "operation": operation, "entity": entity, "status": status,
+                            "start": start, "end": start + seconds, "size": size}
+        return jobId
+
+    def JobStatus(self, job):
+        """Returns the status of a job, completing it when its time has come"""
+        if job["status"] == "Running" and time.time() >= job["end"]:
+            job["status"] = "Completed"
+        return job["status"]
+
+    def Route(self, method, path, body):
+        """Handles one request and returns (HTTP status, JSON body)"""
+        if self.latency:
+            time.sleep(self.latency)
+        url = urlparse(path)
+        query = dict((k, v[0]) for k, v in parse_qs(url.query).items())
+        resource = re.sub(r"^.*?/api/", "", url.path).strip("/")
+        with self.lock:
+            self.requests += 1
+            if method == "POST" and resource == "Login":
+                return 200, {"token": "QSDK mock%d" % self.NewId(), "userName": body.get("username")}
+            if method == "GET" and resource == "Client":
+                return 200, {"clientProperties": [
+                    {"client": {"clientEntity": {"clientId": i, "clientName": c["clientName"]}}}
+                    for i, c in sorted(self.clients.items())]}
+            if method == "POST" and resource == "InstallClient":
+                return 200, self.InstallClient(body)
+            if method == "GET" and resource == "instance":
+                return 200, {"instanceProperties": [
+                    {"instance": {"instanceId": i, "instanceName": o["instanceName"]}}
+                    for i, o in sorted(self.instances.items())
+                    if o["clientName"] == query.get("clientName")]}
+            if method == "POST" and resource == "instance":
+                return 200, self.AddInstance(body["instanceProperties"])
+            if method == "GET" and resource == "Subclient":
+                return 200, {"subClientProperties": [
+                    {"subClientEntity": {"subclientId": i, "subclientName": s["subclientName"]}}
+                    for i, s in sorted(self.subclients.items())
+                    if (s["clientName"], s["instanceName"]) == (query.get("clientName"), query.get("instanceName"))]}
+            if method == "POST" and resource == "Subclient":
+                return 200, self.AddSubclient(body["subClientProperties"])
+            match = re.match(r"^(Client|instance|Subclient|Job)/(\d+)(/action/delete)?$", resource)
+            if match:
+                return self.Entity(method, match.group(1), int(match.group(2)), match.group(3))
+        return 404, {"errorCode": 404, "errorMessage": "No such resource: %s %s" % (method, resource)}
+
+    def InstallClient(self, body):
+        """Adds a client with the Oracle agent and a completed install job"""
+        if any(c["clientName"] == body["clientName"] for c in self.clients.values()):
+            return {"errorCode": 1, "errorMessage": "Client %s already exists" % body["clientName"]}
+        self.clients[self.NewId()] = {"clientName": body["clientName"], "hostName": body.get("hostName")}
+        return {"jobIds": [self.AddJob("Install software", body["clientName"])]}
+
+    def AddInstance(self, properties):
+        """Adds an Oracle instance"""
+        instance = properties["instance"]
+        key = (instance["clientName"], instance["instanceName"])
+        if any((o["clientName"], o["instanceName"]) == key for o in self.instances.values()):
+            return {"response": {"errorCode": 1, "errorMessage": "Instance %s already exists" % key[1]}}
+        instanceId = self.NewId()
+        self.instances[instanceId] = dict(instance, properties=properties.get("oracleInstance", {}))
+        return {"response": {"errorCode": 0, "entity": {"instanceId": instanceId,
+                                                        "instanceName": instance["instanceName"]}}}
+
+    def AddSubclient(self, properties):
+        """Adds a subclient to an existing Oracle instance"""
+        entity = properties["subClientEntity"]
+        key = (entity["clientName"], entity["instanceName"])
+        if not any((o["clientName"], o["instanceName"]) == key for o in self.instances.values()):
+            return {"response": {"errorCode": 2, "errorMessage": "There is no instance %s" % key[1]}}
+        if any((s["clientName"], s["instanceName"], s["subclientName"]) == key + (entity["subclientName"],)
+               for s in self.subclients.values()):
+            return {"response": {"errorCode": 1, "errorMessage": "Subclient %s already exists" % entity["subclientName"]}}
+        subclientId = self.NewId()
+        self.subclients[subclientId] = dict(entity, properties=properties)
+        return {"response": {"errorCode": 0, "entity": {"subclientId": subclientId,
+                                                        "subclientName": entity["subclientName"]}}}
+
+    def Entity(self, method, kind, entityId, action):
+        """Reads or deletes a client, instance, subclient or job by ID"""
+        if kind == "Job" and method == "GET" and entityId in self.jobs:
+            return 200, {"jobs": [{"jobSummary": {"jobId": entityId, "status": self.JobStatus(self.jobs[entityId])}}]}
+        deletes = {"Client": ("DELETE", self.clients), "instance": ("POST", self.instances),
+                   "Subclient": ("DELETE", self.subclients)}
+        if kind in deletes and method == deletes[kind][0] and (kind != "instance" or action):
+            entity = deletes[kind][1].pop(entityId, None)
+            if entity is None:
+                return 404, {"errorCode": 404, "errorMessage": "There is no %s %d" % (kind, entityId)}
+            # deleting a client or an instance deletes what is under it
+            if kind == "Client":
+                self.Cascade(self.instances, lambda o: o["clientName"] == entity["clientName"])
+            if kind in ("Client", "instance"):
+                self.Cascade(self.subclients, lambda s: s["clientName"] == entity["clientName"] and
+                             (kind == "Client" or s["instanceName"] == entity["instanceName"]))
+            return 200, {"response": {"errorCode": 0}}
+        return 404, {"errorCode": 404, "errorMessage": "No such resource: %s %s/%d" % (method, kind, entityId)}
+
+    @staticmethod
+    def Cascade(entities, under):
+        """Deletes the entities the predicate matches"""
+        for entityId in [i for i, e in entities.items() if under(e)]:
+            del entities[entityId]
+
+
+# AdminConsole pages served by AdminConsoleStandIn under /adminconsole/, to their titles
+PAGES = {"oracle": "Oracle", "oracle/instance": "Instance", "oracle/subclient": "Subclient",
+         "oracle/restore": "Restore", "oracle/clone": "Instant clone", "oracle/migrate": "Migrate to cloud",
+         "oracle/clones": "Clones", "jobs": "Job history", "job": "Job details"}
+
+ORACLE_HOME = "/u01/app/oracle/product/12.2.0/dbhome_1"
+
+CLOUD_TYPES = ("Amazon", "Azure", "Oracle Cloud")
+
+SHELL_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>%(title)s</title>
+<style>
+body { font-family: sans-serif; font-size: 13px; }
+.modal-dialog { border: 1px solid #888; background: #fff; margin: 8px; padding: 8px; }
+.ui-grid-header, .ui-grid-row > div { display: flex; }
+.ui-grid-header-cell, .ui-grid-cell { flex: 1; min-height: 16px; }
+.ui-grid-render-container-left .ui-grid-header-cell, .ui-grid-render-container-left .ui-grid-cell { flex: 0 0 20px; }
+.ui-grid-contents-wrapper { display: flex; }
+.ui-grid-render-container-body { flex: 1; }
+.ui-grid-selection-row-header-buttons { display: inline-block; width: 12px; height: 12px; border: 1px solid #888; }
+.ui-grid-row-selected .ui-grid-selection-row-header-buttons { background: #36c; }
+.grid-action-icon { display: inline-block; width: 12px; height: 12px; background: #888; }
+.dropdown-menu { list-style: none; margin: 0; padding: 2px 8px; border: 1px solid #ccc; }
+.actions-bar > a, .actions-bar > div { display: inline-block; margin-right: 12px; vertical-align: top; }
+.dropdownArrow { cursor: pointer; padding: 0 4px; }
+.wizard-step.active { font-weight: bold; }
+.error { color: #c00; }
+</style></head>
+<body>
+<div id="modalHost"></div>
+<div id="wrapper"><div id="app">
+<div class="navbar"><a href="/adminconsole/oracle">Databases</a> <a href="/adminconsole/jobs">Jobs</a></div>
+<div class="main">
+<div class="breadcrumb" id="breadcrumb"></div>
+<div class="page"><div class="page-inner">
+<div class="page-title" id="title"></div>
+<div class="page-actions"><div class="actions-bar" id="actions"></div></div>
+<div class="page-content" id="content"></div>
+</div></div>
+</div>
+</div></div>
+<button id="busy" class="cvBusyOnAjax busy" style="display:none"></button>
+<script>window.standIn = %(bootstrap)s;</script>
+<script>%(script)s</script>
+</body></html>
+"""
+
+APP_SCRIPT = """
+var S = window.standIn, base = '/adminconsole/', data = {}, paged = null, wizard = null, pending = 0;
+var $ = function (id) { return document.getElementById(id); };
+var each = function (list, fn) { Array.prototype.forEach.call(list, fn); };
+
+function esc(text) {
+    return String(text === null || text === undefined ? '' : text).replace(/&/g, '&amp;')
+        .replace(/</g, '&lt;').replace(/>/g, '&gt;').replace(/"/g, '&quot;');
+}
+function url(page, query) {
+    var parts = [];
+    for (var key in query) { parts.push(encodeURIComponent(key) + '=' + encodeURIComponent(query[key])); }
+    return base + page + (parts.length ? '?' + parts.join('&') : '');
+}
+function call(action, body, done) {
+    var xhr = new XMLHttpRequest(), marker = $('busy');
+    pending++;
+    marker.classList.add('busy');
+    xhr.open('POST', base + 'api/' + action);
+    xhr.setRequestHeader('Content-Type', 'application/json');
+    xhr.onloadend = function () {
+        var result;
+        try { result = JSON.parse(xhr.responseText); } catch (e) { result = {error: 'The server did not answer'}; }
+        if (done) { done(result); }
+        if (!--pending) { marker.classList.remove('busy'); }
+    };
+    xhr.send(JSON.stringify(body || {}));
+}
+function acts(args) { return 'data-act="' + esc(JSON.stringify(args)) + '"'; }
+function submits(args) { return 'data-submit="' + esc(JSON.stringify(args)) + '"'; }
+function actionLink(text, args) { return '<a href="javascript:void(0)" ' + acts(args) + '>' + esc(text) + '</a>'; }
+function pageLink(text, page, query) { return '<a href="' + esc(url(page, query)) + '">' + esc(text) + '</a>'; }
+function contents(text) { return '<div class="ui-grid-cell-contents">' + esc(text) + '</div>'; }
+function options(list, selected) {
+    return list.map(function (o) { return '<option' + (o === selected ? ' selected' : '') + '>' + esc(o) + '</option>'; }).join('');
+}
+function field(id, label, value, type) {
+    return '<div class="form-group"><label for="' + id + '">' + esc(label) + '</label><input type="' + (type || 'text') +
+        '" id="' + id + '" name="' + id + '" value="' + esc(value) + '"></div>';
+}
+function check(id, label, checked, extra) {
+    return '<input type="checkbox" id="' + id + '"' + (checked ? ' checked' : '') + (extra || '') + '><label for="' + id + '">' + esc(label) + '</label>';
+}
+function radio(name, id, label, checked) {
+    return '<input type="radio" name="' + name + '" id="' + id + '"' + (checked ? ' checked' : '') + '><label for="' + id + '">' + esc(label) + '</label>';
+}
+function details(pairs) {
+    return '<ul class="page-details">' + pairs.map(function (p) {
+        return '<li><span class="pageDetailColumn">' + esc(p[0]) + '</span><span class="pageDetailColumn">' + esc(p[1]) + '</span></li>';
+    }).join('') + '</ul>';
+}
+function values(root) {
+    var out = {};
+    each(root.querySelectorAll('input, select, textarea'), function (el) {
+        if (!el.id && !el.name) { return; }
+        if (el.type === 'radio' && !el.id) { if (el.checked) { out[el.name] = el.value; } }
+        else if (el.type === 'checkbox' || el.type === 'radio') { out[el.id || el.name] = el.checked; }
+        else { out[el.id || el.name] = el.value; }
+    });
+    return out;
+}
+function fail(root, message) {
+    each(root.querySelectorAll('span.error'), function (el) { el.parentNode.removeChild(el); });
+    root.insertAdjacentHTML('beforeend', '<span class="error">' + esc(message) + '</span>');
+}
+
+function menuBox(items, toggle) { return '<div class="dropdown" data-menu="' + esc(JSON.stringify(items)) + '">' + toggle + '</div>'; }
+function menuHtml(items) {
+    return '<ul class="dropdown-menu">' + items.map(function (item) {
+        return '<li>' + (typeof item[1] === 'string' ? '<a href="' + esc(item[1]) + '">' + esc(item[0]) + '</a>' : actionLink(item[0], item[1])) + '</li>';
+    }).join('') + '</ul>';
+}
+function actionMenu(items) {
+    return menuBox(items, '<a href="javascript:void(0)" class="grid-action"><span class="grid-action-icon"></span></a>');
+}
+function closeMenus() { each(document.querySelectorAll('.dropdown-menu'), function (el) { el.parentNode.removeChild(el); }); }
+
+function container(cls, headers, rows) {
+    return '<div class="ui-grid-render-container ' + cls + '"><div class="ui-grid-header">' +
+        headers.map(function (h) { return '<div class="ui-grid-header-cell">' + h + '</div>'; }).join('') +
+        '</div><div class="ui-grid-viewport"><div class="ui-grid-canvas">' + rows.join('') + '</div></div></div>';
+}
+function grid(columns, rows, selection) {
+    var labels = columns.map(function (c) { return '<span class="ui-grid-header-cell-label">' + esc(c) + '</span>'; });
+    var body = rows.map(function (cells) {
+        return '<div class="ui-grid-row"><div>' + cells.map(function (c) { return '<div class="ui-grid-cell">' + c + '</div>'; }).join('') + '</div></div>';
+    });
+    var left = !selection ? '' : container('ui-grid-render-container-left',
+        ['<div class="ng-scope"><div><div class="ui-grid-selection-row-header-buttons ui-grid-all-selected"></div></div></div>'],
+        selection.map(function (s) {
+            return '<div class="ui-grid-row' + (s[1] ? ' ui-grid-row-selected' : '') + '" data-name="' + esc(s[0]) +
+                '"><div><div class="ui-grid-cell"><div class="ui-grid-selection-row-header-buttons"></div></div></div></div>';
+        }));
+    return '<div class="ui-grid"><div class="ui-grid-contents-wrapper">' + left +
+        container('ui-grid-render-container-body', labels, body) + '</div></div>';
+}
+
+function pagedGrid(source, query, columns, selectable, cells) {
+    paged = {source: source, query: query, columns: columns, selectable: selectable, cells: cells,
+             page: 0, size: S.pageSize, filter: '', selected: {}, rows: [], total: 0, seq: 0};
+    $('content').insertAdjacentHTML('beforeend', (selectable ? '<input class="ui-grid-filter-input" type="text" placeholder="Filter">' : '') +
+        '<div id="pagedGrid"></div><div class="ui-grid-pager-panel"><button type="button" id="pagerNext" ng-disabled="cantPageForward()" ' +
+        acts(['nextPage']) + '>Next</button><div class="ui-grid-pager-row-count-picker"><select>' +
+        options(S.pageSizes.map(String), String(S.pageSize)) + '</select></div></div>');
+    fetchRows();
+}
+function fetchRows() {
+    var p = paged, seq = ++p.seq;
+    call('rows', {source: p.source, query: p.query, page: p.page, size: p.size, filter: p.filter}, function (result) {
+        if (seq !== p.seq) { return; }
+        p.rows = result.rows || [];
+        p.total = result.total || 0;
+        renderRows();
+    });
+}
+function renderRows() {
+    var p = paged;
+    $('pagedGrid').innerHTML = grid(p.columns, p.rows.map(p.cells),
+        p.selectable ? p.rows.map(function (row) { return [row[0], !!p.selected[row[0]]]; }) : null);
+    $('pagerNext').disabled = (p.page + 1) * p.size >= p.total;
+}
+function selectedNames() { return Object.keys(paged.selected).filter(function (k) { return paged.selected[k]; }); }
+
+function modal(title, body, footer) {
+    $('modalHost').innerHTML = '<div class="modal-dialog"><div class="modal-content"><div class="modal-header">' +
+        '<button type="button" class="close" ' + acts(['close']) + '>&times;</button><h4 class="modal-title">' + esc(title) + '</h4></div>' +
+        '<div class="modal-body">' + body + '</div>' + (footer ? '<div class="modal-footer">' + footer + '</div>' : '') + '</div></div>';
+}
+function notify(text, link, href) {
+    $('modalHost').innerHTML = '<div class="modal-dialog"><div class="modal-content"><div class="notification"><div>' +
+        esc(text) + ' <a href="' + esc(href) + '">' + esc(link) + '</a></div></div></div></div>';
+}
+function crumbs(items) {
+    $('breadcrumb').innerHTML = [['Oracle', 'oracle', {}]].concat(items).map(function (c) { return pageLink(c[0], c[1], c[2]); }).join(' / ');
+}
+function title(text) { $('title').innerHTML = '<h1 class="float-left ng-binding">' + esc(text) + '</h1>'; }
+function history(operation, query) {
+    var q = {operation: operation};
+    for (var key in query) { q[key] = query[key]; }
+    return url('jobs', q);
+}
+function subclientRows() {
+    var name = data.instance.instanceName;
+    return data.subclients.map(function (s) {
+        var q = {instance: name, subclient: s.subclientName};
+        return [pageLink(s.subclientName, 'oracle/subclient', {instance: name, name: s.subclientName}), contents(s.plan),
+                actionMenu([['Back up now', ['backupForm', name, s.subclientName]], ['Backup history', history('Backup', q)],
+                            ['Restore history', history('Restore', q)], ['Delete', ['deleteForm', 'subclient', name, s.subclientName]]])];
+    });
+}
+
+var steps = {
+    clone: [
+        {title: 'Select source', html: function () {
+            return '<div>' + radio('source', 'mostRecent', 'Most recent backup', true) + '</div><div>' +
+                radio('source', 'pitDate', 'Point in time', false) + '<input type="text" id="toTime" placeholder="mm/dd/yyyy hh:mm AM"></div>';
+        }},
+        {title: 'Destination', required: ['destInstance', 'oraHome'], html: function () {
+            return field('destInstance', 'Instance name', '') + field('oraHome', 'Oracle home', data.instance.oracleHome) +
+                field('oraPfile', 'PFile', '') + field('stagingPath', 'Staging path', '');
+        }},
+        {title: 'Clone options', html: function () {
+            return '<div>' + field('rsvTPDays', 'Reservation days', '1') + field('rsvTPHours', 'Reservation hours', '0') + '</div>' +
+                '<div>' + field('copyPrec', 'Copy precedence', '0') + '</div>' +
+                '<div><div>' + check('forceCleanup', 'Overwrite an existing clone', false) + '</div></div>';
+        }},
+        {title: 'Summary', html: summary}
+    ],
+    migrate: [
+        {title: 'Server configuration', required: ['oraHomeText'], html: function () {
+            return '<div><label for="cloudType">Cloud type</label><select id="cloudType" data-options="AllocPolicyId">' + options(data.cloudTypes, data.cloudTypes[0]) + '</select></div>' +
+                '<div><label for="AllocPolicyId">Allocation policy</label><select id="AllocPolicyId">' + options(data.policies) + '</select></div>' +
+                field('oraHomeText', 'Virtual machine name', '');
+        }},
+        {title: 'Compute configuration', html: function () {
+            return '<div><label for="amiName">Image</label><select id="amiName">' + options(data.images) + '</select></div>' +
+                '<div><label for="instanceType">Instance type</label><select id="instanceType">' + options(data.sizes) + '</select></div>' +
+                '<div><span class="multiSelect inlineBlock buttonClicked"><button type="button" ' + acts(['toggle', 'networks']) + '>Select network</button></span>' +
+                '<div class="checkBoxContainer" id="networks" style="display:none">' + data.networks.map(function (n) {
+                    return '<div><div><label><input type="checkbox" value="' + esc(n) + '"><span>' + esc(n) + '</span></label></div></div>';
+                }).join('') + '</div></div>';
+        }},
+        {title: 'Software configuration', html: function () {
+            return '<div>' + radio('software', 'cloneFromSource', 'Clone the Oracle home of the source', true) +
+                radio('software', 'installedOracleHome', 'Use an installed Oracle home', false) + '</div>' + field('oracleHome', 'Oracle home', data.instance.oracleHome);
+        }},
+        {title: 'Firewall configuration', submit: true, html: function () {
+            return '<div><div>' + check('enableFirewall', 'There is a firewall between the client and the CommServe', false, ' data-shows="firewallOptions"') + '</div>' +
+                '<div id="firewallOptions" style="display:none"><div>' + radio('tunnel', 'commServTunnel', 'CommServe can open connections towards the client', false) +
+                radio('tunnel', 'commServTowardsClient', 'Client can open connections towards the CommServe', true) +
+                radio('tunnel', 'throughProxy', 'Connect through a proxy', false) + '</div>' + field('httpsTunnelPort', 'HTTPS tunnel port', '443') +
+                '<div><label for="proxyClient">Proxy</label><select id="proxyClient">' + options(data.clients) + '</select></div></div></div>';
+        }},
+        {title: 'Migration options', html: function () {
+            return '<div>Migration options</div><div><div><cv-tile-component><div><div><div>' +
+                '<span>' + radio('migration', 'onlineData', 'Online full', true) + radio('migration', 'onlineSubset', 'Online subset', false) + '</span>' +
+                '<span>' + radio('baseline', 'mostRecentBackup', 'Most recent backup', true) + radio('baseline', 'runFullBackup', 'Run a full backup', false) + '</span>' +
+                '<span>' + field('noOfStreams', 'Number of streams', '2') + '</span>' +
+                '<span>' + field('validationScript', 'Validation script', '') + '</span>' +
+                '<span><label><span><label for="standByMode">Standby mode</label></span></label><input type="checkbox" id="standByMode"></span>' +
+                '<span><label><span><label for="copyPreceDencSect">Copy precedence</label></span></label>' +
+                '<input type="checkbox" id="copyPreceDencSect" data-shows="copyPrecedence"><div id="copyPrecedence" style="display:none">' +
+                field('copyPreceDenc', 'Copy precedence', '1') + '</div></span>' +
+                '</div></div></div></cv-tile-component></div></div>';
+        }},
+        {title: 'Summary', html: summary}
+    ]
+};
+function summary() {
+    return details(Object.keys(wizard.values).map(function (k) { return [k, wizard.values[k]]; }));
+}
+function startWizard(name, finish) {
+    wizard = {name: name, steps: steps[name], finish: finish, step: 0, values: {}};
+    $('content').innerHTML = '<div><span><cv-wizard-component><div class="wizard"><div class="wizard-nav">' +
+        wizard.steps.map(function (s) { return '<span class="wizard-step">' + esc(s.title) + '</span> '; }).join('') +
+        '</div><div class="wizard-body"><div><div id="wizardButtons"><div><div><div><form><div>' +
+        '<data-ng-include id="wizardStep"></data-ng-include></div></form></div></div></div></div></div></div></cv-wizard-component></span></div>';
+    renderStep();
+}
+function renderStep() {
+    var w = wizard, step = w.steps[w.step], last = w.step === w.steps.length - 1, buttons = $('wizardButtons');
+    $('wizardStep').innerHTML = '<div><div>' + step.html() + '</div></div>';
+    each(document.querySelectorAll('.wizard-step'), function (el, i) { el.className = 'wizard-step' + (i === w.step ? ' active' : ''); });
+    each(buttons.querySelectorAll(':scope > button'), function (el) { buttons.removeChild(el); });
+    buttons.insertAdjacentHTML('beforeend', '<button type="button" class="btn btn-default" ' + acts(['leave']) + '>Cancel</button>' +
+        (last ? '<button type="button" class="btn btn-primary" ' + acts(['finish']) + '>Finish</button>'
+              : step.submit ? '<button type="submit" class="btn btn-primary cvBusyOnAjax" ' + acts(['next']) + '>Next</button>'
+              : '<button type="button" title="Next" class="btn btn-primary" ' + acts(['next']) + '>Next</button>'));
+}
+function collect() {
+    var w = wizard, fields = values($('wizardStep')), required = w.steps[w.step].required || [];
+    for (var i = 0; i < required.length; i++) {
+        if (!fields[required[i]]) { return required[i] + ' is required'; }
+    }
+    for (var key in fields) { w.values[key] = fields[key]; }
+    return '';
+}
+
+var pages = {
+    'oracle': function () {
+        crumbs([]);
+        title('Oracle');
+        $('actions').innerHTML = pageLink('Backup history', 'jobs', {operation: 'Backup'}) + pageLink('Restore history', 'jobs', {operation: 'Restore'}) +
+            '<div>' + actionLink('Add instance', ['instanceForm', '']) + '</div>' +
+            '<div>' + actionLink('Add database server', ['serverTypes']) + '</div>' +
+            '<div>' + menuBox([['Add instance', ['instanceForm', '']], ['Backup history', history('Backup', {})], ['Restore history', history('Restore', {})]],
+                              '<a href="javascript:void(0)" class="uib-dropdown-toggle dropdown-toggle">Actions</a>') + '</div>';
+        $('content').innerHTML = grid(['Name', 'Actions', ''], data.instances.map(function (o) {
+            var name = o.instanceName;
+            return [pageLink(name, 'oracle/instance', {name: name}), '<span>' + pageLink('Restore', 'oracle/restore', {instance: name}) + '</span>',
+                    actionMenu([['Add subclient', ['subclientForm', name]], ['Instant clone', url('oracle/clone', {instance: name})],
+                                ['Migrate to cloud', url('oracle/migrate', {instance: name})], ['Backup history', history('Backup', {instance: name})],
+                                ['Restore history', history('Restore', {instance: name})]])];
+        }));
+    },
+    'oracle/instance': function () {
+        var o = data.instance, name = o.instanceName;
+        crumbs([]);
+        title(name);
+        $('actions').innerHTML = '<a href="javascript:void(0)" data-ng-click="editInstance(instanceDetails.instance,true,instanceDetails)" ' +
+            acts(['instanceForm', name]) + '>Edit</a>' + actionLink('Add subclient', ['subclientForm', name]) + actionLink('Refresh', ['refresh']) +
+            pageLink('Manage clones', 'oracle/clones', {instance: name}) + actionLink('Delete', ['deleteForm', 'instance', name]);
+        $('content').innerHTML = details([['Instance name', name], ['Oracle home', o.oracleHome], ['Oracle user', o.osUserName],
+                                          ['Connect string', o.dbUserName + '@' + o.dbInstanceName], ['Status', 'Ready']]) +
+            grid(['Name', 'Storage plan', ''], subclientRows());
+    },
+    'oracle/subclient': function () {
+        var s = data.subclient, name = data.instance.instanceName;
+        crumbs([[name, 'oracle/instance', {name: name}]]);
+        title(s.subclientName);
+        $('actions').innerHTML = actionLink('Back up now', ['backupForm', name, s.subclientName]) +
+            actionLink('Delete', ['deleteForm', 'subclient', name, s.subclientName]);
+        $('content').innerHTML = details([['Storage plan', s.plan], ['Number of data streams', s.numberBackupStreams]]) +
+            '<div><div><div><span><cv-subclient-content><div><a href="javascript:void(0)" ' + acts(['contentForm']) + '>Edit</a></div>' +
+            '</cv-subclient-content></span></div></div></div>';
+    },
+    'oracle/restore': function () {
+        var name = data.instance.instanceName;
+        crumbs([[name, 'oracle/instance', {name: name}]]);
+        title('Restore ' + name);
+        $('actions').innerHTML = '';
+        $('content').innerHTML = '<div id="browseActions">' + actionLink('Restore', ['restoreForm']) + '</div>';
+        pagedGrid('browse', {instance: name}, ['Name', 'Type'], true, function (row) { return [contents(row[0]), contents(row[1])]; });
+    },
+    'oracle/clone': function () {
+        crumbs([[data.instance.instanceName, 'oracle/instance', {name: data.instance.instanceName}]]);
+        title('Instant clone');
+        startWizard('clone', 'clone');
+    },
+    'oracle/migrate': function () {
+        crumbs([[data.instance.instanceName, 'oracle/instance', {name: data.instance.instanceName}]]);
+        title('Migrate to cloud');
+        startWizard('migrate', 'migrate');
+    },
+    'oracle/clones': function () {
+        var name = data.instance.instanceName;
+        crumbs([[name, 'oracle/instance', {name: name}]]);
+        title('Clones of ' + name);
+        $('actions').innerHTML = actionLink('Refresh', ['refresh']);
+        $('content').innerHTML = grid(['Job ID', 'Clone instance', 'Created', 'Status'], data.clones.map(function (c) {
+            return [pageLink(c.jobId, 'job', {jobId: c.jobId}), contents(c.instance), contents(c.created), contents(c.status)];
+        }));
+    },
+    'jobs': function () {
+        crumbs([]);
+        title('Job history');
+        $('actions').innerHTML = menuBox([['Last 24 hours', ['range', 'day']], ['All Jobs', ['range', 'all']]],
+                                         '<span class="dropdownArrow right">Last 24 hours &#9662;</span>');
+        $('content').innerHTML = '';
+        var query = {range: 'day'};
+        for (var key in S.query) { query[key] = S.query[key]; }
+        pagedGrid('jobs', query, ['Job ID', 'Operation', 'Status', 'Start time', 'End time', 'Size'], false, function (row) {
+            return [pageLink(row[0], 'job', {jobId: row[0]})].concat(row.slice(1).map(contents));
+        });
+    },
+    'job': function () {
+        var j = data.job;
+        crumbs([]);
+        $('title').innerHTML = '';
+        $('actions').innerHTML = pageLink('All jobs', 'jobs', {range: 'all'});
+        $('content').innerHTML = '<div><span><div><div><div><h1>Job ID ' + esc(j.jobId) + '</h1></div></div><div>' +
+            details([['Operation', j.operation], ['Entity', j.entity], ['Status', j.status], ['Start time', j.start],
+                     ['End time', j.end], ['Size', j.size]]) + '</div></div></span></div>';
+    }
+};
+
+var actions = {
+    close: function () { $('modalHost').innerHTML = ''; },
+    refresh: function () { load(); },
+    toggle: function (id) { var el = $(id); el.style.display = el.style.display === 'none' ? '' : 'none'; },
+    leave: function () { location.href = url('oracle', {}); },
+    nextPage: function () { paged.page++; fetchRows(); },
+    range: function (value) { paged.query.range = value; paged.page = 0; fetchRows(); },
+    instanceForm: function (original) {
+        var o = original ? data.instance : {};
+        modal(original ? 'Edit instance' : 'Add instance', '<form ' + submits(['saveInstance', original]) + '>' +
+            field('instanceName', 'Instance name', o.instanceName) + field('oracleHome', 'Oracle home', o.oracleHome) +
+            field('osUserName', 'Oracle user name', o.osUserName) + field('osUserPassword', 'Oracle user password', '', 'password') +
+            field('dbUserName', 'Database user name', o.dbUserName) + field('dbPassword', 'Database password', o.dbPassword, 'password') +
+            field('dbInstanceName', 'Connect string', o.dbInstanceName) +
+            '<div><button type="button" ' + acts(['close']) + '>Cancel</button><button type="submit" class="btn btn-primary">Save</button></div></form>');
+    },
+    saveInstance: function (original) {
+        var form = this;
+        call('saveInstance', {original: original, fields: values(form)}, function (result) {
+            if (result.error) { fail(form, result.error); return; }
+            $('modalHost').innerHTML = '';
+            if (original && original !== result.instanceName) { location.href = url('oracle/instance', {name: result.instanceName}); }
+            else { load(); }
+        });
+    },
+    subclientForm: function (instance) {
+        var picker = '<isteven-multi-select><span><button type="button" class="ng-binding" ' + acts(['toggle', 'planPicker']) +
+            '>Select plan</button></span></isteven-multi-select>';
+        modal('Add subclient', '<form ' + submits(['saveSubclient', instance]) + '><div>' +
+            '<div><div><label>Plan</label></div><div><div>' + picker + '</div><div class="checkBoxContainer" id="planPicker" style="display:none">' +
+            data.plans.map(function (p) { return '<div><div><label><input type="checkbox" value="' + esc(p) + '"><span>' + esc(p) + '</span></label></div></div>'; }).join('') +
+            '</div></div></div>' +
+            '<label><span>Subclient name</span><span><input type="text" id="subclientName"></span></label>' +
+            '<label><span>Plan</span><span>' + picker + '</span></label>' +
+            '<label><span>Number of data streams</span><span><input type="text" id="numberBackupStreams" value="2"></span></label>' +
+            '<label><span><label for="dataBackup">Data</label></span></label>' +
+            '<label><span><label for="logBackup">Archive log</label></span></label>' +
+            '<label><span><label for="deleteArchiveLogs">Delete archive logs</label></span></label>' +
+            '<div><input type="checkbox" id="dataBackup" checked>' + radio('dataType', 'onlineData', 'Online', true) +
+            radio('dataType', 'onlineSubset', 'Online subset', false) + radio('dataType', 'offlineData', 'Offline', false) +
+            '<input type="checkbox" id="logBackup" checked><input type="checkbox" id="deleteArchiveLogs" checked></div>' +
+            '<div><button type="button" ' + acts(['close']) + '>Cancel</button><button type="submit" class="btn btn-primary cvBusyOnAjax">Save</button></div>' +
+            '</div></form>');
+    },
+    saveSubclient: function (instance) {
+        var form = this, fields = values(form), plans = [];
+        each(form.querySelectorAll('.checkBoxContainer input:checked'), function (el) { plans.push(el.value); });
+        fields.plan = plans[0] || '';
+        call('saveSubclient', {instance: instance, fields: fields}, function (result) {
+            if (result.error) { fail(form, result.error); return; }
+            $('modalHost').innerHTML = '';
+            if (S.page === 'oracle/instance') { load(); }
+        });
+    },
+    contentForm: function () {
+        var s = data.subclient;
+        modal('Edit content', '<form ' + submits(['saveContent']) + '><div>' + check('dataBackup', 'Data', s.dataBackup) + '</div><div>' +
+            radio('dataType', 'onlineData', 'Online', s.dataBackupType === 'onlineData') +
+            radio('dataType', 'onlineSubset', 'Online subset', s.dataBackupType === 'onlineSubset') +
+            radio('dataType', 'offlineData', 'Offline', s.dataBackupType === 'offlineData') + '</div><div>' +
+            check('logBackup', 'Archive log', s.logBackup) + check('deleteArchiveLogs', 'Delete archive logs', s.deleteArchiveLogs) + '</div>' +
+            '<div><button type="button" ' + acts(['close']) + '>Cancel</button><button type="submit" class="btn btn-primary">Save</button></div></form>');
+    },
+    saveContent: function () {
+        var form = this;
+        call('saveContent', {instance: data.instance.instanceName, subclient: data.subclient.subclientName, fields: values(form)}, function (result) {
+            if (result.error) { fail(form, result.error); return; }
+            $('modalHost').innerHTML = '';
+            load();
+        });
+    },
+    backupForm: function (instance, subclient) {
+        modal('Backup options for subclient ' + subclient, '<span></span><span>Select backup level</span>' +
+            '<span><div>Backup level</div><div>' +
+            '<label><input type="radio" name="backupLevel" value="FULL"> Full</label>' +
+            '<label><input type="radio" name="backupLevel" value="INCREMENTAL" checked> Incremental</label>' +
+            '<label><label for="cumulative">Cumulative</label></label><input type="checkbox" id="cumulative">' +
+            '</div></span>' +
+            '<div><button type="button" ' + acts(['close']) + '>Cancel</button><button type="button">Help</button>' +
+            '<button type="button" class="btn btn-primary" ' + acts(['backup', instance, subclient]) + '>Submit</button></div>');
+    },
+    backup: function (instance, subclient) {
+        var body = $('modalHost').querySelector('.modal-body'), fields = values(body);
+        call('backup', {instance: instance, subclient: subclient, level: fields.backupLevel, cumulative: fields.cumulative}, function (result) {
+            if (result.error) { fail(body, result.error); return; }
+            body.querySelector('span').innerHTML = '<div class="global-options remove-border-padding ng-binding">Backup job started. Job ' +
+                result.jobId + '.<a href="' + esc(url('job', {jobId: result.jobId})) + '"> View job details</a></div>';
+        });
+    },
+    deleteForm: function (kind, instance, subclient) {
+        modal('Delete ' + kind, '<div>Deleting the ' + kind + ' ' + esc(subclient || instance) + ' removes its backup configuration.</div>' +
+            '<div><label>Type DELETE to confirm</label></div><div><input type="text" id="confirmDelete"></div>',
+            '<button type="button" ' + acts(['close']) + '>Cancel</button><button type="button" class="btn btn-primary" ' +
+            acts(['remove', kind, instance, subclient || '']) + '>Save</button>');
+    },
+    remove: function (kind, instance, subclient) {
+        var body = $('modalHost').querySelector('.modal-body');
+        if ($('confirmDelete').value !== 'DELETE') { fail(body, 'Type DELETE to confirm'); return; }
+        call('delete', {kind: kind, instance: instance, subclient: subclient}, function (result) {
+            if (result.error) { fail(body, result.error); return; }
+            location.href = kind === 'instance' ? url('oracle', {}) : url('oracle/instance', {name: instance});
+        });
+    },
+    restoreForm: function () {
+        modal('Restore options', '<form ' + submits(['restore']) + '><div><div>' +
+            '<div><label for="destinationServer">Destination server</label><select id="destinationServer" data-options="destinationInstance">' +
+            options(data.clients, data.client) + '</select></div>' +
+            '<div><label for="destinationInstance">Destination instance</label><select id="destinationInstance">' +
+            options(data.instanceNames, data.instance.instanceName) + '</select></div>' +
+            '<div>' + check('database', 'Restore data', true) + '</div>' +
+            '<div>' + check('controlfile', 'Restore control file', true) + '</div>' +
+            '<div><div>' + check('spfile', 'Restore SP file', false) + '</div></div>' +
+            '<div>' + radio('recover', 'currentTime', 'Current time', true) + radio('recover', 'pitDate1', 'Point in time', false) +
+            radio('recover', 'scn', 'SCN', false) + '</div>' +
+            '<div><input type="text" id="dateTimeValue" placeholder="mm/dd/yyyy hh:mm AM"><input type="text" id="pitScn"></div>' +
+            '</div></div><div><button type="button" ' + acts(['close']) + '>Cancel</button><button type="submit" class="btn btn-primary">Submit</button></div></form>');
+    },
+    restore: function () {
+        var form = this;
+        call('restore', {instance: data.instance.instanceName, items: selectedNames(), fields: values(form)}, function (result) {
+            if (result.error) { fail(form, result.error); return; }
+            notify('Restore job ' + result.jobId + ' has been submitted.', 'View jobs', url('job', {jobId: result.jobId}));
+        });
+    },
+    serverTypes: function () {
+        $('modalHost').innerHTML = '<div class="modal-dialog"><div class="modal-content"><ul class="server-types"><li>' +
+            actionLink('Oracle', ['serverForm']) + '</li><li>' + actionLink('Oracle RAC', ['serverForm']) + '</li></ul></div></div>';
+    },
+    serverForm: function () {
+        modal('Add Oracle server', '<ng-include><div><form ' + submits(['addServer']) + '><div>' +
+            '<div><label><input type="radio" name="osType" value="WINDOWS" checked> Windows</label>' +
+            '<label><input type="radio" name="osType" value="UNIX"> Unix</label></div>' +
+            '<div><label>Server name</label><input type="text" name="serverName"></div>' +
+            '<div><label>Host name</label><input type="text" name="hostname"></div>' +
+            '<div><label>User name</label><input type="text" name="userName"></div>' +
+            '<div><label>Password</label><input type="password" name="password"></div>' +
+            '<div><label for="plan">Plan</label><input type="text" id="plan"></div>' +
+            '</div><div><button type="button" ' + acts(['close']) + '>Cancel</button><button type="submit" class="btn btn-primary">Save</button></div>' +
+            '</form></div></ng-include>');
+    },
+    addServer: function () {
+        var form = this;
+        call('addServer', {fields: values(form)}, function (result) {
+            if (result.error) { fail(form, result.error); return; }
+            notify('Install job ' + result.jobId + ' has started.', 'View job details', url('job', {jobId: result.jobId}));
+        });
+    },
+    next: function () {
+        var problem = collect();
+        if (problem) { fail($('wizardStep'), problem); return; }
+        call('step', {wizard: wizard.name, step: wizard.step});
+        wizard.step++;
+        renderStep();
+    },
+    finish: function () {
+        collect();
+        call(wizard.finish, {instance: data.instance.instanceName, fields: wizard.values}, function (result) {
+            if (result.error) { fail($('wizardStep'), result.error); return; }
+            notify(result.message, 'View job details', url('job', {jobId: result.jobId}));
+        });
+    }
+};
+
+function load() {
+    call('data', {page: S.page, query: S.query}, function (result) {
+        data = result;
+        if (result.error) { crumbs([]); title(result.error); return; }
+        pages[S.page]();
+    });
+}
+
+document.addEventListener('click', function (ev) {
+    var toggle = ev.target.closest('.grid-action, .uib-dropdown-toggle, .dropdownArrow');
+    if (toggle && toggle.parentNode.hasAttribute('data-menu')) {
+        ev.preventDefault();
+        var box = toggle.parentNode, open = box.querySelector('.dropdown-menu');
+        closeMenus();
+        if (!open) { box.insertAdjacentHTML('beforeend', menuHtml(JSON.parse(box.getAttribute('data-menu')))); }
+        return;
+    }
+    var row = ev.target.closest('.ui-grid-render-container-left .ui-grid-row');
+    if (row && paged) {
+        var name = row.getAttribute('data-name');
+        paged.selected[name] = !paged.selected[name];
+        renderRows();
+        return;
+    }
+    var target = ev.target.closest('[data-act]');
+    if (target || !ev.target.closest('.dropdown-menu')) { closeMenus(); }
+    if (target) {
+        ev.preventDefault();
+        var args = JSON.parse(target.getAttribute('data-act'));
+        actions[args[0]].apply(target, args.slice(1));
+    }
+});
+document.addEventListener('submit', function (ev) {
+    ev.preventDefault();
+    var args = JSON.parse(ev.target.getAttribute('data-submit') || '[]');
+    if (args.length) { actions[args[0]].apply(ev.target, args.slice(1)); }
+});
+document.addEventListener('change', function (ev) {
+    var el = ev.target;
+    if (el.hasAttribute('data-shows')) { $(el.getAttribute('data-shows')).style.display = el.checked ? '' : 'none'; }
+    if (el.hasAttribute('data-options')) {
+        var control = el.getAttribute('data-options');
+        call('options', {control: control, parent: el.value}, function (result) { $(control).innerHTML = options(result.options || []); });
+    }
+    if (el.closest('.ui-grid-pager-row-count-picker') && paged) {
+        paged.size = parseInt(el.options[el.selectedIndex].text, 10);
+        paged.page = 0;
+        fetchRows();
+    }
+});
+document.addEventListener('input', function (ev) {
+    if (ev.target.classList.contains('ui-grid-filter-input') && paged) {
+        paged.filter = ev.target.value;
+        paged.page = 0;
+        fetchRows();
+    }
+});
+load();
+"""
+
+
+class AdminConsoleStandIn(MockRestServer):
+    """Serves the AdminConsole pages and dialogs the Oracle page objects drive, on top of the
+    REST stand-in, so both see the same clients, instances, subclients and jobs"""
+
+    # browser actions of the pages, posted to /adminconsole/api/<action>, to their handlers
+    ACTIONS = {"data": "PageData", "rows": "Rows", "options": "DependentOptions", "step": "Step",
+               "saveInstance": "SaveInstance", "saveSubclient": "SaveSubclient", "saveContent": "SaveContent",
+               "delete": "DeleteEntity", "backup": "Backup", "restore": "Restore", "clone": "Clone",
+               "migrate": "Migrate", "addServer": "AddServer"}
+
+    def __init__(self, latency=0.0, instances=10, subclients=3, tablespaces=1000, jobs=100, plans=20,
+                 pageSize=15, jobSeconds=5, clientName="dbserver", host="127.0.0.1", port=0):
+        """ latency     : seconds every page load and browser request is delayed by
+            instances   : an integer, the number of Oracle instances of the client
+            subclients  : an integer, the number of subclients of every instance, default included
+            tablespaces : an integer, the number of rows of the restore browse grid
+            jobs        : an integer, the number of past jobs in the job history, spread over 30 days
+            plans       : an integer, the number of plans offered by the subclient plan picker
+            pageSize    : an integer, the initial page size of the browse and job grids
+            jobSeconds  : seconds the backup, restore, clone and migration jobs run for
+            clientName  : a string, the database server the Oracle pages belong to """
+        MockRestServer.__init__(self, latency, host, port)
+        self.clientName = clientName
+        self.tablespaces = tablespaces
+        self.pageSize = pageSize
+        self.jobSeconds = jobSeconds
+        self.plans = ["Plan %03d" % i for i in range(plans)]
+        self.clones = []
+        self.Seed(instances, subclients, jobs)
+
+    def Start(self):
+        """Starts serving on a background thread and returns the url of the Oracle agent page"""
+        MockRestServer.Start(self)
+        return self.Url("oracle")
+
+    def Url(self, page, **query):
+        """Returns the url of a page, e.g. Url("oracle/instance", name="inst0001")"""
+        url = "http://%s:%d/adminconsole/%s" % (self.server.server_address[:2] + (page,))
+        return url + ("?" + urlencode(sorted(query.items())) if query else "")
+
+    @staticmethod
+    def InstanceProperties(clientName, instanceName, oracleHome, osUserName, dbUserName, dbPassword, connect):
+        """Returns the instanceProperties of an Oracle instance, as the REST API takes them"""
+        return {"instance": {"clientName": clientName, "appName": "Oracle", "instanceName": instanceName},
+                "oracleInstance": {"oracleHome": oracleHome, "oracleUser": {"userName": osUserName},
+                                   "sqlConnect": {"userName": dbUserName, "password": dbPassword,
+                                                  "domainName": connect}}}
+
+    @staticmethod
+    def SubclientProperties(clientName, instanceName, subclientName, plan, streams=2, dataBackup=True,
+                            dataBackupType="onlineData", archiveLog=True, archiveDelete=True):
+        """Returns the subClientProperties of an Oracle subclient, as the REST API takes them"""
+        return {"subClientEntity": {"clientName": clientName, "appName": "Oracle", "instanceName": instanceName,
+                                    "subclientName": subclientName},
+                "commonProperties": {"numberOfBackupStreams": int(streams),
+                                     "storageDevice": {"dataBackupStoragePolicy": {"storagePolicyName": plan}}},
+                "oracleSubclientProp": {"data": dataBackup, "backupMode": BACKUP_MODES.get(dataBackupType, dataBackupType),
+                                        "archiveLog": archiveLog, "archiveDelete": archiveLog and archiveDelete}}
+
+    def Seed(self, instances, subclients, jobs):
+        """Creates the client, its instances and subclients, and the past jobs"""
+        with self.lock:
+            self.clients[self.NewId()] = {"clientName": self.clientName, "hostName": self.clientName}
+            names = []
+            for i in range(instances):
+                name = "inst%04d" % i
+                names.append(name)
+                self.AddInstance(self.InstanceProperties(self.clientName, name, ORACLE_HOME, "oracle", "sys", "", name))
+                for n in range(subclients):
+                    self.AddSubclient(self.SubclientProperties(
+                        self.clientName, name, "default" if n == 0 else "sub%04d" % n, self.plans[0] if self.plans else ""))
+            now = time.time()
+            for i in range(jobs):
+                entity = "%s/default" % names[i % len(names)] if names else self.clientName
+                operation = "Restore" if i % 5 == 4 else "Backup"
+                status = "Failed" if i % 7 == 6 else "Completed w/ one or more errors" if i % 11 == 10 else "Completed"
+                self.AddJob(operation, entity, status, start=now - (i + 1) * 30 * 86400.0 / jobs,
+                            seconds=60 + i % 600, size=(i * 7919 % 1000) * 1048576)
+
+    def Route(self, method, path, body):
+        """Handles one request, serving the AdminConsole pages and their actions under /adminconsole
+        and the REST API otherwise. Returns (HTTP status, JSON body or html)"""
+        url = urlparse(path)
+        if not url.path.startswith("/adminconsole/"):
+            return MockRestServer.Route(self, method, path, body)
+        if self.latency:
+            time.sleep(self.latency)
+        page = url.path[len("/adminconsole/"):].strip("/")
+        with self.lock:
+            self.requests += 1
+            if method == "GET" and page in PAGES:
+                return 200, self.Shell(page, dict((k, v[0]) for k, v in parse_qs(url.query).items()))
+            action = page[len("api/"):] if page.startswith("api/") else None
+            if method == "POST" and action in self.ACTIONS:
+                return 200, getattr(self, self.ACTIONS[action])(body)
+        return 404, {"errorCode": 404, "errorMessage": "No such page: %s %s" % (method, page)}
+
+    def Shell(self, page, query):
+        """Returns the html of a page, the script renders it from the data it then requests"""
+        sizes = sorted(set([self.pageSize, 50, 100, 500]))
+        bootstrap = json.dumps({"page": page, "query": query, "pageSize": self.pageSize, "pageSizes": sizes})
+        return SHELL_TEMPLATE % {"title": PAGES[page], "bootstrap": bootstrap.replace("</", "<\\/"),
+                                 "script": APP_SCRIPT}
+
+    def Instances(self, clientName=None):
+        """Returns the (ID, record) of the Oracle instances of a client, by name"""
+        clientName = clientName or self.clientName
+        return sorted(((i, o) for i, o in self.instances.items() if o["clientName"] == clientName),
+                      key=lambda item: item[1]["instanceName"])
+
+    def FindInstance(self, name):
+        """Returns the (ID, record) of an Oracle instance of the client, or (None, None)"""
+        for instanceId, instance in self.Instances():
+            if instance["instanceName"] == name:
+                return instanceId, instance
+        return None, None
+
+    def FindSubclient(self, instanceName, name):
+        """Returns the (ID, record) of a subclient of an Oracle instance of the client, or (None, None)"""
+        for subclientId, subclient in self.subclients.items():
+            if (subclient["clientName"], subclient["instanceName"], subclient["subclientName"]) == \
+                    (self.clientName, instanceName, name):
+                return subclientId, subclient
+        return None, None
+
+    @staticmethod
+    def InstanceFields(instance):
+        """Returns the Add instance form fields of an instance record"""
+        properties = instance.get("properties", {})
+        connect = properties.get("sqlConnect", {})
+        return {"instanceName": instance["instanceName"], "oracleHome": properties.get("oracleHome", ""),
+                "osUserName": properties.get("oracleUser", {}).get("userName", ""),
+                "dbUserName": connect.get("userName", ""), "dbPassword": connect.get("password", ""),
+                "dbInstanceName": connect.get("domainName", "")}
+
+    @staticmethod
+    def SubclientFields(subclient):
+        """Returns the subclient form fields of a subclient record"""
+        properties = subclient.get("properties", {})
+        common = properties.get("commonProperties", {})
+        oracle = properties.get("oracleSubclientProp", {})
+        modes = dict((v, k) for k, v in BACKUP_MODES.items())
+        return {"subclientName": subclient["subclientName"],
+                "plan": common.get("storageDevice", {}).get("dataBackupStoragePolicy", {}).get("storagePolicyName", ""),
+                "numberBackupStreams": common.get("numberOfBackupStreams", 2),
+                "dataBackup": oracle.get("data", True),
+                "dataBackupType": modes.get(oracle.get("backupMode"), "onlineData"),
+                "logBackup": oracle.get("archiveLog", True), "deleteArchiveLogs": oracle.get("archiveDelete", True)}
+
+    @staticmethod
+    def Time(seconds):
+        """Returns a timestamp the way the job grids show it"""
+        return time.strftime("%b %d, %Y %I:%M:%S %p", time.localtime(seconds))
+
+    def JobFields(self, job):
+        """Returns the job grid columns of a job record"""
+        status = self.JobStatus(job)
+        return {"jobId": str(job["jobId"]), "operation": job["operation"], "entity": job["entity"], "status": status,
+                "start": self.Time(job["start"]), "end": "" if status == "Running" else self.Time(job["end"]),
+                "size": "%.2f GB" % (job["size"] / 1073741824.0)}
+
+    def PageData(self, body):
+        """Returns what a page shows, the instance pages get the instance with its subclients"""
+        page, query = body.get("page"), body.get("query") or {}
+        data = {"client": self.clientName, "plans": self.plans}
+        if page == "oracle":
+            data["instances"] = [self.InstanceFields(o) for _, o in self.Instances()]
+        elif page == "job":
+            job = self.jobs.get(int(query.get("jobId") or 0))
+            if job is None:
+                return {"error": "There is no job %s" % query.get("jobId")}
+            data["job"] = self.JobFields(job)
+        elif page.startswith("oracle/"):
+            name = query.get("name") if page == "oracle/instance" else query.get("instance")
+            _, instance = self.FindInstance(name)
+            if instance is None:
+                return {"error": "There is no instance %s" % name}
+            data.update({
+                "instance": self.InstanceFields(instance),
+                "subclients": sorted((self.SubclientFields(s) for s in self.subclients.values()
+                                      if (s["clientName"], s["instanceName"]) == (self.clientName, name)),
+                                     key=lambda s: s["subclientName"]),
+                "clients": sorted(c["clientName"] for c in self.clients.values()),
+                "instanceNames": [o["instanceName"] for _, o in self.Instances()],
+                "clones": [dict(c, status=self.JobStatus(self.jobs[c["jobId"]]) if c["jobId"] in self.jobs else "")
+                           for c in self.clones if c["source"] == name],
+                "cloudTypes": list(CLOUD_TYPES), "policies": self.DependentOptions(
+                    {"control": "AllocPolicyId", "parent": CLOUD_TYPES[0]})["options"],
+                "images": ["Oracle Linux 7.9", "Red Hat Enterprise Linux 8", "Windows Server 2019"],
+                "sizes": ["Standard 2 vCPU", "Standard 4 vCPU", "Standard 8 vCPU"],
+                "networks": ["network%02d" % i for i in range(10)]})
+            if page == "oracle/subclient":
+                _, subclient = self.FindSubclient(name, query.get("name"))
+                if subclient is None:
+                    return {"error": "There is no subclient %s" % query.get("name")}
+                data["subclient"] = self.SubclientFields(subclient)
+        return data
+
+    def History(self, query):
+        """Returns the job records the job history query selects, newest first"""
+        since = time.time() - 86400 if query.get("range", "day") == "day" else 0
+        prefix = "/".join(query[k] for k in ("instance", "subclient") if query.get(k))
+        jobs = [job for job in self.jobs.values()
+                if job["start"] >= since and query.get("operation") in (None, "", job["operation"])
+                and (not prefix or job["entity"] == prefix or job["entity"].startswith(prefix + "/"))]
+        return sorted(jobs, key=lambda job: -job["start"])
+
+    def Rows(self, body):
+        """Returns one page of the restore browse grid or of the job history"""
+        query = body.get("query") or {}
+        page, size = int(body.get("page") or 0), int(body.get("size") or self.pageSize)
+        if body.get("source") == "browse":
+            text = body.get("filter") or ""
+            rows = [[name, "Tablespace"] for name in ("TBS_%05d" % i for i in range(self.tablespaces)) if text in name]
+        else:
+            columns = ("jobId", "operation", "status", "start", "end", "size")
+            rows = [[fields[c] for c in columns] for fields in (self.JobFields(j) for j in self.History(query))]
+        return {"rows": rows[page * size:(page + 1) * size], "total": len(rows)}
+
+    def DependentOptions(self, body):
+        """Returns the options of a dropdown that depend on the value picked in another one"""
+        parent = body.get("parent") or ""
+        if body.get("control") == "destinationInstance":
+            return {"options": [o["instanceName"] for _, o in self.Instances(parent)]}
+        if body.get("control") == "AllocPolicyId":
+            return {"options": ["%s policy %d" % (parent, i) for i in range(1, 4)]}
+        return {"options": []}
+
+    def Step(self, body):
+        """Accepts a wizard step, the pages move on once it is answered"""
+        return {}
+
+    def SaveInstance(self, body):
+        """Adds an Oracle instance, or edits the one named original"""
+        fields, original = body.get("fields") or {}, body.get("original")
+        name = (fields.get("instanceName") or "").strip()
+        if not name or not fields.get("oracleHome"):
+            return {"error": "The instance name and the Oracle home are required"}
+        properties = self.InstanceProperties(self.clientName, name, fields["oracleHome"], fields.get("osUserName", ""),
+                                             fields.get("dbUserName", ""), fields.get("dbPassword", ""),
+                                             fields.get("dbInstanceName") or name)
+        if not original:
+            result = self.AddInstance(properties)["response"]
+            return {"error": result["errorMessage"]} if result["errorCode"] else {"instanceName": name}
+        instanceId, instance = self.FindInstance(original)
+        if instance is None:
+            return {"error": "There is no instance %s" % original}
+        if name != original and self.FindInstance(name)[1] is not None:
+            return {"error": "Instance %s already exists" % name}
+        instance.update(properties["instance"], properties=properties["oracleInstance"])
+        for subclient in self.subclients.values():
+            if (subclient["clientName"], subclient["instanceName"]) == (self.clientName, original):
+                subclient["instanceName"] = name
+        return {"instanceName": name}
+
+    @staticmethod
+    def BackupType(fields):
+        """Returns the data backup type picked in a subclient form"""
+        for option in ("onlineData", "onlineSubset", "offlineData"):
+            if fields.get(option):
+                return option
+        return "onlineData"
+
+    def SaveSubclient(self, body):
+        """Adds a subclient to an Oracle instance"""
+        fields, instance = body.get("fields") or {}, body.get("instance")
+        name = (fields.get("subclientName") or "").strip()
+        if not name:
+            return {"error": "The subclient name is required"}
+        if not fields.get("plan"):
+            return {"error": "Select a plan"}
+        if not str(fields.get("numberBackupStreams", "")).isdigit():
+            return {"error": "The number of data streams must be a number"}
+        result = self.AddSubclient(self.SubclientProperties(
+            self.clientName, instance, name, fields["plan"], fields["numberBackupStreams"],
+            fields.get("dataBackup", True), self.BackupType(fields), fields.get("logBackup", True),
+            fields.get("deleteArchiveLogs", True)))["response"]
+        return {"error": result["errorMessage"]} if result["errorCode"] else {"subclientName": name}
+
+    def SaveContent(self, body):
+        """Changes the content options of a subclient"""
+        fields = body.get("fields") or {}
+        _, subclient = self.FindSubclient(body.get("instance"), body.get("subclient"))
+        if subclient is None:
+            return {"error": "There is no subclient %s" % body.get("subclient")}
+        oracle = subclient.setdefault("properties", {}).setdefault("oracleSubclientProp", {})
+        oracle.update({"data": bool(fields.get("dataBackup")),
+                       "backupMode": BACKUP_MODES[self.BackupType(fields)],
+                       "archiveLog": bool(fields.get("logBackup")),
+                       "archiveDelete": bool(fields.get("logBackup")) and bool(fields.get("deleteArchiveLogs"))})
+        return {}
+
+    def DeleteEntity(self, body):
+        """Deletes an Oracle instance with its subclients, or a subclient"""
+        if body.get("kind") == "instance":
+            entityId, _ = self.FindInstance(body.get("instance"))
+            call = ("POST", "instance", entityId, "/action/delete")
+        else:
+            entityId, _ = self.FindSubclient(body.get("instance"), body.get("subclient"))
+            call = ("DELETE", "Subclient", entityId, None)
+        if entityId is None:
+            return {"error": "There is no %s %s" % (body.get("kind"), body.get("subclient") or body.get("instance"))}
+        status, result = self.Entity(*call)
+        return {"error": result["errorMessage"]} if status != 200 else {}
+
+    def Backup(self, body):
+        """Starts a backup job of a subclient"""
+        if self.FindSubclient(body.get("instance"), body.get("subclient"))[1] is None:
+            return {"error": "There is no subclient %s" % body.get("subclient")}
+        if body.get("level") not in ("FULL", "INCREMENTAL"):
+            return {"error": "Select a backup level"}
+        jobId = self.AddJob("Backup", "%s/%s" % (body["instance"], body["subclient"]), "Running",
+                            seconds=self.jobSeconds, size=1073741824)
+        return {"jobId": jobId}
+
+    def Restore(self, body):
+        """Starts a restore job of an Oracle instance"""
+        fields = body.get("fields") or {}
+        if fields.get("destinationInstance") not in [o["instanceName"] for _, o in
+                                                     self.Instances(fields.get("destinationServer"))]:
+            return {"error": "Select a destination instance"}
+        if fields.get("pitDate1") and not fields.get("dateTimeValue"):
+            return {"error": "Enter the point in time to restore to"}
+        if fields.get("scn") and not str(fields.get("pitScn", "")).isdigit():
+            return {"error": "Enter the SCN to restore to"}
+        jobId = self.AddJob("Restore", body.get("instance"), "Running", seconds=self.jobSeconds,
+                            size=len(body.get("items") or ()) * 10485760)
+        return {"jobId": jobId}
+
+    def Clone(self, body):
+        """Starts an instant clone job of an Oracle instance"""
+        fields = body.get("fields") or {}
+        if fields.get("pitDate") and not fields.get("toTime"):
+            return {"error": "Enter the point in time to clone"}
+        jobId = self.AddJob("Instant clone", body.get("instance"), "Running", seconds=self.jobSeconds)
+        self.clones.append({"jobId": jobId, "source": body.get("instance"), "instance": fields.get("destInstance"),
+                            "created": self.Time(time.time())})
+        return {"jobId": jobId, "message": "Clone job %d has started." % jobId}
+
+    def Migrate(self, body):
+        """Starts a migration of an Oracle instance to the cloud"""
+        jobId = self.AddJob("Migrate to cloud", body.get("instance"), "Running", seconds=self.jobSeconds)
+        return {"jobId": jobId, "message": "Migration job %d has started." % jobId}
+
+    def AddServer(self, body):
+        """Adds a database server, with a completed install job"""
+        fields = body.get("fields") or {}
+        if not fields.get("serverName"):
+            return {"error": "The server name is required"}
+        result = self.InstallClient({"clientName": fields["serverName"], "hostName": fields.get("hostname")})
+        return {"error": result["errorMessage"]} if "errorMessage" in result else {"jobId": result["jobIds"][0]}
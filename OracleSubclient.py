@@ -16,6 +16,7 @@ from Helper.Imports import *
 from ContinuousBuild.ParamsDict import *
 from OraclePages.CVPages import *
 from AutomationUtils import loghelper
+from OraclePages.CrawlPlanner import CrawlPlanner
 
 class OracleSubclient(Subclient, OracleInstance):
 
@@ -41,6 +42,7 @@ class OracleSubclient(Subclient, OracleInstance):
                     return retcode[0], retcode[1], retcode[2]
                 else:
                     JID = retcode[1]
+                    self.TrackJob(JID)
                     return True, retcode[1]
             else:
                 e = "there is no option to submit a backup"
@@ -56,23 +58,17 @@ class OracleSubclient(Subclient, OracleInstance):
         """Run Continuous Build of the page to traverse all the links on this page."""
         print "Inside continuous build of Subclient page"
         ParsedPage.append(self.__class__.__name__)
-        self.ExceptionHandling(self.__class__.__name__,
-                               *(self.BackupEnabled()))
-        self.ExceptionHandling(self.__class__.__name__,
-                               *(self.BackupEnabled()))
-        self.ExceptionHandling(self.__class__.__name__,
-                               *(self.EditStorage(UserConstants['newLibrary'])))
-        self.ExceptionHandling(self.__class__.__name__,
-                               *(self.EditStorage(UserConstants['oldLibrary'])))
-        # self.ExceptionHandling(self.__class__.__name__,*(self.AddSchedule("schedule1","Incremental","weekly",['Monday','Friday'],12,21,"AM")))
-        # self.ExceptionHandling(self.__class__.__name__,*(self.DeleteSchedule("schedule1")))
-        self.ExceptionHandling(self.__class__.__name__, *(self.BackupJobs()))
-        self.driver.back()
-        self.Wait_for_Completion()
-        self.ExceptionHandling(self.__class__.__name__, *(self.ContentInfo()))
-        self.ExceptionHandling(self.__class__.__name__, *(self.Restore()))
-        self.driver.back()
-        self.Wait_for_Completion()
+        plan = CrawlPlanner(self)
+        plan.Step(self.BackupEnabled, idempotent=True)
+        plan.Step(self.BackupEnabled, idempotent=True)
+        plan.Step(self.EditStorage, UserConstants['newLibrary'])
+        plan.Step(self.EditStorage, UserConstants['oldLibrary'])
+        # plan.Step(self.AddSchedule, "schedule1","Incremental","weekly",['Monday','Friday'],12,21,"AM")
+        # plan.Step(self.DeleteSchedule, "schedule1")
+        plan.Step(self.BackupJobs, back=True)
+        plan.Step(self.ContentInfo)
+        plan.Step(self.Restore, back=True)
+        self.CrawlReport = plan.Run()
 
     def NextPage(self):
         """Returns a dictionary containing the pages that can be visited from this page."""
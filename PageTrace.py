@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+"""
+This module provides the span tracing of the Oracle page objects on the
+AdminConsole, exported in the Chrome trace-event format so a whole run, e.g. a
+ContinuousBuild, opens as a flame chart in chrome://tracing or Perfetto.
+Install() wraps the public methods of Oracle, OracleInstance and OracleSubclient
+(Wait_for_Completion and Check_If_Entity_Exists included) at class level, and
+every WebDriver command sent by a traced page object is added as a span nested
+under the call that sent it. Until Install() is called, or after Uninstall(),
+the classes are left untouched and tracing costs nothing.
+Usage:
+    tracer = PageTracer()
+    tracer.Install()
+    page.ContinuousBuild()
+    tracer.Save("oracle-trace.json")
+    tracer.Uninstall()
+Class:
+    PageTracer() -> object()
+Functions:
+Install()                   -- Wraps the public methods of the page classes in spans
+Uninstall()                 -- Restores the methods wrapped by Install()
+Attach()                    -- Adds the WebDriver commands of a driver as spans
+Detach()                    -- Stops tracing the WebDriver commands of a driver
+Span()                      -- Records a finished span
+Events()                    -- Returns the recorded spans as Chrome trace events
+Save()                      -- Writes the trace to a Chrome trace-event JSON file
+Clear()                     -- Forgets the recorded spans
+"""
+import functools
+import json
+import os
+import threading
+import time
+import types
+
+from AutomationUtils import loghelper
+from OraclePages.DriverHooks import AddCommandListener, RemoveCommandListener, HasCommandListener
+
+
+class PageTracer(object):
+
+    def __init__(self, limit=1000000):
+        """ limit   : an integer, the most spans kept, the later ones are counted as dropped """
+        self.limit = limit
+        self.events = []
+        self.dropped = 0
+        self.threads = {}
+        self.lock = threading.Lock()
+        self.installed = []
+        self.drivers = []
+        self.pid = os.getpid()
+
+    def Span(self, name, category, start, seconds, args=None):
+        """Records a finished span of the calling thread
+            start   : the time.time() the span started at
+            seconds : the duration of the span
+        """
+        thread = threading.current_thread()
+        event = {"name": name, "cat": category, "ph": "X", "pid": self.pid, "tid": thread.ident,
+                 "ts": int(start * 1000000), "dur": int(seconds * 1000000)}
+        if args:
+            event["args"] = args
+        with self.lock:
+            if len(self.events) >= self.limit:
+                self.dropped += 1
+                return
+            self.events.append(event)
+            self.threads.setdefault(thread.ident, thread.name)
+
+    def Command(self, command, params, response, error, elapsed):
+        """Records a WebDriver command as a span ending now"""
+        self.Span(command, "webdriver", time.time() - elapsed, elapsed,
+                  {"error": type(error).__name__} if error is not None else None)
+
+    def Attach(self, driver):
+        """Adds the WebDriver commands of a driver as spans"""
+        AddCommandListener(driver, self.Command)
+        with self.lock:
+            if driver not in self.drivers:
+                self.drivers.append(driver)
+
+    def Detach(self, driver):
+        """Stops tracing the WebDriver commands of a driver"""
+        RemoveCommandListener(driver, self.Command)
+        with self.lock:
+            if driver in self.drivers:
+                self.drivers.remove(driver)
+
+    def Wrap(self, name, func):
+        """Returns func wrapped in a span named name, attaching the driver of the page object"""
+        tracer = self
+
+        @functools.wraps(func)
+        def Traced(page, *args, **kwargs):
+            driver = getattr(page, "driver", None)
+            # a pooled driver loses its listeners when it is released, attach it again
+            if driver is not None and not HasCommandListener(driver, tracer.Command):
+                tracer.Attach(driver)
+            start = time.time()
+            result = None
+            try:
+                result = func(page, *args, **kwargs)
+                return result
+            finally:
+                failed = result is False or (isinstance(result, tuple) and len(result) > 0 and result[0] is False)
+                tracer.Span(name, "page", start, time.time() - start, {"failed": True} if failed else None)
+        Traced._cvTraced = func
+        return Traced
+
+    def Install(self, classes=None):
+        """Wraps the public methods of the page classes in spans
+            classes : a list of classes, Oracle, OracleInstance and OracleSubclient by default
+            Returns the number of methods wrapped
+        """
+        if classes is None:
+            from OraclePages.Oracle import Oracle
+            from OraclePages.OracleInstance import OracleInstance
+            from OraclePages.OracleSubclient import OracleSubclient
+            classes = (Oracle, OracleInstance, OracleSubclient)
+        count = 0
+        for cls in classes:
+            for name, value in list(vars(cls).items()):
+                if name.startswith("_") or not isinstance(value, types.FunctionType) or \
+                        hasattr(value, "_cvTraced"):
+                    continue
+                setattr(cls, name, self.Wrap("%s.%s" % (cls.__name__, name), value))
+                self.installed.append((cls, name, value))
+                count += 1
+        loghelper.getLog().info("Tracing %d page-object methods" % count)
+        return count
+
+    def Uninstall(self):
+        """Restores the methods wrapped by Install() and detaches the drivers"""
+        for cls, name, func in reversed(self.installed):
+            setattr(cls, name, func)
+        self.installed = []
+        for driver in list(self.drivers):
+            self.Detach(driver)
+
+    def Events(self):
+        """Returns the recorded spans as Chrome trace events, with the thread names"""
+        with self.lock:
+            events = list(self.events)
+            threads = dict(self.threads)
+        names = [{"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}}
+                 for tid, name in sorted(threads.items())]
+        return names + sorted(events, key=lambda event: (event["ts"], -event["dur"]))
+
+    def Save(self, path):
+        """Writes the trace to a Chrome trace-event JSON file
+            Returns the number of spans written
+        """
+        events = self.Events()
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms",
+                       "otherData": {"dropped": self.dropped}}, f)
+        spans = len([event for event in events if event["ph"] == "X"])
+        loghelper.getLog().info("Trace of %d spans written to %s" % (spans, path))
+        return spans
+
+    def Clear(self):
+        """Forgets the recorded spans"""
+        with self.lock:
+            self.events = []
+            self.dropped = 0
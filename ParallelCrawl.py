@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+"""
+This module provides the parallel Continuous Build runner for the Oracle pages
+on the AdminConsole.
+The page graph is the one defined by the NextPage() dictionaries: every page
+found is handed to one of N worker processes, each owning its own logged-in
+WebDriver. The worker opens the page by replaying the NextPage() methods from
+the root page, runs its ContinuousBuild() and reports the ExceptionHandling()
+and NotifyBuildBreak() calls made on the way. The parent hands every worker one page at a
+time, so the page of a worker process that dies is reported as an error, and
+merges the results into one report.
+The session factory is given as a "module:function" string so it can be
+imported in the worker processes. It is called as function(className, driver):
+with driver None it must start a browser, log in and return the root page
+object; otherwise it returns a page object of the class bound to that driver.
+Usage:
+    report = RunParallelCrawl("Oracle", "MyFactories:OraclePage", workers=8)
+Functions:
+CrawlWorker()               -- Worker process loop, runs the ContinuousBuild of the pages it is handed
+Record()                    -- Routes the ExceptionHandling and NotifyBuildBreak calls of a page into a result
+RunParallelCrawl()          -- Crawls the page graph with a pool of worker processes and merges the results
+"""
+import multiprocessing
+import time
+import traceback
+
+try:
+    from Queue import Empty
+except ImportError:
+    from queue import Empty
+
+from OraclePages.SpecLoader import LoadCallable
+
+# seconds between the checks for dead workers while waiting for page results
+POLL = 5
+
+
+def CrawlWorker(factorySpec, params, tasks, results):
+    """Worker process loop, runs the ContinuousBuild of the pages it is handed
+        factorySpec : a string, "module:function" of the session factory
+        params      : a dict, NextPage() method name to the arguments it is called with
+        tasks       : the Queue of the worker, (className, path) tuples, None to stop
+        results     : a Queue the per page results are put on
+    """
+    factory = LoadCallable(factorySpec)
+    root = None
+    rootUrl = None
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        className, path = task
+        result = {'page': className, 'path': path, 'exceptions': [], 'buildBreaks': [],
+                  'nextPages': {}, 'error': None, 'seconds': 0.0,
+                  'worker': multiprocessing.current_process().name}
+        start = time.time()
+        try:
+            if root is None:
+                root = factory(path[0][0], None)
+                rootUrl = root.driver.current_url
+            else:
+                root.driver.get(rootUrl)
+                root.Wait_for_Completion()
+            page = root
+            for child, method in path[1:]:
+                ret = getattr(page, method)(*params.get(method, ()))
+                if isinstance(ret, tuple) and ret and ret[0] is False:
+                    raise Exception("%s failed: %s" % (method, ret))
+                page = factory(child, root.driver)
+            Record(page, result)
+            page.ContinuousBuild()
+            result['nextPages'] = dict(page.NextPage())
+        except Exception as e:
+            result['error'] = "%s\n%s" % (e, traceback.format_exc())
+            if root is not None:
+                try:
+                    root.driver.quit()
+                except Exception:
+                    pass
+            root = None
+        result['seconds'] = time.time() - start
+        results.put(result)
+    if root is not None:
+        root.driver.quit()
+
+
+def Record(page, result):
+    """Routes the ExceptionHandling and NotifyBuildBreak calls of a page into a result
+    before passing them on to the page's own handlers"""
+    handling = page.ExceptionHandling
+    notify = page.NotifyBuildBreak
+
+    def ExceptionHandling(*args):
+        result['exceptions'].append([str(arg) for arg in args])
+        return handling(*args)
+
+    def NotifyBuildBreak(*args):
+        result['buildBreaks'].append([str(arg) for arg in args])
+        return notify(*args)
+
+    page.ExceptionHandling = ExceptionHandling
+    page.NotifyBuildBreak = NotifyBuildBreak
+
+
+def RunParallelCrawl(root, factorySpec, workers=None, params=None, timeout=1800):
+    """Crawls the page graph with a pool of worker processes and merges the results
+        root        : a string, the class name of the page the crawl starts from
+        factorySpec : a string, "module:function" of the session factory
+        workers     : an integer, the number of browser sessions, one per CPU by default
+        params      : a dict, NextPage() method name to the arguments it is called with
+        timeout     : an integer, seconds to wait for the next page result before the pages
+                      still outstanding are reported as errors
+        A page whose worker process died is reported as an error, and the crawl stops
+        when no worker is left.
+        Returns a dict with the per page results under 'pages' and the merged
+        'exceptions', 'buildBreaks' and 'errors' lists
+    """
+    workers = workers or multiprocessing.cpu_count()
+    params = params or {}
+    results = multiprocessing.Queue()
+    tasks = {}
+    pool = []
+    for i in range(workers):
+        name = "crawl-%d" % i
+        tasks[name] = multiprocessing.Queue()
+        process = multiprocessing.Process(target=CrawlWorker, args=(factorySpec, params, tasks[name], results),
+                                          name=name)
+        process.daemon = True
+        process.start()
+        pool.append(process)
+    start = time.time()
+    seen = set([root])
+    pending = [(root, [(root, None)])]
+    idle = [process.name for process in pool]
+    running = {}
+    lastResult = time.time()
+    report = {'pages': {}, 'exceptions': [], 'buildBreaks': [], 'errors': []}
+    try:
+        while pending or running:
+            alive = set(process.name for process in pool if process.is_alive())
+            idle = [name for name in idle if name in alive]
+            while pending and idle:
+                name = idle.pop(0)
+                running[name] = pending.pop(0)
+                tasks[name].put(running[name])
+            try:
+                result = results.get(timeout=POLL)
+            except Empty:
+                for process in pool:
+                    if process.name in running and not process.is_alive():
+                        report['errors'].append([running.pop(process.name)[0], "worker %s died with exit code %s"
+                                                 % (process.name, process.exitcode)])
+                left = len(pending) + len(running)
+                if left and not [process for process in pool if process.is_alive()]:
+                    report['errors'].append([root, "no worker left, %d pages not crawled" % left])
+                    break
+                if left and time.time() - lastResult > timeout:
+                    report['errors'].append([root, "no page result in %d seconds, %d pages not crawled"
+                                             % (timeout, left)])
+                    break
+                continue
+            lastResult = time.time()
+            running.pop(result['worker'], None)
+            idle.append(result['worker'])
+            report['pages'][result['page']] = result
+            report['exceptions'].extend(result['exceptions'])
+            report['buildBreaks'].extend(result['buildBreaks'])
+            if result['error']:
+                report['errors'].append([result['page'], result['error']])
+            for child, method in sorted(result['nextPages'].items()):
+                if child not in seen:
+                    seen.add(child)
+                    pending.append((child, result['path'] + [(child, method)]))
+    finally:
+        for process in pool:
+            tasks[process.name].put(None)
+        for process in pool:
+            process.join(60)
+            if process.is_alive():
+                process.terminate()
+    report['seconds'] = time.time() - start
+    report['sequentialSeconds'] = sum(page['seconds'] for page in report['pages'].values())
+    return report
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+"""
+This module provides a pool of warm, logged-in WebDriver sessions shared by the
+Oracle page objects on the AdminConsole, so short test cases stop paying for a
+browser start and a login each.
+A page object leases a driver, works with it and returns it; the driver is then
+reset to its landing page, cleared of the command listeners the page objects
+left on it, and recycled once it has been used a configurable number of times or
+failed to reset.
+Class:
+    SessionPool() -> object()
+Functions:
+New()                       -- Starts a new logged-in driver and registers it with the pool
+Start()                     -- Starts a new driver in the background and puts it in the pool
+Lease()                     -- Takes a warm driver out of the pool
+Release()                   -- Returns a driver to the pool, resetting or recycling it
+Session()                   -- Context manager leasing a driver for the duration of a block
+Close()                     -- Quits every driver of the pool
+"""
+import contextlib
+import threading
+
+try:
+    from Queue import Queue
+except ImportError:
+    from queue import Queue
+
+from AutomationUtils import loghelper
+from OraclePages.DriverHooks import RemoveCommandHook
+
+
+class SessionPool(object):
+
+    def __init__(self, factory, size=2, maxUses=25, landingUrl=None):
+        """ factory     : a callable returning a new logged-in WebDriver
+            size        : an integer, the number of warm drivers kept
+            maxUses     : an integer, leases after which a driver is quit and replaced
+            landingUrl  : a string, the page drivers are reset to on return,
+                          the page the factory left them on by default """
+        self.factory = factory
+        self.size = size
+        self.maxUses = maxUses
+        self.landingUrl = landingUrl
+        self.idle = Queue()
+        self.sessions = {}
+        self.lock = threading.Lock()
+        self.closed = False
+        starters = [threading.Thread(target=self.Start) for _ in range(size)]
+        for starter in starters:
+            starter.start()
+        for starter in starters:
+            starter.join()
+
+    def New(self):
+        """Starts a new logged-in driver and registers it with the pool"""
+        driver = self.factory()
+        with self.lock:
+            self.sessions[id(driver)] = {'uses': 0, 'landing': self.landingUrl or driver.current_url}
+        return driver
+
+    def Start(self):
+        """Starts a new driver in the background and puts it in the pool,
+        a failed start leaves a placeholder that Lease() replaces"""
+        try:
+            self.idle.put(self.New())
+        except Exception as e:
+            loghelper.getLog().exception("Could not start a pooled session: " + str(e))
+            self.idle.put(None)
+
+    def Lease(self, timeout=None):
+        """Takes a warm driver out of the pool, waiting up to timeout seconds for one"""
+        driver = self.idle.get(timeout=timeout)
+        if driver is None:
+            try:
+                driver = self.New()
+            except Exception:
+                # keep the slot, the next lease tries again
+                self.idle.put(None)
+                raise
+        with self.lock:
+            self.sessions[id(driver)]['uses'] += 1
+        return driver
+
+    def Release(self, driver, broken=False):
+        """Returns a driver to the pool, resetting it to its landing page or
+        replacing it when it is worn out or broken"""
+        with self.lock:
+            session = self.sessions[id(driver)]
+        RemoveCommandHook(driver)
+        if not broken and not self.closed and session['uses'] < self.maxUses:
+            try:
+                driver.get(session['landing'])
+                self.idle.put(driver)
+                return
+            except Exception as e:
+                loghelper.getLog().warning("Could not reset a pooled session: " + str(e))
+        with self.lock:
+            del self.sessions[id(driver)]
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        if not self.closed:
+            threading.Thread(target=self.Start).start()
+
+    @contextlib.contextmanager
+    def Session(self, timeout=None):
+        """Context manager leasing a driver for the duration of a block"""
+        driver = self.Lease(timeout)
+        try:
+            yield driver
+        finally:
+            self.Release(driver)
+
+    def Close(self):
+        """Quits every driver of the pool"""
+        self.closed = True
+        while not self.idle.empty():
+            driver = self.idle.get()
+            if driver is not None:
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+"""
+This module provides the persisted AdminConsole authentication used by parallel
+worker processes to skip the LoginPage flow.
+After the first login the session cookies and local storage are saved to a local
+file. Later processes inject them into their new browser and go straight to the
+page they need; the full login is only run again when the saved session has
+expired.
+Class:
+    SessionStore() -> object()
+Functions:
+Save()                      -- Saves the cookies and local storage of a logged-in driver
+Restore()                   -- Injects the saved cookies and local storage into a driver
+Open()                      -- Opens a page with the saved session, logging in again if it expired
+Settle()                    -- Waits for the page opened to settle before the session is checked
+"""
+import json
+import os
+import tempfile
+import time
+
+from AutomationUtils import loghelper
+from OraclePages.AjaxWait import AjaxWait
+from OraclePages.DriverHooks import RemoveCommandListener
+
+COOKIE_KEYS = ('name', 'value', 'path', 'domain', 'secure', 'httpOnly', 'expiry')
+
+READ_STORAGE_SCRIPT = """
+var items = {};
+for (var i = 0; i < window.localStorage.length; i++) {
+    var key = window.localStorage.key(i);
+    items[key] = window.localStorage.getItem(key);
+}
+return items;
+"""
+
+WRITE_STORAGE_SCRIPT = """
+var items = arguments[0];
+for (var key in items) { window.localStorage.setItem(key, items[key]); }
+"""
+
+LOGGED_IN_SCRIPT = """
+return !document.querySelector("input[type='password']") &&
+       window.location.href.toLowerCase().indexOf('login') < 0;
+"""
+
+
+class SessionStore(object):
+
+    def __init__(self, path, baseUrl, maxAge=8 * 3600):
+        """ path    : a string, the file the session is saved to
+            baseUrl : a string, the AdminConsole url, e.g. http://host/adminconsole/
+            maxAge  : seconds after which a saved session is not tried any more """
+        self.path = path
+        self.baseUrl = baseUrl
+        self.maxAge = maxAge
+
+    def Save(self, driver):
+        """Saves the cookies and local storage of a logged-in driver"""
+        state = {
+            'savedAt': time.time(),
+            'cookies': [dict((k, c[k]) for k in COOKIE_KEYS if k in c) for c in driver.get_cookies()],
+            'localStorage': driver.execute_script(READ_STORAGE_SCRIPT),
+        }
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix='.session-')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(state, f)
+        try:
+            os.replace(tmp, self.path)
+        except AttributeError:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            os.rename(tmp, self.path)
+
+    def Restore(self, driver):
+        """Injects the saved cookies and local storage into a driver
+            Returns False if there is no usable saved session
+        """
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+        except (IOError, OSError, ValueError):
+            return False
+        if time.time() - state.get('savedAt', 0) > self.maxAge:
+            return False
+        driver.get(self.baseUrl)
+        for cookie in state['cookies']:
+            if 'expiry' in cookie:
+                cookie['expiry'] = int(cookie['expiry'])
+            driver.add_cookie(cookie)
+        driver.execute_script(WRITE_STORAGE_SCRIPT, state.get('localStorage') or {})
+        return True
+
+    @staticmethod
+    def Settle(driver, timeout=60):
+        """Waits for the page the driver opened to settle, so an expired session has been
+        redirected to the login page before it is checked"""
+        waiter = AjaxWait(driver, timeout)
+        try:
+            waiter.Wait()
+        finally:
+            RemoveCommandListener(driver, waiter._OnCommand)
+
+    def Open(self, driver, url, login, loggedIn=None):
+        """Opens a page with the saved session, logging in again if it expired
+            driver      : a new WebDriver
+            url         : a string, the page to open, e.g. the Oracle iDA page
+            login       : a callable, login(driver) runs the full LoginPage flow
+            loggedIn    : a callable, loggedIn(driver) returns True on an authenticated page;
+                          by default the page must show no password field and not be the login url;
+                          it is called once the AdminConsole app has settled on the page
+            Returns True if the saved session was used, False if a login was needed
+        """
+        log = loghelper.getLog()
+        loggedIn = loggedIn or (lambda d: d.execute_script(LOGGED_IN_SCRIPT))
+        if self.Restore(driver):
+            driver.get(url)
+            self.Settle(driver)
+            if loggedIn(driver):
+                log.info("Reused the saved AdminConsole session")
+                return True
+            log.info("Saved AdminConsole session expired, logging in again")
+        login(driver)
+        self.Save(driver)
+        driver.get(url)
+        return False
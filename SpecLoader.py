@@ -0,0 +1,21 @@
+#!/usr/bin/env python
+"""
+This module provides the loader of the callables that the Oracle page tooling
+takes by name, such as the session factory of the parallel crawl or the login
+function of the benchmarks. Naming them as "module:function" strings lets them
+be configured from the environment and imported in worker processes.
+Functions:
+LoadCallable()              -- Imports the callable named by a "module:function" string
+"""
+import importlib
+
+
+def LoadCallable(spec):
+    """Imports the callable named by a "module:function" string
+        Raises ValueError if the string has no ":", ImportError or AttributeError
+        if the module or the function does not exist
+    """
+    if ":" not in spec:
+        raise ValueError("Expected a \"module:function\" string, not " + repr(spec))
+    module, function = spec.split(":", 1)
+    return getattr(importlib.import_module(module), function)
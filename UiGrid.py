@@ -0,0 +1,238 @@
+#!/usr/bin/env python
+"""
+This module provides the single call readers for the ui-grid tables shown on
+the AdminConsole (instances, clones, job history).
+Functions:
+ReadGridTable()             -- Returns the column labels and the cell texts of every row of a ui-grid
+ReadGrid()                  -- Returns every row of a ui-grid as a dict keyed by column label
+ReadColumn()                -- Returns the cell texts of one column of a ui-grid, found by its header label
+SelectGridRows()            -- Ticks the rows of the current grid page whose first column is in the given names
+GridControls()              -- Returns which filter and page size controls the grid offers
+SetGridPageSize()           -- Raises the grid page size to the largest option offered
+FilterGrid()                -- Types the given text into the grid filter box
+BrowseSelect()              -- Selects the given names using the filter box or page size before paging
+"""
+
+READ_SCRIPT = """
+var root = arguments[0];
+if (typeof root === 'string') { root = document.querySelector(root); }
+if (!root) { return [[], []]; }
+var text = function (el) { return (el.textContent || '').replace(/\\s+/g, ' ').trim(); };
+var columns = [], rows = [];
+var containers = root.querySelectorAll('.ui-grid-render-container');
+for (var c = 0; c < containers.length; c++) {
+    var headers = containers[c].querySelectorAll('.ui-grid-header-cell');
+    var canvas = containers[c].querySelector('.ui-grid-canvas');
+    if (!canvas) { continue; }
+    var offset = columns.length, width = headers.length;
+    for (var h = 0; h < headers.length; h++) {
+        var label = headers[h].querySelector('.ui-grid-header-cell-label');
+        columns.push(text(label || headers[h]));
+    }
+    for (var r = 0; r < canvas.children.length; r++) {
+        var cells = canvas.children[r].querySelectorAll('.ui-grid-cell');
+        var row = rows[r] || (rows[r] = []);
+        if (cells.length > width) {
+            for (var n = width; n < cells.length; n++) { columns.push(''); }
+            width = cells.length;
+        }
+        for (var i = 0; i < cells.length; i++) {
+            var contents = cells[i].querySelector('.ui-grid-cell-contents');
+            row[offset + i] = text(contents || cells[i]);
+        }
+    }
+}
+return [columns, rows];
+"""
+
+SELECT_SCRIPT = """
+var wanted = {}, names = arguments[0], root = arguments[1];
+for (var n = 0; n < names.length; n++) { wanted[names[n]] = true; }
+if (typeof root === 'string') { root = document.querySelector(root); }
+if (!root) { return []; }
+var rowsOf = function (container) {
+    var canvas = container && container.querySelector('.ui-grid-canvas');
+    return canvas ? canvas.children : null;
+};
+var containers = root.querySelectorAll('.ui-grid-render-container');
+var body = rowsOf(root.querySelector('.ui-grid-render-container-body') ||
+                  containers[containers.length - 1]);
+var left = rowsOf(root.querySelector('.ui-grid-render-container-left'));
+var matched = [];
+for (var r = 0; body && r < body.length; r++) {
+    var cell = body[r].querySelector('.ui-grid-cell') || body[r].firstElementChild;
+    var name = cell ? (cell.textContent || '').replace(/\\s+/g, ' ').trim() : '';
+    if (!wanted.hasOwnProperty(name)) { continue; }
+    matched.push(name);
+    var row = left && left[r] ? left[r] : body[r];
+    if (row.classList.contains('ui-grid-row-selected') ||
+            row.querySelector('.ui-grid-row-selected')) { continue; }
+    var target = row.querySelector('.ui-grid-selection-row-header-buttons');
+    if (!target) {
+        target = row;
+        while (target.firstElementChild) { target = target.firstElementChild; }
+    }
+    target.click();
+}
+return matched;
+"""
+
+BROWSE_MODES = ("auto", "filter", "pagesize", "paging")
+
+FILTER_SELECTOR = ".ui-grid-filter-input, .cv-grid-search input, input[placeholder='Search']"
+PAGE_SIZE_SELECTOR = ".ui-grid-pager-row-count-picker select"
+
+CONTROLS_SCRIPT = """
+var filter = document.querySelector(arguments[0]);
+var picker = document.querySelector(arguments[1]);
+var sizes = [];
+if (picker) {
+    for (var i = 0; i < picker.options.length; i++) {
+        var size = parseInt(picker.options[i].text, 10);
+        if (!isNaN(size)) { sizes.push(size); }
+    }
+}
+var current = picker && picker.selectedIndex >= 0 ?
+    parseInt(picker.options[picker.selectedIndex].text, 10) : 0;
+return [!!filter, sizes, isNaN(current) ? 0 : current];
+"""
+
+SET_SCRIPT = """
+var el = document.querySelector(arguments[0]), value = arguments[1];
+if (!el) { return false; }
+if (el.tagName === 'SELECT') {
+    var best = -1, bestSize = -1;
+    for (var i = 0; i < el.options.length; i++) {
+        var size = parseInt(el.options[i].text, 10);
+        if (size > bestSize) { best = i; bestSize = size; }
+    }
+    if (best < 0 || best === el.selectedIndex) { return false; }
+    el.selectedIndex = best;
+} else {
+    Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set.call(el, value);
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+}
+el.dispatchEvent(new Event('change', {bubbles: true}));
+return true;
+"""
+
+
+def ReadGridTable(driver, root='.ui-grid'):
+    """Returns the column labels and the cell texts of every row of a ui-grid
+        driver      : the WebDriver instance
+        root        : a CSS selector or WebElement of the grid, the first ui-grid by default
+        Returns (columns, rows), rows being lists of cell texts in column order
+    """
+    columns, rows = driver.execute_script(READ_SCRIPT, root)
+    width = len(columns)
+    table = []
+    for row in rows:
+        row = [cell or '' for cell in (row or [])]
+        table.append(row + [''] * (width - len(row)))
+    return columns, table
+
+
+def ReadGrid(driver, root='.ui-grid'):
+    """Returns every row of a ui-grid as a dict keyed by column label.
+    Columns without a label (such as the row selection column) are keyed by their index.
+        driver      : the WebDriver instance
+        root        : a CSS selector or WebElement of the grid, the first ui-grid by default
+    """
+    columns, rows = ReadGridTable(driver, root)
+    keys = [label or str(i) for i, label in enumerate(columns)]
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def ReadColumn(driver, labels=(), root='.ui-grid'):
+    """Returns the cell texts of one column of a ui-grid, found by its header label.
+    The unlabeled pinned columns (such as the row selection column) are never picked.
+        driver      : the WebDriver instance
+        labels      : a list of strings, the header labels to look for, case insensitive
+        root        : a CSS selector or WebElement of the grid, the first ui-grid by default
+        Returns the cells of the first column carrying one of the labels, or of the first
+                labeled column when none does; an empty list when the grid has no labeled column
+    """
+    columns, rows = ReadGridTable(driver, root)
+    wanted = [label.lower() for label in labels]
+    labeled = [i for i, label in enumerate(columns) if label]
+    matches = [i for i in labeled if columns[i].lower() in wanted]
+    if not matches and not labeled:
+        return []
+    index = (matches or labeled)[0]
+    return [row[index] for row in rows]
+
+
+def SelectGridRows(driver, names, root='.ui-grid'):
+    """Ticks the rows of the current grid page whose first column is in the given names.
+    Matching and clicking happen in one script call, whatever the number of rows.
+        driver      : the WebDriver instance
+        names       : an iterable, the names to select
+        root        : a CSS selector or WebElement of the grid, the first ui-grid by default
+        Returns the set of names that were found on the page
+    """
+    return set(driver.execute_script(SELECT_SCRIPT, list(names), root))
+
+
+def GridControls(driver):
+    """Returns which filter and page size controls the grid offers
+        Returns (hasFilter, pageSizes, currentPageSize)
+    """
+    hasFilter, sizes, current = driver.execute_script(
+        CONTROLS_SCRIPT, FILTER_SELECTOR, PAGE_SIZE_SELECTOR)
+    return hasFilter, sizes, current
+
+
+def SetGridPageSize(driver):
+    """Raises the grid page size to the largest option offered
+        Returns True if the page size was changed
+    """
+    return driver.execute_script(SET_SCRIPT, PAGE_SIZE_SELECTOR, None)
+
+
+def FilterGrid(driver, text):
+    """Types the given text into the grid filter box, an empty text clears the filter
+        Returns True if the grid has a filter box
+    """
+    return driver.execute_script(SET_SCRIPT, FILTER_SELECTOR, text)
+
+
+def BrowseSelect(driver, names, wait, nextPage=None, mode="auto"):
+    """Selects the given names using the filter box or page size before paging.
+        driver      : the WebDriver instance
+        names       : an iterable, the first column values of the rows to select
+        wait        : a callable, waits for the grid to render after a change
+        nextPage    : a callable, moves to the next page and returns False on the last page
+        mode        : a string, "auto", "filter", "pagesize" or "paging"
+    In "auto" mode the page size is raised to its maximum first, the names not on
+    that page are then looked up through the filter box, and paging is used only
+    when the grid offers neither control. The filter box matches substrings, so a
+    filtered result spanning several pages is paged through before a name is
+    reported missing.
+        Returns the set of names that were not found
+        Raises ValueError on an unknown mode
+    """
+    if mode not in BROWSE_MODES:
+        raise ValueError("Unknown browse mode %s, use one of %s" % (mode, ", ".join(BROWSE_MODES)))
+    remaining = set(names)
+    hasFilter, sizes, current = GridControls(driver)
+    if mode in ("auto", "pagesize") and sizes and max(sizes) > current:
+        SetGridPageSize(driver)
+        wait()
+    if mode != "filter" or not hasFilter:
+        remaining -= SelectGridRows(driver, remaining)
+    if remaining and hasFilter and mode in ("auto", "filter"):
+        for name in sorted(remaining):
+            FilterGrid(driver, name)
+            wait()
+            found = SelectGridRows(driver, [name])
+            while not found and nextPage is not None and nextPage():
+                wait()
+                found = SelectGridRows(driver, [name])
+            remaining -= found
+        FilterGrid(driver, "")
+        wait()
+        return remaining
+    while remaining and nextPage is not None and nextPage():
+        wait()
+        remaining -= SelectGridRows(driver, remaining)
+    return remaining
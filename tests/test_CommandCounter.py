@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+"""
+Tests of the WebDriver command counter on nested page-object calls.
+"""
+import unittest
+
+from OraclePages.CommandCounter import CommandCounter, BudgetExceeded
+
+
+class FakeDriver(object):
+    """Driver answering every command without a browser"""
+
+    def execute(self, command, params=None):
+        return {"value": None}
+
+
+class FakePage(object):
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def Find(self):
+        self.driver.execute("findElement")
+        return True, 1
+
+    def Open(self):
+        # sends as many commands as Find(), so the counts of both calls are equal
+        try:
+            return self.Find()
+        except Exception as e:
+            return False, "Open", str(e)
+
+
+class CommandCounterTest(unittest.TestCase):
+
+    def testNestedCallsWithEqualCounts(self):
+        page = FakePage(FakeDriver())
+        with CommandCounter(page.driver) as counter:
+            counter.Wrap(page, ["Open", "Find"])
+            self.assertEqual(page.Open(), (True, 1))
+            self.assertEqual(counter.stack, [])
+            summary = counter.Summary()
+        self.assertEqual(summary["Open"]["find"], 1)
+        self.assertEqual(summary["Find"]["find"], 1)
+        self.assertNotIn("Open", page.__dict__)
+
+    def testNestedBudgetRaisedFromOutermostCall(self):
+        page = FakePage(FakeDriver())
+        with CommandCounter(page.driver, ["Find <= 0"]) as counter:
+            counter.Wrap(page, ["Open", "Find"])
+            self.assertRaises(BudgetExceeded, page.Open)
+            self.assertEqual(counter.exceeded, [("Find", 1, 0)])
+
+    def testNotStrict(self):
+        page = FakePage(FakeDriver())
+        with CommandCounter(page.driver, {"Open": 0}, strict=False) as counter:
+            counter.Wrap(page, ["Open", "Find"])
+            self.assertEqual(page.Open(), (True, 1))
+            self.assertEqual(counter.exceeded, [("Open", 1, 0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
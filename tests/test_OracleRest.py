@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+"""
+Tests of the REST fast path against the local stand-in and a raw socket server.
+"""
+import socket
+import threading
+import time
+import unittest
+
+from OraclePages.OracleRest import OracleRest
+from OraclePages.OracleStandIn import MockRestServer
+
+RESPONSE = b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: 2\r\n\r\n{}"
+
+
+class SocketServer(object):
+    """Server answering every request with {} after delay seconds, closing the
+    connection after its first answer when keepAlive is False"""
+
+    def __init__(self, keepAlive=True, delay=0.0):
+        self.keepAlive = keepAlive
+        self.delay = delay
+        self.connections = 0
+        self.requests = 0
+        self.socket = socket.socket()
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.socket.bind(("127.0.0.1", 0))
+        self.socket.listen(5)
+        thread = threading.Thread(target=self.Accept)
+        thread.daemon = True
+        thread.start()
+
+    def Url(self):
+        return "http://127.0.0.1:%d/webconsole/api" % self.socket.getsockname()[1]
+
+    def Accept(self):
+        while True:
+            try:
+                connection = self.socket.accept()[0]
+            except (IOError, OSError):
+                return
+            self.connections += 1
+            thread = threading.Thread(target=self.Serve, args=(connection,))
+            thread.daemon = True
+            thread.start()
+
+    def Serve(self, connection):
+        try:
+            while connection.recv(65536):
+                self.requests += 1
+                time.sleep(self.delay)
+                connection.sendall(RESPONSE)
+                if not self.keepAlive:
+                    break
+        except (IOError, OSError):
+            pass
+        finally:
+            connection.close()
+
+    def Close(self):
+        self.socket.close()
+
+
+class ProvisionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockRestServer()
+        self.rest = OracleRest(self.server.Start(), workers=4)
+        self.rest.Login("admin", "password")
+
+    def tearDown(self):
+        self.rest.Close()
+        self.server.Stop()
+
+    def testProvisionAndTeardown(self):
+        results = self.rest.Provision(
+            servers=[{"serverName": "dbserver", "hostName": "dbserver", "userName": "oracle",
+                      "password": "password", "plan": "Server plan"}],
+            instances=[{"clientName": "dbserver", "instanceName": "ORCL%d" % i, "oracleHome": "/u01/app/oracle",
+                        "osUserName": "oracle", "dbUserName": "sys", "dbPassword": "password"}
+                       for i in range(3)],
+            subclients=[{"clientName": "dbserver", "instanceName": "ORCL%d" % i, "subclientName": "sub1",
+                         "storagePolicy": "Server plan"} for i in range(3)])
+        self.assertTrue(all(result[0] for kind in results.values() for result in kind))
+        self.assertEqual((len(self.server.clients), len(self.server.instances), len(self.server.subclients)),
+                         (1, 3, 3))
+        self.assertEqual(self.rest.Teardown(), [])
+        self.assertEqual((len(self.server.clients), len(self.server.instances), len(self.server.subclients)),
+                         (0, 0, 0))
+
+    def testProvisionReportsFailures(self):
+        spec = {"clientName": "dbserver", "instanceName": "ORCL", "oracleHome": "/u01/app/oracle",
+                "osUserName": "oracle", "dbUserName": "sys", "dbPassword": "password"}
+        results = self.rest.Provision(instances=[spec, spec])
+        self.assertEqual(sorted(result[0] for result in results["instances"]), [False, True])
+        self.assertIn("AddInstance", [result[1] for result in results["instances"] if not result[0]])
+
+
+class RetryTest(unittest.TestCase):
+
+    def testRetriesOnceOnStaleKeepAlive(self):
+        server = SocketServer(keepAlive=False)
+        try:
+            rest = OracleRest(server.Url())
+            self.assertEqual(rest.Request("GET", "Client"), {})
+            time.sleep(0.1)
+            self.assertEqual(rest.Request("POST", "Subclient", {}), {})
+            self.assertEqual((server.connections, server.requests), (2, 2))
+        finally:
+            server.Close()
+
+    def testNoRetryAfterTimeout(self):
+        server = SocketServer()
+        try:
+            rest = OracleRest(server.Url(), timeout=0.3)
+            self.assertEqual(rest.Request("GET", "Client"), {})
+            server.delay = 1.0
+            self.assertRaises((IOError, OSError), rest.Request, "POST", "Subclient", {})
+            time.sleep(0.1)
+            self.assertEqual((server.connections, server.requests), (1, 2))
+        finally:
+            server.Close()
+
+    def testNoRetryOnNewConnection(self):
+        server = SocketServer()
+        url = server.Url()
+        server.Close()
+        rest = OracleRest(url)
+        self.assertRaises((IOError, OSError), rest.Request, "GET", "Client")
+        self.assertEqual(server.connections, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()